@@ -1,4 +1,12 @@
-
+from .batch import highlight_documents
 from .markdownlabel import MarkdownLabel
+from .search import DocumentIndex, document_index, search_highlights, with_search_highlights
 
-__all__ = ['MarkdownLabel']
+__all__ = [
+    'MarkdownLabel',
+    'DocumentIndex',
+    'document_index',
+    'highlight_documents',
+    'search_highlights',
+    'with_search_highlights',
+]
@@ -0,0 +1,95 @@
+"""Batch highlighting of many documents against one glossary, in a process pool."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from .matcher import TermMatcher, resolve_matches
+
+if TYPE_CHECKING:
+    from .markdownlabel import HighlightDefinition
+
+_GLOSSARY_KEYS = ("term", "title", "content", "category", "color")
+
+# Set in each worker process by `_init_worker`, so the matcher is sent once per worker, not once per task
+_worker_matcher: TermMatcher | None = None
+
+
+def _init_worker(matcher: TermMatcher) -> None:
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _match(matcher: TermMatcher, document: str) -> list[tuple[int, list[list[int]]]]:
+    # Only the terms that occur are returned, which keeps the results sent back from workers small
+    return [
+        (term_index, spans)
+        for term_index, spans in enumerate(resolve_matches(matcher, document))
+        if spans
+    ]
+
+
+def _match_in_worker(document: str) -> list[tuple[int, list[list[int]]]]:
+    return _match(_worker_matcher, document)
+
+
+def _glossary_entry(entry: dict | HighlightDefinition) -> dict:
+    if not isinstance(entry, dict):
+        entry = entry.model_dump()
+    return {key: entry.get(key) or "" for key in _GLOSSARY_KEYS}
+
+
+def highlight_documents(
+    documents: Sequence[str],
+    glossary: Sequence[dict | HighlightDefinition],
+    *,
+    max_workers: int | None = None,
+    chunksize: int | None = None,
+) -> list[dict]:
+    """
+    Highlights every occurrence of the glossary terms in many documents. The glossary is compiled into a
+    single matcher once; documents are scanned in parallel in a process pool whose workers each receive
+    the compiled matcher once.
+    Parameters:
+        documents: the markdown documents.
+        glossary: term highlights (dictionaries with `term`, `title`, `content`, `category` and `color`, or
+            `HighlightDefinition`s) to look for in every document. Entries without a term are ignored;
+            where the terms of several entries overlap, the entry listed first keeps the text.
+        max_workers: number of worker processes; defaults to the number of CPUs. With 1, or a single
+            document, the documents are scanned in the calling process.
+        chunksize: number of documents sent to a worker at a time; by default the documents are split into
+            about four chunks per worker.
+    Returns:
+        For each document, a value for `MarkdownLabel.postprocess`: the document as `markdown_content` and,
+        as `highlights`, the glossary entries whose term occurs in it, in glossary order. Each entry carries
+        the `spans` its term was resolved to, which spare the browser the search.
+    """
+    entries = [
+        entry
+        for entry in (_glossary_entry(entry) for entry in glossary)
+        if entry["term"].strip()
+    ]
+    matcher = TermMatcher([entry["term"] for entry in entries])
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(documents) <= 1:
+        matches = [_match(matcher, document) for document in documents]
+    else:
+        workers = min(workers, len(documents))
+        chunksize = chunksize or max(1, len(documents) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(matcher,)
+        ) as executor:
+            matches = list(executor.map(_match_in_worker, documents, chunksize=chunksize))
+    return [
+        {
+            "markdown_content": document,
+            "highlights": [
+                {**entries[term_index], "position": [], "spans": spans}
+                for term_index, spans in document_matches
+            ],
+        }
+        for document, document_matches in zip(documents, matches)
+    ]
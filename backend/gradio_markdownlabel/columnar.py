@@ -0,0 +1,107 @@
+"""Columnar encoding of highlight lists for compact payloads."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .markdownlabel import HighlightColumns, HighlightDefinition
+
+_STRING_FIELDS = ("term", "title", "content", "category", "color")
+
+
+def encode_highlights(highlights: list[HighlightDefinition]) -> dict:
+    """
+    Encodes highlights as parallel arrays. Positions become `starts`/`ends` (-1 when absent), and every
+    string field becomes an index into a single shared table of distinct strings, so repeated categories,
+    colors, titles and contents are sent once.
+    Parameters:
+        highlights: the highlights to encode.
+    Returns:
+        The fields of a HighlightColumns instance.
+    """
+    table: dict[str, int] = {}
+    columns = {
+        field: [table.setdefault(getattr(h, field), len(table)) for h in highlights]
+        for field in _STRING_FIELDS
+    }
+
+    starts, ends, content_ids, glossary_ids, overlaps = [], [], [], [], []
+    span_counts, span_bounds = [], []
+    for highlight in highlights:
+        content_ids.append(
+            -1
+            if highlight.content_id is None
+            else table.setdefault(highlight.content_id, len(table))
+        )
+        glossary_ids.append(
+            -1
+            if highlight.glossary_id is None
+            else table.setdefault(highlight.glossary_id, len(table))
+        )
+        overlaps.append(-1 if highlight.overlaps is None else int(highlight.overlaps))
+        if len(highlight.position) == 2:
+            starts.append(highlight.position[0])
+            ends.append(highlight.position[1])
+        else:
+            starts.append(-1)
+            ends.append(-1)
+        if highlight.spans is None:
+            span_counts.append(-1)
+        else:
+            span_counts.append(len(highlight.spans))
+            for start, end in highlight.spans:
+                span_bounds += (start, end)
+
+    return {
+        "strings": list(table),
+        "starts": starts,
+        "ends": ends,
+        "terms": columns["term"],
+        "titles": columns["title"],
+        "contents": columns["content"],
+        "categories": columns["category"],
+        "colors": columns["color"],
+        "content_ids": content_ids,
+        "glossary_ids": glossary_ids,
+        "overlaps": overlaps,
+        "span_counts": span_counts,
+        "span_bounds": span_bounds,
+    }
+
+
+def decode_highlights(columns: HighlightColumns) -> list[dict]:
+    """
+    Parameters:
+        columns: highlights encoded with `encode_highlights`.
+    Returns:
+        The highlights as dictionaries, in the same shape as `HighlightDefinition.model_dump()`.
+    """
+    strings = columns.strings
+    highlights = []
+    bound = 0
+    for i, start in enumerate(columns.starts):
+        span_count = columns.span_counts[i] if i < len(columns.span_counts) else -1
+        content_id = columns.content_ids[i] if i < len(columns.content_ids) else -1
+        glossary_id = columns.glossary_ids[i] if i < len(columns.glossary_ids) else -1
+        overlaps = columns.overlaps[i] if i < len(columns.overlaps) else -1
+        spans = None
+        if span_count >= 0:
+            flat = columns.span_bounds[bound : bound + 2 * span_count]
+            spans = [[flat[j], flat[j + 1]] for j in range(0, len(flat), 2)]
+            bound += 2 * span_count
+        highlights.append(
+            {
+                "term": strings[columns.terms[i]],
+                "position": [start, columns.ends[i]] if start >= 0 else [],
+                "title": strings[columns.titles[i]],
+                "content": strings[columns.contents[i]],
+                "category": strings[columns.categories[i]],
+                "color": strings[columns.colors[i]],
+                "spans": spans,
+                "content_id": strings[content_id] if content_id >= 0 else None,
+                "glossary_id": strings[glossary_id] if glossary_id >= 0 else None,
+                "overlaps": bool(overlaps) if overlaps >= 0 else None,
+            }
+        )
+    return highlights
@@ -0,0 +1,224 @@
+"""Delta payloads: describe a new MarkdownLabel value as a patch against a value the browser already has."""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .markdownlabel import HighlightDefinition, MarkdownData
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    # Binary search over slice comparisons keeps the character comparisons in C.
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def diff_text(base: str, new: str) -> tuple[int, int, str]:
+    """
+    Describes `new` as a single splice of `base`.
+    Returns:
+        (start, delete_count, insert) such that base[:start] + insert + base[start + delete_count:] == new.
+    """
+    if new.startswith(base):
+        return len(base), 0, new[len(base) :]
+    prefix = _common_prefix_length(base, new)
+    suffix = _common_suffix_length(base, new, min(len(base), len(new)) - prefix)
+    return prefix, len(base) - prefix - suffix, new[prefix : len(new) - suffix]
+
+
+def changed_regions(edits: list[dict]) -> list[tuple[int, int]]:
+    """
+    Locates edits made in the browser (the `edits` of a preprocessed value) in the edited document.
+    Parameters:
+        edits: sorted, non-overlapping {"start", "delete_count", "insert"} splices of the previous content.
+    Returns:
+        (start, end) of the text inserted by each edit, in the edited content. Pure deletions give empty regions.
+    """
+    regions = []
+    shift = 0
+    for edit in edits:
+        start = edit["start"] + shift
+        regions.append((start, start + len(edit["insert"])))
+        shift += len(edit["insert"]) - edit["delete_count"]
+    return regions
+
+
+def apply_edits(markdown_content: str, edits: list[dict]) -> str:
+    """
+    Applies sorted, non-overlapping {"start", "delete_count", "insert"} splices to `markdown_content`.
+    """
+    pieces = []
+    cursor = 0
+    for edit in edits:
+        pieces.append(markdown_content[cursor : edit["start"]])
+        pieces.append(edit["insert"])
+        cursor = edit["start"] + edit["delete_count"]
+    pieces.append(markdown_content[cursor:])
+    return "".join(pieces)
+
+
+def _rebase_span(
+    start: int, end: int, edits: list[dict], ends: list[int], shifts: list[int]
+) -> list[int] | None:
+    # First edit that ends after the span starts; every edit before it lies entirely before the span
+    i = bisect_right(ends, start)
+    if i < len(edits) and edits[i]["start"] < end:
+        return None
+    return [start + shifts[i], end + shifts[i]]
+
+
+def rebase_highlights(highlights: list[dict], edits: list[dict]) -> list[dict]:
+    """
+    Moves position highlights and resolved term spans past `edits` in one pass, as the browser does when
+    an edit is saved. Highlights whose text was edited lose their position, and are dropped unless they
+    also highlight a term.
+    """
+    if not edits:
+        return highlights
+    ends = [edit["start"] + edit["delete_count"] for edit in edits]
+    shifts = [0]
+    for edit in edits:
+        shifts.append(shifts[-1] + len(edit["insert"]) - edit["delete_count"])
+    rebased = []
+    for highlight in highlights:
+        position = highlight.get("position") or []
+        if len(position) == 2:
+            position = _rebase_span(position[0], position[1], edits, ends, shifts)
+            if position is None and not (highlight.get("term") or "").strip():
+                continue
+            highlight = {**highlight, "position": position or []}
+        if highlight.get("spans") is not None:
+            spans = (_rebase_span(start, end, edits, ends, shifts) for start, end in highlight["spans"])
+            highlight = {**highlight, "spans": [span for span in spans if span is not None]}
+        rebased.append(highlight)
+    return rebased
+
+
+def diff_highlights(
+    base: list[HighlightDefinition], new: list[HighlightDefinition]
+) -> tuple[list[int], list[HighlightDefinition]]:
+    """
+    Returns:
+        The indices of `base` highlights that are not in `new`, and the `new` highlights that are not in `base`.
+        Applying both to `base` yields the kept base highlights, in order, followed by the added ones.
+    """
+    remaining = Counter(highlight.model_dump_json() for highlight in new)
+    removed = []
+    for index, highlight in enumerate(base):
+        key = highlight.model_dump_json()
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            removed.append(index)
+    added = []
+    for highlight in new:
+        key = highlight.model_dump_json()
+        if remaining[key] > 0:
+            remaining[key] -= 1
+            added.append(highlight)
+    return removed, added
+
+
+def apply_highlight_diff(
+    base: list[HighlightDefinition], removed: list[int], added: list[HighlightDefinition]
+) -> list[HighlightDefinition]:
+    removed_set = set(removed)
+    return [h for i, h in enumerate(base) if i not in removed_set] + list(added)
+
+
+class ValueHistory:
+    """
+    A bounded LRU record of the values a component has sent, keyed by version. Postprocess does not know
+    which browser session it is serving, so patches name the version they apply to; a browser that does
+    not hold that version fetches the full value by version instead.
+
+    Versions a browser still refers to can be pinned: pinned values do not count towards `maxsize` and
+    are not evicted until they are unpinned, or until more than `max_pinned` values are pinned, which
+    bounds what abandoned sessions can hold on to.
+    """
+
+    def __init__(self, maxsize: int = 16, max_pinned: int = 4096):
+        self.maxsize = maxsize
+        self.max_pinned = max_pinned
+        self._values: OrderedDict[str, MarkdownData] = OrderedDict()
+        self._pinned: OrderedDict[str, MarkdownData] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, data: MarkdownData) -> None:
+        with self._lock:
+            if data.version in self._pinned:
+                return
+            self._values[data.version] = data
+            self._values.move_to_end(data.version)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def get(self, version: str) -> MarkdownData | None:
+        with self._lock:
+            if version in self._pinned:
+                return self._pinned[version]
+            if version not in self._values:
+                return None
+            self._values.move_to_end(version)
+            return self._values[version]
+
+    def pin(self, version: str) -> bool:
+        """
+        Keeps `version` until `unpin` is called for it.
+        Returns:
+            False if the version is no longer stored.
+        """
+        with self._lock:
+            data = self._values.pop(version, None)
+            if data is None:
+                return version in self._pinned
+            self._pinned[version] = data
+            while len(self._pinned) > self.max_pinned:
+                self._pinned.popitem(last=False)
+            return True
+
+    def unpin(self, version: str) -> None:
+        """
+        Returns a pinned version to the LRU record, as its most recently used value.
+        """
+        with self._lock:
+            data = self._pinned.pop(version, None)
+            if data is None:
+                return
+            self._values[version] = data
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def find_base(self, markdown_content: str) -> MarkdownData | None:
+        """
+        Returns the most recently sent value that `markdown_content` extends, or None if there is none, in
+        which case the full value is sent: a value the browser may not hold is not worth patching against.
+        """
+        with self._lock:
+            candidates = list(reversed(self._values.values()))
+        for candidate in candidates:
+            if markdown_content.startswith(candidate.markdown_content):
+                return candidate
+        return None
+
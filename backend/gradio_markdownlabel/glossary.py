@@ -0,0 +1,173 @@
+"""
+A read-only glossary file that worker processes memory-map, so that every process shares the same pages
+instead of holding its own copy of the glossary strings.
+
+File layout (little-endian):
+    header: magic (8 bytes), number of entries (uint32)
+    index: one (key offset, key length, record offset, record length) uint64/uint32 pair per entry,
+        sorted by the UTF-8 bytes of the key
+    data: keys and records; a record is the byte length of each field (uint32) followed by the fields
+        in UTF-8, in the order of `FIELDS`
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .markdownlabel import HighlightDefinition
+
+MAGIC = b"MDLGLOS1"
+FIELDS = ("term", "title", "content", "category", "color")
+
+_HEADER = struct.Struct("<8sI")
+_INDEX_ENTRY = struct.Struct("<QIQI")
+_RECORD_HEADER = struct.Struct(f"<{len(FIELDS)}I")
+
+_OPEN_GLOSSARY_LIMIT = 8
+
+
+def write_glossary(
+    path: str | os.PathLike, entries: Mapping[str, dict | HighlightDefinition]
+) -> None:
+    """
+    Writes a glossary file. The file is replaced atomically, so processes that have the previous file
+    mapped keep reading it unchanged.
+    Parameters:
+        path: where to write the glossary.
+        entries: the glossary entries by id, as dictionaries with `term`, `title`, `content`, `category` and
+            `color` (missing fields are empty) or as `HighlightDefinition`s.
+    """
+    keys, records = [], []
+    for key, entry in sorted(entries.items(), key=lambda item: item[0].encode("utf-8")):
+        if not isinstance(entry, dict):
+            entry = entry.model_dump()
+        fields = [str(entry.get(field) or "").encode("utf-8") for field in FIELDS]
+        keys.append(key.encode("utf-8"))
+        records.append(_RECORD_HEADER.pack(*map(len, fields)) + b"".join(fields))
+
+    offset = _HEADER.size + _INDEX_ENTRY.size * len(keys)
+    index, data = [], []
+    for key, record in zip(keys, records):
+        index.append(_INDEX_ENTRY.pack(offset, len(key), offset + len(key), len(record)))
+        data += (key, record)
+        offset += len(key) + len(record)
+
+    temporary = f"{os.fspath(path)}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, len(keys)))
+        file.writelines(index)
+        file.writelines(data)
+    os.replace(temporary, path)
+
+
+class GlossaryStore:
+    """
+    Read-only access to a glossary file written with `write_glossary`. The file is memory-mapped and
+    entries are decoded on lookup, so only the pages that are read are loaded, and they are shared by
+    every process that maps the same file.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        """
+        Parameters:
+            path: a glossary file written with `write_glossary`.
+        """
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as file:
+            # The modification time of the mapped file, which stays mapped if the path is replaced
+            self.mtime_ns = os.fstat(file.fileno()).st_mtime_ns
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a MarkdownLabel glossary file.")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, glossary_id: object) -> bool:
+        return isinstance(glossary_id, str) and self._find(glossary_id) is not None
+
+    def _find(self, glossary_id: str) -> tuple[int, int] | None:
+        key = glossary_id.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            key_offset, key_length, record_offset, record_length = _INDEX_ENTRY.unpack_from(
+                self._map, _HEADER.size + mid * _INDEX_ENTRY.size
+            )
+            other = self._map[key_offset : key_offset + key_length]
+            if other == key:
+                return record_offset, record_length
+            if other < key:
+                low = mid + 1
+            else:
+                high = mid
+        return None
+
+    def get(self, glossary_id: str, fields: Iterable[str] = FIELDS) -> dict[str, str] | None:
+        """
+        Parameters:
+            glossary_id: the id of the entry.
+            fields: the fields to decode; others are not read.
+        Returns:
+            The requested fields of the entry, or None if there is no entry with this id.
+        """
+        found = self._find(glossary_id)
+        if found is None:
+            return None
+        offset = found[0] + _RECORD_HEADER.size
+        lengths = _RECORD_HEADER.unpack_from(self._map, found[0])
+        bounds = {}
+        for field, length in zip(FIELDS, lengths):
+            bounds[field] = (offset, offset + length)
+            offset += length
+        return {
+            field: self._map[bounds[field][0] : bounds[field][1]].decode("utf-8")
+            for field in fields
+        }
+
+    def get_many(self, glossary_ids: Iterable[str], field: str = "content") -> dict[str, str]:
+        """
+        Returns:
+            One field of every entry that exists, by id. Unknown ids are left out.
+        """
+        found = {}
+        for glossary_id in glossary_ids:
+            entry = self.get(glossary_id, (field,))
+            if entry is not None:
+                found[glossary_id] = entry[field]
+        return found
+
+
+_open_stores: OrderedDict[str, GlossaryStore] = OrderedDict()
+_open_stores_lock = threading.Lock()
+
+
+def open_glossary(path: str | os.PathLike) -> GlossaryStore:
+    """
+    Returns a GlossaryStore for `path`, shared by every component in the process that uses the same file.
+    A file replaced by `write_glossary` is mapped again. At most eight stores are cached; a store dropped
+    from the cache, or replaced by a newer mapping, is never closed explicitly, so a thread still reading
+    it is unaffected, and the file is unmapped once the last reference to the store is gone.
+    """
+    path = os.path.abspath(os.fspath(path))
+    mtime_ns = os.stat(path).st_mtime_ns
+    with _open_stores_lock:
+        store = _open_stores.get(path)
+        if store is not None and store.mtime_ns == mtime_ns:
+            _open_stores.move_to_end(path)
+            return store
+        fresh = GlossaryStore(path)
+        _open_stores[path] = fresh
+        _open_stores.move_to_end(path)
+        while len(_open_stores) > _OPEN_GLOSSARY_LIMIT:
+            _open_stores.popitem(last=False)
+        return fresh
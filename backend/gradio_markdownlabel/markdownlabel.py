@@ -2,15 +2,36 @@
 
 from __future__ import annotations
 
+import os
+import time
 from collections.abc import Callable, Sequence
-from typing import TYPE_CHECKING, Any, Union
+from typing import TYPE_CHECKING, Any, Literal, Union
 
 from gradio_client.documentation import document
 
-from gradio.components.base import Component
+from gradio.components.base import Component, server
 from gradio.data_classes import GradioModel, GradioRootModel
-from gradio.events import Events
+from gradio.events import EventListener, Events
+from gradio.exceptions import Error
+from gradio.helpers import Warning as show_warning
 from gradio.i18n import I18nData
+from pydantic import TypeAdapter
+
+from .columnar import decode_highlights, encode_highlights
+from .delta import (
+    ValueHistory,
+    apply_edits,
+    apply_highlight_diff,
+    diff_highlights,
+    diff_text,
+    rebase_highlights,
+)
+from .glossary import GlossaryStore, open_glossary
+from .matcher import resolve_term_spans
+from .metrics import REGISTRY, MetricsRegistry, payload_size
+from .normalize import normalize_highlight_positions
+from .panels import PanelStore
+from .render import RenderCache, RenderCacheInfo, content_key, render_html
 
 if TYPE_CHECKING:
     from gradio.components import Timer
@@ -23,17 +44,68 @@ class HighlightDefinition(GradioModel):
     content: str = ""
     category: str = ""
     color: str = ""
+    spans: list[list[int]] | None = None  # [start, end] matches of `term`, resolved on the server
+    content_id: str | None = None  # set instead of `content` when panel content is fetched lazily
+    glossary_id: str | None = None  # entry of the component's glossary that fills in empty fields
+    overlaps: bool | None = None  # set by `normalize_positions`: whether the span overlaps another position highlight
+
+
+class HighlightColumns(GradioModel):
+    strings: list[str] = []  # distinct strings referenced by the index columns below
+    starts: list[int] = []  # -1 for highlights without a position
+    ends: list[int] = []
+    terms: list[int] = []
+    titles: list[int] = []
+    contents: list[int] = []
+    categories: list[int] = []
+    colors: list[int] = []
+    content_ids: list[int] = []  # -1 for highlights whose content is sent inline
+    glossary_ids: list[int] = []  # -1 for highlights without a glossary entry
+    overlaps: list[int] = []  # 1 or 0 for normalized position highlights, -1 for the others
+    span_counts: list[int] = []  # number of resolved spans per highlight, -1 if unresolved
+    span_bounds: list[int] = []  # flattened [start, end] pairs of all resolved spans
+
+
+class MarkdownPatch(GradioModel):
+    base_version: str
+    start: int  # splice offset into the base markdown_content
+    delete_count: int = 0
+    insert: str = ""
+    removed_highlights: list[int] = []  # indices into the base highlights
+    added_highlights: list[HighlightDefinition] = []
+
+
+class MarkdownEdit(GradioModel):
+    start: int  # offset into the markdown_content before the edit
+    delete_count: int = 0
+    insert: str = ""
 
 
 class MarkdownData(GradioModel):
     markdown_content: str
     highlights: list[HighlightDefinition] = []
+    html: str | None = None  # prerendered HTML, set when rendering on the server
+    version: str | None = None  # hash of markdown_content and highlights
+    patch: MarkdownPatch | None = None  # set instead of the full value when sending a delta
+    columns: HighlightColumns | None = None  # set instead of `highlights` in compact mode
+    edits: list[MarkdownEdit] | None = None  # edits of the last save in the browser, against the previous content
+    base_version: str | None = None  # set with `edits` when the browser had the save applied on the server
 
 
 class MarkdownLabelData(GradioRootModel):
     root: MarkdownData
 
 
+_highlight_list_adapter = TypeAdapter(list[HighlightDefinition])
+_highlight_defaults = HighlightDefinition().model_dump()
+# Prefix of the content ids of panel content that is read from the glossary
+_GLOSSARY_CONTENT = "glossary:"
+_GLOSSARY_INLINE_FIELDS = ("term", "title", "category", "color")
+_payload_defaults = MarkdownData(markdown_content="").model_dump()
+_MAX_RENDER_REPORTS = 50
+_WIRE_FIELDS = ("html", "version", "patch", "columns", "base_version")
+
+
 class MarkdownLabel(Component):
     """
     Displays markdown-formatted text with interactive term highlighting and detailed side panel.
@@ -43,7 +115,17 @@ class MarkdownLabel(Component):
     """
 
     data_model = MarkdownLabelData
-    EVENTS = [Events.change, Events.select, Events.edit, Events.submit, Events.clear]
+    EVENTS = [
+        Events.change,
+        Events.select,
+        Events.edit,
+        Events.submit,
+        Events.clear,
+        EventListener(
+            "rendered",
+            doc="Triggered when the {{ component }} has rendered its markdown in the browser. The event data carries the render mode, the render duration in milliseconds, the content length, the number of highlights and the number of values skipped so far because a newer value arrived before they were rendered.",
+        ),
+    ]
 
     def __init__(
         self,
@@ -54,6 +136,25 @@ class MarkdownLabel(Component):
         edit_mode: str = "split",
         show_preview: bool = True,
         markdown_editor: str = "textarea",
+        resolve_terms: bool = False,
+        server_render: bool = False,
+        render_cache_size: int = 256,
+        delta_updates: bool = False,
+        value_history_size: int = 64,
+        streaming: bool = False,
+        virtualize: bool = False,
+        compact_highlights: bool = False,
+        highlight_validation: Literal["full", "bulk", "none"] = "full",
+        normalize_positions: bool = False,
+        lazy_panel_content: bool = False,
+        panel_cache_size: int = 4096,
+        edit_payloads: bool = False,
+        edit_history_size: int = 256,
+        metrics: bool | MetricsRegistry = False,
+        category_filter: bool = False,
+        glossary: str | os.PathLike | GlossaryStore | None = None,
+        select_events: Literal["full", "index", "none"] = "full",
+        select_throttle: float = 0,
         label: str | I18nData | None = None,
         every: Timer | float | None = None,
         inputs: Component | Sequence[Component] | set[Component] | None = None,
@@ -78,6 +179,25 @@ class MarkdownLabel(Component):
             edit_mode: Layout for editing mode - "split" (side-by-side), "tabs", or "overlay".
             show_preview: Whether to show live preview in edit mode.
             markdown_editor: Type of markdown editor - "textarea" or "codemirror" (future).
+            resolve_terms: If True, term highlights are matched against the markdown on the server in a single pass and sent as resolved character spans, so the browser does not have to search for every term.
+            server_render: If True, the markdown and its highlights are rendered to HTML on the server and the browser displays the prerendered HTML without parsing it. Rendered documents are cached by a hash of their content and highlights. Requires `markdown-it-py`.
+            render_cache_size: Maximum number of rendered documents kept in the server-side render cache when `server_render` is True.
+            delta_updates: If True, repeated updates (e.g. from a generator or `every=`) are sent as a patch against the previously sent value: a splice of the markdown plus added and removed highlights. Has no effect when `server_render` is True.
+            value_history_size: Maximum number of sent values kept in the server-side history that patches are computed against when `delta_updates` is True. The history is shared by every session of the component, so raise it with the number of concurrent users; an update is sent in full when none of the kept values is a prefix of it.
+            streaming: If True, the value is expected to grow by appending (e.g. streamed LLM output). Completed markdown blocks are rendered once and kept, and each update only re-renders the trailing block that is still open.
+            virtualize: If True, long documents are split into top-level markdown blocks and only the blocks near the viewport are rendered and mounted, with space reserved for the rest at their measured (or estimated) height. Applies when the component is not interactive.
+            compact_highlights: If True, highlights are sent in a columnar encoding: parallel arrays of positions plus indices into a table of distinct strings. Values passed to and returned from event handlers keep the usual list of highlight dictionaries.
+            highlight_validation: How highlights returned from event handlers are validated in `postprocess`. "full" validates each highlight as it is built. "bulk" validates the whole list in one call with the same guarantees (types are checked and coerced, missing keys get defaults, extra keys are ignored) and raises a single error listing every invalid highlight. "none" skips validation for trusted input: missing keys still get defaults, but values are passed through unchecked, so they must already have the right types. Unless another option needs to inspect the highlights (`resolve_terms`, `server_render`, `delta_updates`, `compact_highlights`, `lazy_panel_content`, `edit_payloads`, `glossary`), "none" also skips building highlight models and emits the payload directly, in which case extra keys are passed through as well.
+            normalize_positions: If True, position highlights are normalized in `postprocess` in one vectorized pass before they are validated: positions are clamped to the length of the markdown, empty or inverted spans are dropped, exact duplicates of an earlier highlight are dropped (highlights of the same span with, e.g., a different category are kept), and the remaining position highlights are sorted by start (outer spans first) ahead of the other highlights. Each of them gets an `overlaps` flag telling whether its span overlaps another, which event handlers receive with the value. Term highlights whose position is dropped keep highlighting their term. Useful for highlights generated in bulk, e.g. from model output.
+            lazy_panel_content: If True, the `content` of each highlight is kept in a server-side store and only an id is sent with the value. The side panel fetches the content when a highlight is opened, and prefetches the content of recently opened highlights when the value changes. Event handlers still receive the full content.
+            panel_cache_size: Maximum number of distinct panel contents kept in the server-side store when `lazy_panel_content` is True. The contents of a value are stored and evicted together, least recently used value first; a value with more distinct contents than this is sent with its content inline. If the content of a value has been evicted, its side panel shows the content as unavailable, and `preprocess` passes its highlights on with an empty `content` and the `content_id` of the missing content, and shows a warning.
+            edit_payloads: If True, every value sent to the browser is given a version and kept in a server-side history, and a document saved in the editor is applied on the server from its list of edits against that version: the server rebuilds the document and moves the position highlights past the edits, and from then on the browser only sends the edits and the version of the result, which `preprocess` expands so that event handlers receive the full value as usual. A saved version is pinned in the history while the browser refers to it. If the version the browser edited is no longer in the history, the browser sends the full document instead.
+            edit_history_size: Maximum number of versions kept in the server-side history when `edit_payloads` is True, not counting saved versions that are pinned while a browser refers to them.
+            metrics: If True, the wall time, highlight count, content length and serialized payload size of every `preprocess` and `postprocess` call are recorded in the in-process registry `gradio_markdownlabel.metrics.REGISTRY`, together with the render durations reported by the browser, which sends them in batches. Pass a `MetricsRegistry` to record into it instead. The registry can be exported in the Prometheus text format with `export_prometheus()`.
+            category_filter: If True, a row of toggles above the document shows the number of highlights in each category and lets the user hide and show categories. Toggling a category only restyles the highlights already rendered in the browser; nothing is re-rendered or sent to the server.
+            glossary: A glossary file written with `gradio_markdownlabel.glossary.write_glossary` (or an open `GlossaryStore`). The file is memory-mapped, so every worker process shares the same pages, and a file rewritten with `write_glossary` is picked up by the next update. Highlights can then give a `glossary_id` instead of their own fields: `postprocess` fills in the empty `term`, `title`, `category` and `color` from the entry, and the entry's `content` is only read when the side panel is opened. Event handlers receive such highlights with their `glossary_id` and an empty `content`.
+            select_events: What a click on a highlight sends to the server. The side panel is opened in the browser either way. "full" triggers `select` with the clicked highlight as `value`. "index" triggers it with only the index of the highlight in the value as `value` (and `index`), which keeps the request small. "none" handles clicks entirely in the browser and never triggers `select`.
+            select_throttle: Minimum number of seconds between two `select` events. Clicks in between are coalesced: the latest one is sent when the interval ends, so rapid clicking does not queue one event per click.
             label: the label for this component. Appears above the component and is also used as the header if there are a table of examples for this component. If None and used in a `gr.Interface`, the label will be the name of the parameter this component is assigned to.
             every: Continously calls `value` to recalculate it if `value` is a function (has no effect otherwise). Can provide a Timer whose tick resets `value`, or a float that provides the regular interval for the reset Timer.
             inputs: Components that are used as inputs to calculate `value` if `value` is a function (has no effect otherwise). `value` is recalculated any time the inputs change.
@@ -99,6 +219,40 @@ class MarkdownLabel(Component):
         self.edit_mode = edit_mode
         self.show_preview = show_preview
         self.markdown_editor = markdown_editor
+        self.resolve_terms = resolve_terms
+        self.server_render = server_render
+        self._render_cache = RenderCache(maxsize=render_cache_size)
+        self.delta_updates = delta_updates
+        self._value_history = ValueHistory(maxsize=value_history_size)
+        self.streaming = streaming
+        self.virtualize = virtualize
+        self.compact_highlights = compact_highlights
+        if highlight_validation not in ("full", "bulk", "none"):
+            raise ValueError(
+                f"highlight_validation must be one of 'full', 'bulk' or 'none', not {highlight_validation!r}."
+            )
+        self.highlight_validation = highlight_validation
+        self.normalize_positions = normalize_positions
+        self.lazy_panel_content = lazy_panel_content
+        self._panel_store = PanelStore(maxsize=panel_cache_size)
+        self.edit_payloads = edit_payloads
+        self._edit_history = ValueHistory(maxsize=edit_history_size)
+        self.metrics = metrics is not False
+        self._metrics = REGISTRY if metrics is True else metrics or None
+        self.category_filter = category_filter
+        self.glossary = glossary is not None
+        if select_events not in ("full", "index", "none"):
+            raise ValueError(
+                f"select_events must be one of 'full', 'index' or 'none', not {select_events!r}."
+            )
+        self.select_events = select_events
+        self.select_throttle = select_throttle
+        # A glossary file is reopened through `open_glossary` on each use, so a rewritten file is picked up
+        self._glossary = (
+            glossary
+            if glossary is None or isinstance(glossary, GlossaryStore)
+            else open_glossary(glossary).path
+        )
         self.rtl = rtl
         super().__init__(
             label=label,
@@ -168,21 +322,71 @@ class MarkdownLabel(Component):
         Parameters:
             payload: An instance of MarkdownLabelData
         Returns:
-            Passes the value as a dictionary with markdown_content and highlights.
+            Passes the value as a dictionary with markdown_content and highlights. After the user saved an edit in the browser, `edits` lists the splices made to the previous content, as sorted, non-overlapping {"start", "delete_count", "insert"} dictionaries; position highlights have already been moved past them, and those whose text was edited were dropped. Use `gradio_markdownlabel.delta.changed_regions` to find the regions to re-annotate.
         """
+        if self._metrics is None or payload is None:
+            return self._preprocess(payload)
+        start = time.perf_counter()
+        value = self._preprocess(payload)
+        self._observe("preprocess", time.perf_counter() - start, value, payload)
+        return value
+
+    def _preprocess(self, payload: MarkdownLabelData | None) -> dict | None:
         if payload is None:
             return None
-        return payload.root.model_dump()
+        root = payload.root
+        if root.base_version is not None:
+            root = self._resolve_edits(root)
+        value = root.model_dump()
+        # Fields that only describe the payload are not passed on to event handlers
+        for field in _WIRE_FIELDS:
+            value.pop(field, None)
+        if root.columns is not None:
+            value["highlights"] = decode_highlights(root.columns)
+        stored = []
+        for highlight in value["highlights"]:
+            content_id = highlight.pop("content_id", None)
+            if not content_id or highlight["content"]:
+                continue
+            if content_id.startswith(_GLOSSARY_CONTENT):
+                highlight["glossary_id"] = content_id[len(_GLOSSARY_CONTENT) :]
+            else:
+                stored.append((highlight, content_id))
+        if stored:
+            contents = self._panel_store.get_many(content_id for _, content_id in stored)
+            evicted = 0
+            for highlight, content_id in stored:
+                content = contents.get(content_id)
+                if content is None:
+                    # Passed on without its content; the id tells handlers which content is missing
+                    highlight["content_id"] = content_id
+                    evicted += 1
+                else:
+                    highlight["content"] = content
+            if evicted:
+                show_warning(
+                    f"The side panel content of {evicted} highlight(s) is no longer stored on the server. "
+                    "Increase `panel_cache_size`."
+                )
+        return value
 
     def postprocess(
         self, value: dict | None
-    ) -> MarkdownLabelData | None:
+    ) -> MarkdownLabelData | dict | None:
         """
         Parameters:
             value: Expects a dictionary with 'markdown_content' and 'highlights' keys
         Returns:
             An instance of MarkdownLabelData
         """
+        if self._metrics is None or value is None:
+            return self._postprocess(value)
+        start = time.perf_counter()
+        data = self._postprocess(value)
+        self._observe("postprocess", time.perf_counter() - start, value, data)
+        return data
+
+    def _postprocess(self, value: dict | None) -> MarkdownLabelData | dict | None:
         if value is None:
             return None
         
@@ -195,23 +399,287 @@ class MarkdownLabel(Component):
         # Ensure required keys exist
         markdown_content = value.get("markdown_content", "")
         highlights = value.get("highlights", [])
+        overlaps = []
+        if self.normalize_positions and highlights:
+            highlights, overlaps = normalize_highlight_positions(highlights, len(markdown_content))
+            # The normalized position highlights come first, and are all dictionaries
+            overlaps = overlaps.tolist()
+
+        if self._passes_highlights_through():
+            payload_highlights = [
+                {**_highlight_defaults, **highlight}
+                for highlight in highlights
+                if isinstance(highlight, dict)
+            ]
+            for highlight, overlap in zip(payload_highlights, overlaps):
+                highlight["overlaps"] = overlap
+            return {
+                **_payload_defaults,
+                "markdown_content": markdown_content,
+                "highlights": payload_highlights,
+            }
         
         # Validate highlights structure
+        processed_highlights = self._build_highlights(highlights)
+        for highlight, overlap in zip(processed_highlights, overlaps):
+            highlight.overlaps = overlap
+
+        if self._glossary is not None:
+            self._resolve_glossary(processed_highlights)
+
+        if self.lazy_panel_content:
+            self._store_panel_content(processed_highlights)
+
+        if self.resolve_terms:
+            self._resolve_term_spans(markdown_content, processed_highlights)
+        
+        if self.highlight_validation == "none":
+            markdown_data = MarkdownData.model_construct(
+                markdown_content=markdown_content,
+                highlights=processed_highlights
+            )
+        else:
+            markdown_data = MarkdownData(
+                markdown_content=markdown_content,
+                highlights=processed_highlights
+            )
+
+        if self.server_render:
+            markdown_data.html = self._render_cache.get_or_render(
+                content_key(markdown_content, processed_highlights),
+                lambda: render_html(markdown_content, processed_highlights),
+            )
+        elif self.delta_updates:
+            markdown_data = self._to_delta(markdown_data)
+        if self.edit_payloads and markdown_data.patch is None:
+            markdown_data.version = markdown_data.version or content_key(
+                markdown_content, processed_highlights
+            )
+            self._edit_history.add(markdown_data)
+
+        if self.compact_highlights and markdown_data.highlights:
+            # Copy, as the value history keeps the uncompacted value
+            markdown_data = markdown_data.model_copy(
+                update={
+                    "highlights": [],
+                    "columns": HighlightColumns(
+                        **encode_highlights(markdown_data.highlights)
+                    ),
+                }
+            )
+        
+        if self.highlight_validation == "none":
+            return MarkdownLabelData.model_construct(root=markdown_data)
+        return MarkdownLabelData(root=markdown_data)
+
+    def _observe(self, method: str, seconds: float, value: dict | None, payload: Any) -> None:
+        value = value if isinstance(value, dict) else {}
+        highlights = value.get("highlights") or []
+        self._metrics.observe_call(
+            method,
+            seconds,
+            highlights=len(highlights),
+            content_length=len(value.get("markdown_content") or ""),
+            payload_bytes=payload_size(payload),
+        )
+
+    def _passes_highlights_through(self) -> bool:
+        return self.highlight_validation == "none" and not (
+            self.resolve_terms
+            or self.edit_payloads
+            or self.server_render
+            or self.delta_updates
+            or self.compact_highlights
+            or self.lazy_panel_content
+            or self._glossary is not None
+        )
+
+    def _build_highlights(self, highlights: list) -> list[HighlightDefinition]:
+        if self.highlight_validation == "bulk":
+            return _highlight_list_adapter.validate_python(
+                [highlight for highlight in highlights if isinstance(highlight, dict)]
+            )
+        if self.highlight_validation == "none":
+            construct = HighlightDefinition.model_construct
+            return [
+                construct(**highlight)
+                for highlight in highlights
+                if isinstance(highlight, dict)
+            ]
         processed_highlights = []
         for highlight in highlights:
             if isinstance(highlight, dict):
-                processed_highlights.append(HighlightDefinition(
-                    term=highlight.get("term", ""),
-                    position=highlight.get("position", []),
-                    title=highlight.get("title", ""),
-                    content=highlight.get("content", ""),
-                    category=highlight.get("category", ""),
-                    color=highlight.get("color", "")
-                ))
-        
-        markdown_data = MarkdownData(
-            markdown_content=markdown_content,
-            highlights=processed_highlights
+                processed_highlights.append(HighlightDefinition.model_validate(highlight))
+        return processed_highlights
+
+    def _glossary_store(self) -> GlossaryStore | None:
+        if self._glossary is None or isinstance(self._glossary, GlossaryStore):
+            return self._glossary
+        return open_glossary(self._glossary)
+
+    def _resolve_glossary(self, highlights: list[HighlightDefinition]) -> None:
+        store = self._glossary_store()
+        for highlight in highlights:
+            if highlight.glossary_id is None:
+                continue
+            entry = store.get(highlight.glossary_id, _GLOSSARY_INLINE_FIELDS)
+            if entry is None:
+                continue
+            for field, text in entry.items():
+                if not getattr(highlight, field):
+                    setattr(highlight, field, text)
+            if not highlight.content:
+                highlight.content_id = _GLOSSARY_CONTENT + highlight.glossary_id
+
+    def _store_panel_content(self, highlights: list[HighlightDefinition]) -> None:
+        with_content = [highlight for highlight in highlights if highlight.content]
+        ids = self._panel_store.put_value(highlight.content for highlight in with_content)
+        # A value with more distinct contents than the store holds is sent with its content inline
+        if ids is None:
+            return
+        for highlight, content_id in zip(with_content, ids):
+            highlight.content_id = content_id
+            highlight.content = ""
+
+    def _resolve_term_spans(
+        self, markdown_content: str, highlights: list[HighlightDefinition]
+    ) -> None:
+        term_highlights = [h for h in highlights if h.term.strip()]
+        if not term_highlights:
+            return
+        # Position highlights are not reserved: terms inside them stay highlighted, nested within them
+        spans = resolve_term_spans(markdown_content, [h.term for h in term_highlights])
+        for highlight, term_spans in zip(term_highlights, spans):
+            highlight.spans = term_spans
+
+    def _to_delta(self, markdown_data: MarkdownData) -> MarkdownData:
+        base = self._value_history.find_base(markdown_data.markdown_content)
+        if base is None:
+            markdown_data.version = content_key(
+                markdown_data.markdown_content, markdown_data.highlights
+            )
+            self._value_history.add(markdown_data)
+            return markdown_data
+
+        start, delete_count, insert = diff_text(
+            base.markdown_content, markdown_data.markdown_content
         )
-        
-        return MarkdownLabelData(root=markdown_data)
+        removed, added = diff_highlights(base.highlights, markdown_data.highlights)
+        # The browser appends added highlights after the kept ones; record the value in that order.
+        sent = MarkdownData(
+            markdown_content=markdown_data.markdown_content,
+            highlights=apply_highlight_diff(base.highlights, removed, added),
+        )
+        sent.version = content_key(sent.markdown_content, sent.highlights)
+        self._value_history.add(sent)
+        return MarkdownData(
+            markdown_content="",
+            version=sent.version,
+            patch=MarkdownPatch(
+                base_version=base.version,
+                start=start,
+                delete_count=delete_count,
+                insert=insert,
+                removed_highlights=removed,
+                added_highlights=added,
+            ),
+        )
+
+    def _apply_edits(self, base: MarkdownData, edits: list[dict]) -> MarkdownData:
+        highlights = rebase_highlights(
+            [highlight.model_dump() for highlight in base.highlights], edits
+        )
+        data = MarkdownData(
+            markdown_content=apply_edits(base.markdown_content, edits),
+            highlights=highlights,
+        )
+        data.version = content_key(data.markdown_content, data.highlights)
+        self._edit_history.add(data)
+        return data
+
+    def _resolve_edits(self, root: MarkdownData) -> MarkdownData:
+        # The browser has the edits applied through `save_edits` first, which pins the result
+        data = self._edit_history.get(root.version) if root.version else None
+        if data is None:
+            base = self._edit_history.get(root.base_version)
+            if base is None:
+                raise Error(
+                    "The saved document is no longer available on the server. Save it again."
+                )
+            data = self._apply_edits(base, [edit.model_dump() for edit in root.edits or []])
+        return data.model_copy(update={"edits": root.edits})
+
+    @server
+    def save_edits(self, saved: dict) -> str | None:
+        """
+        Parameters:
+            saved: the "base_version" of the value the browser edited, and the sorted, non-overlapping {"start", "delete_count", "insert"} "edits" made to it.
+        Returns:
+            The version of the edited value, which is pinned for `preprocess` until the browser releases it. None if the base version is no longer remembered, in which case the browser sends the full document.
+        """
+        base = self._edit_history.get(saved["base_version"])
+        if base is None:
+            return None
+        version = self._apply_edits(base, saved["edits"]).version
+        self._edit_history.pin(version)
+        # The browser now refers to the new version only
+        if version != base.version:
+            self._edit_history.unpin(base.version)
+        return version
+
+    @server
+    def release_version(self, version: str) -> None:
+        """
+        Parameters:
+            version: a version returned by `save_edits` that the browser no longer refers to, because its value was replaced or the component was destroyed.
+        """
+        self._edit_history.unpin(version)
+
+    @server
+    def fetch_version(self, version: str) -> dict | None:
+        """
+        Parameters:
+            version: the version of a recently sent value.
+        Returns:
+            The full value, for a browser that received a patch against a version it does not hold. None if the version is no longer remembered.
+        """
+        data = self._value_history.get(version)
+        return None if data is None else data.model_dump()
+
+    @server
+    def fetch_panel_content(self, content_ids: list[str]) -> dict[str, str]:
+        """
+        Parameters:
+            content_ids: ids of highlight contents sent with `lazy_panel_content` or read from the `glossary`.
+        Returns:
+            A mapping from id to panel content. Ids that are no longer stored are left out.
+        """
+        glossary_ids = [i for i in content_ids if i.startswith(_GLOSSARY_CONTENT)]
+        found = self._panel_store.get_many(i for i in content_ids if not i.startswith(_GLOSSARY_CONTENT))
+        if glossary_ids and self._glossary is not None:
+            entries = self._glossary_store().get_many(i[len(_GLOSSARY_CONTENT) :] for i in glossary_ids)
+            found.update({_GLOSSARY_CONTENT + key: content for key, content in entries.items()})
+        return found
+
+    @server
+    def record_render(self, renders: list[dict]) -> None:
+        """
+        Parameters:
+            renders: the data of a batch of `rendered` events, reported by the browser when `metrics` is set.
+        """
+        if self._metrics is None or not isinstance(renders, list):
+            return
+        # The browser sends at most this many per batch; anything beyond is dropped
+        for render in renders[:_MAX_RENDER_REPORTS]:
+            if not isinstance(render, dict):
+                continue
+            duration = render.get("duration")
+            if isinstance(duration, (int, float)) and not isinstance(duration, bool):
+                self._metrics.observe_client_render(render.get("mode"), duration / 1000)
+
+    def render_cache_info(self) -> RenderCacheInfo:
+        """
+        Returns:
+            Hit and miss counters and the current size of the server-side render cache.
+        """
+        return self._render_cache.info()
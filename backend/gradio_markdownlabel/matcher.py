@@ -0,0 +1,153 @@
+"""Server-side multi-term matcher used to resolve term highlights to spans."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+
+
+def _is_word(ch: str) -> bool:
+    # Mirrors `\b` in a non-unicode JavaScript RegExp: only [A-Za-z0-9_] are word characters.
+    return ch == "_" or ("0" <= ch <= "9") or ("a" <= ch <= "z") or ("A" <= ch <= "Z")
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(ch: str) -> str:
+    # Mirrors case-insensitive matching of a non-unicode JavaScript RegExp (the `i` flag):
+    # characters are canonicalized with toUpperCase, unless that would change the length
+    # or map a non-ASCII character onto an ASCII one.
+    upper = ch.upper()
+    if len(upper) != 1 or (ord(ch) >= 128 and ord(upper) < 128):
+        return ch
+    return upper
+
+
+def fold_case(text: str) -> str:
+    """
+    Case-folds text one character at a time so that offsets in the result match offsets in the input.
+    """
+    if text.isascii():
+        return text.upper()
+    return "".join(_fold_char(ch) for ch in text)
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over a set of terms. Scans a document once, regardless of the number of terms,
+    and reports the same matches as a case-insensitive `\\bterm\\b` regular expression run for each term.
+    """
+
+    def __init__(self, terms: Sequence[str]):
+        """
+        Parameters:
+            terms: the terms to match. Empty or whitespace-only terms never match.
+        """
+        self.terms = tuple(terms)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        self._lengths = [len(term) for term in self.terms]
+
+        for term_index, term in enumerate(self.terms):
+            if not term.strip():
+                continue
+            state = 0
+            for ch in fold_case(term):
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (term_index,)
+
+        # Breadth-first construction of failure links; outputs are merged along them.
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def find_all(self, text: str) -> list[list[list[int]]]:
+        """
+        Parameters:
+            text: the document to scan.
+        Returns:
+            For each term, the list of [start, end] character spans it matches in `text`. Matches of one term
+            never overlap each other; as with a global regular expression, the leftmost match wins.
+        """
+        spans: list[list[list[int]]] = [[] for _ in self.terms]
+        next_free = [0] * len(self.terms)
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        length = len(text)
+        state = 0
+        for i, ch in enumerate(fold_case(text)):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for term_index in out[state]:
+                start = end - lengths[term_index]
+                if start < next_free[term_index]:
+                    continue
+                before = start > 0 and _is_word(text[start - 1])
+                after = end < length and _is_word(text[end])
+                if before == _is_word(text[start]) or after == _is_word(text[end - 1]):
+                    continue
+                spans[term_index].append([start, end])
+                next_free[term_index] = end
+        return spans
+
+
+@lru_cache(maxsize=32)
+def compile_terms(terms: tuple[str, ...]) -> TermMatcher:
+    """
+    Returns a TermMatcher for the given terms, reusing a previously compiled automaton for the same term set.
+    """
+    return TermMatcher(terms)
+
+
+def resolve_term_spans(
+    text: str, terms: Sequence[str], reserved: Sequence[Sequence[int]] = ()
+) -> list[list[list[int]]]:
+    """
+    Resolves every term to the non-overlapping spans it occupies in `text`. Where spans of different terms
+    overlap, the term listed first keeps its span, just as the first highlight wraps the text first in the browser.
+    Parameters:
+        text: the markdown document.
+        terms: the term of each highlight, in highlight order.
+        reserved: [start, end] spans already taken by position highlights; terms overlapping them are dropped.
+    Returns:
+        For each term, the list of [start, end] spans assigned to it.
+    """
+    return resolve_matches(compile_terms(tuple(terms)), text, reserved)
+
+
+def resolve_matches(
+    matcher: TermMatcher, text: str, reserved: Sequence[Sequence[int]] = ()
+) -> list[list[list[int]]]:
+    """
+    Same as `resolve_term_spans`, with an already compiled matcher.
+    """
+    spans = matcher.find_all(text)
+    taken = bytearray(len(text))
+    for start, end in reserved:
+        start, end = max(start, 0), min(end, len(text))
+        if start < end:
+            taken[start:end] = b"\x01" * (end - start)
+    resolved: list[list[list[int]]] = []
+    for term_spans in spans:
+        kept = [span for span in term_spans if taken.find(1, span[0], span[1]) == -1]
+        for start, end in kept:
+            taken[start:end] = b"\x01" * (end - start)
+        resolved.append(kept)
+    return resolved
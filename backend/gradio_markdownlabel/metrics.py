@@ -0,0 +1,199 @@
+"""In-process metrics for MarkdownLabel processing, with Prometheus text export."""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+BYTES_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+# Render modes the browser reports; anything else is recorded as "other", so that client input cannot
+# create new series
+CLIENT_RENDER_MODES = frozenset(
+    ("full", "preview", "incremental", "streaming", "virtualized", "progressive", "prerendered")
+)
+
+
+class Histogram:
+    """
+    A cumulative histogram with one series per label value, in the Prometheus data model.
+    """
+
+    def __init__(self, name: str, documentation: str, label: str, buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(buckets)
+        # label value -> (per-bucket counts, with +Inf last; sum)
+        self._series: dict[str, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float) -> None:
+        with self._lock:
+            counts, total = self._series.setdefault(
+                label_value, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns:
+            For each label value, the number of observations, their sum and the cumulative bucket counts.
+        """
+        with self._lock:
+            series = {value: (list(counts), total[0]) for value, (counts, total) in self._series.items()}
+        snapshot = {}
+        for value, (counts, total) in series.items():
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                buckets[bound] = cumulative
+            snapshot[value] = {"count": cumulative, "sum": total, "buckets": buckets}
+        return snapshot
+
+    def export(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for value, series in sorted(self.snapshot().items()):
+            label = f'{self.label}="{_escape_label(value)}"'
+            for bound, count in series["buckets"].items():
+                le = "+Inf" if bound == math.inf else _format_number(bound)
+                lines.append(f'{self.name}_bucket{{{label},le="{le}"}} {count}')
+            lines.append(f"{self.name}_sum{{{label}}} {_format_number(series['sum'])}")
+            lines.append(f"{self.name}_count{{{label}}} {series['count']}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def payload_size(payload: Any) -> int:
+    """
+    Returns:
+        The size in bytes of `payload` serialized as JSON, for a value returned by `postprocess` or
+        received by `preprocess`.
+    """
+    if payload is None:
+        return 0
+    if isinstance(payload, dict):
+        return len(json.dumps(payload).encode("utf-8"))
+    return len(payload.model_dump_json().encode("utf-8"))
+
+
+class MetricsRegistry:
+    """
+    Collects per-call timings and sizes of MarkdownLabel processing in-process. Pass it (or True, for the
+    default `REGISTRY`) as `metrics=` to MarkdownLabel, and read it back with `snapshot()` or
+    `export_prometheus()`, e.g. from a route scraped by Prometheus.
+    """
+
+    def __init__(self, namespace: str = "markdownlabel"):
+        self.process_seconds = Histogram(
+            f"{namespace}_process_seconds",
+            "Wall time of MarkdownLabel preprocess and postprocess calls.",
+            "method",
+            SECONDS_BUCKETS,
+        )
+        self.highlights = Histogram(
+            f"{namespace}_highlights",
+            "Number of highlights per preprocess and postprocess call.",
+            "method",
+            COUNT_BUCKETS,
+        )
+        self.content_length = Histogram(
+            f"{namespace}_content_length_chars",
+            "Length of the markdown content per preprocess and postprocess call.",
+            "method",
+            BYTES_BUCKETS,
+        )
+        self.payload_bytes = Histogram(
+            f"{namespace}_payload_bytes",
+            "Size of the serialized payload per preprocess and postprocess call.",
+            "method",
+            BYTES_BUCKETS,
+        )
+        self.client_render_seconds = Histogram(
+            f"{namespace}_client_render_seconds",
+            "Time the browser took to render the markdown and its highlights, as reported by the client.",
+            "mode",
+            SECONDS_BUCKETS,
+        )
+        self._histograms = [
+            self.process_seconds,
+            self.highlights,
+            self.content_length,
+            self.payload_bytes,
+            self.client_render_seconds,
+        ]
+
+    def observe_call(
+        self,
+        method: str,
+        seconds: float,
+        highlights: int,
+        content_length: int,
+        payload_bytes: int,
+    ) -> None:
+        self.process_seconds.observe(method, seconds)
+        self.highlights.observe(method, highlights)
+        self.content_length.observe(method, content_length)
+        self.payload_bytes.observe(method, payload_bytes)
+
+    def observe_client_render(self, mode: object, seconds: object) -> bool:
+        """
+        Records a render duration reported by the browser. The input is untrusted: unknown modes are
+        recorded as "other", and durations that are not finite, non-negative numbers are skipped.
+        Returns:
+            Whether the duration was recorded.
+        """
+        if isinstance(seconds, bool) or not isinstance(seconds, (int, float)):
+            return False
+        if not math.isfinite(seconds) or seconds < 0:
+            return False
+        self.client_render_seconds.observe(
+            mode if isinstance(mode, str) and mode in CLIENT_RENDER_MODES else "other", float(seconds)
+        )
+        return True
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """
+        Returns:
+            For each metric name, the snapshot of its histogram (see `Histogram.snapshot`).
+        """
+        return {histogram.name: histogram.snapshot() for histogram in self._histograms}
+
+    def export_prometheus(self) -> str:
+        """
+        Returns:
+            All metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        for histogram in self._histograms:
+            lines.extend(histogram.export())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for histogram in self._histograms:
+            histogram.clear()
+
+
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,180 @@
+"""Vectorized normalization of highlight positions: clamping, dropping, deduplication and sorting."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from itertools import chain
+from typing import Any, NamedTuple
+
+import numpy as np
+
+
+class NormalizedSpans(NamedTuple):
+    indices: np.ndarray  # index of each kept span in the input, in output order
+    starts: np.ndarray
+    ends: np.ndarray
+    overlaps: np.ndarray  # True for spans that overlap (or nest in) another kept span
+
+
+def normalize_spans(starts: Any, ends: Any, length: int, dedupe: bool = True) -> NormalizedSpans:
+    """
+    Normalizes [start, end) spans in one vectorized pass over arrays.
+    Parameters:
+        starts: span starts, as an array or sequence of integers.
+        ends: span ends, as an array or sequence of integers.
+        length: the length of the content the spans refer to.
+        dedupe: whether to remove duplicates of the same [start, end).
+    Returns:
+        The spans clamped to [0, length], without empty or inverted spans, with duplicates of the same
+        [start, end) removed if `dedupe` is set (the first one is kept), sorted by start and then by
+        decreasing end so that outer spans come before the spans they contain.
+    """
+    starts = np.clip(np.asarray(starts, dtype=np.int64), 0, length)
+    ends = np.clip(np.asarray(ends, dtype=np.int64), 0, length)
+    indices = np.flatnonzero(starts < ends)
+    starts, ends = starts[indices], ends[indices]
+
+    # lexsort is stable, so the first of several identical spans stays first
+    order = np.lexsort((-ends, starts))
+    indices, starts, ends = indices[order], starts[order], ends[order]
+    if dedupe:
+        distinct = np.ones(len(indices), dtype=bool)
+        distinct[1:] = (starts[1:] != starts[:-1]) | (ends[1:] != ends[:-1])
+        indices, starts, ends = indices[distinct], starts[distinct], ends[distinct]
+    return NormalizedSpans(indices, starts, ends, _overlaps(starts, ends))
+
+
+def _overlaps(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # Spans sorted by start and then by decreasing end
+    overlaps = np.zeros(len(starts), dtype=bool)
+    if len(starts) > 1:
+        # A span overlaps an earlier one if it starts before the furthest end so far; as starts are
+        # sorted, it overlaps a later one exactly when the next span starts before it ends
+        furthest = np.maximum.accumulate(ends)
+        overlaps[1:] = starts[1:] < furthest[:-1]
+        overlaps[:-1] |= starts[1:] < ends[:-1]
+    return overlaps
+
+
+def _exact_duplicates(
+    highlights: Sequence[Any], kept: list[int], starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    # Only highlights with the same span can be duplicates, and those are adjacent after sorting
+    duplicate = np.zeros(len(kept), dtype=bool)
+    same_span = np.flatnonzero((starts[1:] == starts[:-1]) & (ends[1:] == ends[:-1])) + 1
+    seen: list[dict] = []
+    previous = -1
+    for j in same_span.tolist():
+        if j != previous + 1:
+            seen = [_without_position(highlights[kept[j - 1]])]
+        fields = _without_position(highlights[kept[j]])
+        if fields in seen:
+            duplicate[j] = True
+        else:
+            seen.append(fields)
+        previous = j
+    return duplicate
+
+
+def _without_position(highlight: dict) -> dict:
+    return {key: value for key, value in highlight.items() if key != "position"}
+
+
+_PAIR_TYPES = (list, tuple)
+
+
+def _is_position(position: Any) -> bool:
+    return (
+        type(position) in _PAIR_TYPES
+        and len(position) == 2
+        and type(position[0]) is int
+        and type(position[1]) is int
+    )
+
+
+def _position_bounds(highlights: Sequence[Any]) -> tuple[list[int], np.ndarray]:
+    # The indices of the highlights with a well-formed position, and their bounds as an (n, 2) array
+    positions = [
+        highlight.get("position") if isinstance(highlight, dict) else None
+        for highlight in highlights
+    ]
+    positioned = [
+        i
+        for i, position in enumerate(positions)
+        if type(position) in _PAIR_TYPES and len(position) == 2
+    ]
+    pairs = [positions[i] for i in positioned]
+    # Checking the types of all bounds at once is much cheaper than checking each pair
+    if set(map(type, chain.from_iterable(pairs))) - {int}:
+        keep = [j for j, pair in enumerate(pairs) if _is_position(pair)]
+        positioned = [positioned[j] for j in keep]
+        pairs = [pairs[j] for j in keep]
+    bounds = np.fromiter(chain.from_iterable(pairs), dtype=np.int64, count=2 * len(pairs))
+    return positioned, bounds.reshape(-1, 2)
+
+
+class NormalizedHighlights(NamedTuple):
+    highlights: list[Any]
+    overlaps: np.ndarray  # for the leading position highlights of `highlights`, in order
+
+
+def normalize_highlight_positions(
+    highlights: Sequence[Any], length: int, positions: Any = None
+) -> NormalizedHighlights:
+    """
+    Applies `normalize_spans` to the position highlights of a highlight list.
+    Parameters:
+        highlights: highlight dictionaries, as passed to `postprocess`.
+        length: the length of the markdown content.
+        positions: optionally, the [start, end] of every highlight as an (n, 2) integer array, e.g. the
+            array the highlights were generated from. Every highlight is then a position highlight, and
+            the positions are not read from the dictionaries, so they must match their `position`.
+    Returns:
+        The highlights, and whether the span of each remaining position highlight overlaps (or nests in)
+        that of another. The position highlights that remain come first, in document order, followed
+        by all other entries (term highlights and entries without a well-formed position) in their
+        original order. Only exact duplicates of an earlier highlight are removed: highlights of the
+        same span that differ in any other field are all kept. Term highlights whose span was dropped
+        are kept without a position. Overlapping position highlights are kept, as the renderer nests
+        them. The input dictionaries are not modified, and only the highlights whose position changes
+        are copied.
+    """
+    if positions is None:
+        positioned, bounds = _position_bounds(highlights)
+    else:
+        bounds = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        if len(bounds) != len(highlights):
+            raise ValueError(
+                f"Expected {len(highlights)} positions, one for each highlight, got {len(bounds)}."
+            )
+        positioned = range(len(highlights))
+    if not len(positioned):
+        return NormalizedHighlights(list(highlights), np.zeros(0, dtype=bool))
+    spans = normalize_spans(bounds[:, 0], bounds[:, 1], length, dedupe=False)
+
+    kept = np.asarray(positioned, dtype=np.int64)[spans.indices]
+    duplicate = _exact_duplicates(highlights, kept.tolist(), spans.starts, spans.ends)
+    removed = kept[duplicate]
+    kept, starts, ends = kept[~duplicate], spans.starts[~duplicate], spans.ends[~duplicate]
+    original = bounds[spans.indices[~duplicate]]
+    changed = np.flatnonzero((original[:, 0] != starts) | (original[:, 1] != ends))
+
+    # Gathering through an object array avoids indexing the list once per highlight in Python
+    items = np.fromiter(highlights, dtype=object, count=len(highlights))
+    normalized = items[kept].tolist()
+    for j in changed.tolist():
+        normalized[j] = {**normalized[j], "position": [int(starts[j]), int(ends[j])]}
+    placed = np.zeros(len(highlights), dtype=bool)
+    placed[positioned] = True
+    dropped = placed.copy()
+    dropped[kept] = False
+    # Exact duplicates are removed altogether, even if they have a term
+    dropped[removed] = False
+    for i in np.flatnonzero(~placed | dropped).tolist():
+        highlight = highlights[i]
+        if not placed[i]:
+            normalized.append(highlight)
+        elif str(highlight.get("term") or "").strip():
+            # A term highlight with a dropped span still highlights its term
+            normalized.append({**highlight, "position": []})
+    return NormalizedHighlights(normalized, _overlaps(starts, ends))
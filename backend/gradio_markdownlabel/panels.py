@@ -0,0 +1,91 @@
+"""Server-side store of side panel content, fetched by the browser only when a highlight is opened."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+
+def content_id(content: str) -> str:
+    """
+    Returns a content-addressed identifier, so the same panel text keeps its id across updates.
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+
+class PanelStore:
+    """
+    A bounded, thread-safe store of panel content keyed by content id. Content is stored per value: the
+    contents of one value are kept or evicted together, least recently used value first, so a value is
+    never left with only part of its content. A content shared by several values is kept as long as one
+    of them is.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Parameters:
+            maxsize: the maximum number of distinct panel contents to keep.
+        """
+        self.maxsize = maxsize
+        self._entries: dict[str, str] = {}
+        # Each stored value, as its sorted content ids, least recently used first
+        self._values: OrderedDict[tuple[str, ...], None] = OrderedDict()
+        # The stored values that reference each content id
+        self._owners: dict[str, set[tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def put_value(self, contents: Iterable[str]) -> list[str] | None:
+        """
+        Stores the panel contents of one value, evicting the least recently used values if needed.
+        Returns:
+            The content id of each content, in order, or None if the value has more distinct contents
+            than the store can hold; nothing is stored then, and the content must be sent inline.
+        """
+        contents = list(contents)
+        ids = [content_id(content) for content in contents]
+        distinct = dict(zip(ids, contents))
+        if len(distinct) > self.maxsize:
+            return None
+        key = tuple(sorted(distinct))
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                return ids
+            self._values[key] = None
+            for i, content in distinct.items():
+                self._entries[i] = content
+                self._owners.setdefault(i, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._evict(next(iter(self._values)))
+        return ids
+
+    def _evict(self, key: tuple[str, ...]) -> None:
+        del self._values[key]
+        for i in key:
+            owners = self._owners[i]
+            owners.discard(key)
+            if not owners:
+                del self._owners[i]
+                del self._entries[i]
+
+    def get(self, key: str) -> str | None:
+        return self.get_many((key,)).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        """
+        Returns:
+            The content of every key that is still stored. Evicted keys are left out. The values that
+            reference the returned contents are marked as recently used.
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                content = self._entries.get(key)
+                if content is None:
+                    continue
+                found[key] = content
+                for owner in self._owners[key]:
+                    self._values.move_to_end(owner)
+        return found
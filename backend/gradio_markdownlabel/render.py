@@ -0,0 +1,190 @@
+"""Server-side rendering of markdown and highlights to HTML, with a content-addressed LRU cache."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, NamedTuple
+
+from .matcher import resolve_term_spans
+from .sourcemap import install_render_rules, render_with_source_map
+from .spans import SpanIndex, highlight_spans
+
+if TYPE_CHECKING:
+    from .markdownlabel import HighlightDefinition
+
+DEFAULT_COLOR = "#e3f2fd"
+
+_markdown_parser = None
+
+
+def _get_markdown_parser():
+    global _markdown_parser
+    if _markdown_parser is None:
+        try:
+            from markdown_it import MarkdownIt
+        except ImportError as e:
+            raise ImportError(
+                "Server-side rendering in MarkdownLabel requires `markdown-it-py`. "
+                "Install it with `pip install gradio_markdownlabel[render]`."
+            ) from e
+        # Closest match to the GitHub-flavored defaults of `marked` used in the browser.
+        _markdown_parser = MarkdownIt("commonmark", {"html": True}).enable(
+            ["table", "strikethrough"]
+        )
+        install_render_rules(_markdown_parser)
+    return _markdown_parser
+
+
+def _hash_name(prefix: str, value: str) -> str:
+    # 32-bit FNV-1a over UTF-16 code units, in base 36, matching `hashName` in the frontend
+    units = value.encode("utf-16-le")
+    hash_ = 0x811C9DC5
+    for i in range(0, len(units), 2):
+        hash_ = ((hash_ ^ int.from_bytes(units[i : i + 2], "little")) * 0x01000193) & 0xFFFFFFFF
+    digits = ""
+    while True:
+        hash_, digit = divmod(hash_, 36)
+        digits = "0123456789abcdefghijklmnopqrstuvwxyz"[digit] + digits
+        if not hash_:
+            return f"{prefix}-{digits}"
+
+
+def _highlight_classes(highlight: HighlightDefinition) -> str:
+    classes = _hash_name("hl", highlight.color or DEFAULT_COLOR)
+    if highlight.category:
+        classes += " " + _hash_name("hl-c", highlight.category)
+    return classes
+
+
+def _term_open(highlight: HighlightDefinition, index: int) -> str:
+    return (
+        f'<span class="highlight-term {_highlight_classes(highlight)}" '
+        f'data-index="{index}" role="button" tabindex="0">'
+    )
+
+
+def _position_open(highlight: HighlightDefinition, index: int) -> str:
+    return (
+        f'<span class="highlight-position {_highlight_classes(highlight)}" '
+        f'data-index="{index}" role="button" tabindex="0">'
+    )
+
+
+def _term_spans(
+    markdown_content: str, highlights: Sequence[HighlightDefinition]
+) -> list[tuple[int, int, int]]:
+    # Terms the server has not resolved are matched with the same semantics as the browser's
+    # case-insensitive `\bterm\b` expressions, so that non-ASCII letters fold the same way
+    unresolved = [
+        index
+        for index, highlight in enumerate(highlights)
+        if highlight.term.strip() and highlight.spans is None
+    ]
+    if not unresolved:
+        return []
+    matches = resolve_term_spans(markdown_content, [highlights[index].term for index in unresolved])
+    return [
+        (start, end, index)
+        for index, term_spans in zip(unresolved, matches)
+        for start, end in term_spans
+    ]
+
+
+def render_html(markdown_content: str, highlights: Sequence[HighlightDefinition]) -> str:
+    """
+    Renders markdown to HTML and applies highlights the same way the browser does, so that the result
+    can be shown without any client-side parsing. Terms that are not resolved yet are matched in the
+    markdown with the browser's matching rules and placed through the source map, like positions.
+    Parameters:
+        markdown_content: the markdown document.
+        highlights: the highlights to apply.
+    Returns:
+        The highlighted HTML.
+    """
+    opening: dict[int, str] = {}
+
+    def open_tag(index: int) -> str:
+        if index not in opening:
+            highlight = highlights[index]
+            if len(highlight.position) == 2:
+                opening[index] = _position_open(highlight, index)
+            else:
+                opening[index] = _term_open(highlight, index)
+        return opening[index]
+
+    spans = highlight_spans(highlights, len(markdown_content))
+    return render_with_source_map(
+        _get_markdown_parser(),
+        markdown_content,
+        SpanIndex(spans + _term_spans(markdown_content, highlights)),
+        open_tag,
+        lambda index: "</span>",
+    )
+
+
+def content_key(markdown_content: str, highlights: Sequence[HighlightDefinition]) -> str:
+    """
+    Returns a hash that identifies a document together with its highlights.
+    """
+    digest = hashlib.sha256(markdown_content.encode("utf-8"))
+    digest.update(
+        json.dumps(
+            [highlight.model_dump() for highlight in highlights],
+            sort_keys=True,
+            ensure_ascii=False,
+        ).encode("utf-8")
+    )
+    return digest.hexdigest()
+
+
+class RenderCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class RenderCache:
+    """
+    A bounded, thread-safe LRU cache of rendered HTML keyed by content hash.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Parameters:
+            maxsize: the maximum number of rendered documents to keep.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: str, render: Callable[[], str]) -> str:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        html = render()
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return html
+
+    def info(self) -> RenderCacheInfo:
+        with self._lock:
+            return RenderCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
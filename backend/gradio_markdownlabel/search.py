@@ -0,0 +1,268 @@
+"""Indexed find-in-document, returning matches as position highlights."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .matcher import fold_case
+
+SEARCH_CATEGORY = "search"
+SEARCH_COLOR = "#fff59d"
+
+_INDEX_CACHE_SIZE = 4
+# Number of characters sampled from a document to key the index cache
+_FINGERPRINT_SAMPLES = 4096
+# Candidates are verified in batches of at least this many, so that a `limit` stops the search early
+_VERIFY_BATCH = 4096
+
+
+def _code_points(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+
+def _trigram_keys(codes: np.ndarray) -> np.ndarray:
+    # Code points fit in 21 bits, so three of them pack into one 64-bit key; built in place, as
+    # temporaries of a multi-megabyte document dominate the cost
+    wide = codes.astype(np.uint64)
+    keys = wide[:-2] << np.uint64(42)
+    shifted = wide[1:-1] << np.uint64(21)
+    keys |= shifted
+    keys |= wide[2:]
+    return keys
+
+
+class DocumentIndex:
+    """
+    A trigram index over one document. Every position of the document is sorted by the three characters
+    that start there, so the candidates for a query are the positions of its rarest trigram, found by
+    binary search; they are then verified against the full query in vectorized passes, in document order
+    and in batches, so that a search with a `limit` stops once it has enough matches. Queries shorter
+    than three characters take the positions of every trigram they start. Takes about 14 bytes per
+    character (16 for documents outside the Basic Multilingual Plane) besides the text. Build one with `document_index`, or
+    hold on to it and pass it to `search_highlights` in place of the document.
+    """
+
+    def __init__(self, text: str, case_sensitive: bool = False):
+        """
+        Parameters:
+            text: the document.
+            case_sensitive: if False, characters are compared case-insensitively, as in `TermMatcher`.
+        """
+        self.text = text
+        self.case_sensitive = case_sensitive
+        codes = _code_points(text if case_sensitive else fold_case(text))
+        position_type = np.int32 if len(codes) < 2**31 else np.int64
+        if len(codes) >= 3:
+            keys = _trigram_keys(codes)
+            # A stable sort keeps the positions of each trigram in document order
+            order = np.argsort(keys, kind="stable")
+            self._keys = keys[order]
+            self._positions = order.astype(position_type)
+        else:
+            self._keys = np.zeros(0, dtype=np.uint64)
+            self._positions = np.zeros(0, dtype=position_type)
+        # Comparisons only need the code points, which mostly fit in 16 bits
+        self._codes = codes.astype(np.uint16) if not len(codes) or codes.max() < 2**16 else codes
+
+    def _candidates(self, query: np.ndarray) -> tuple[np.ndarray, int]:
+        # Returns candidate positions in document order, and how far before them the query would start
+        if len(query) >= 3:
+            keys = _trigram_keys(query)
+            lows = np.searchsorted(self._keys, keys, side="left")
+            highs = np.searchsorted(self._keys, keys, side="right")
+            rarest = int(np.argmin(highs - lows))
+            return self._positions[lows[rarest] : highs[rarest]], rarest
+        # A shorter query is a prefix of every trigram it starts, and those trigrams are sorted together;
+        # the last two positions start no trigram and are checked as well
+        shift = 42
+        prefix = 0
+        for code in query.tolist():
+            prefix |= code << shift
+            shift -= 21
+        low, high = np.searchsorted(
+            self._keys, np.array([prefix, prefix + (1 << (shift + 21))], dtype=np.uint64)
+        )
+        tail = np.arange(max(len(self._codes) - 2, 0), len(self._codes), dtype=self._positions.dtype)
+        return np.concatenate([np.sort(self._positions[low:high]), tail]), 0
+
+    def find(
+        self, query: str, whole_word: bool = False, limit: int | None = None
+    ) -> list[list[int]]:
+        """
+        Parameters:
+            query: the text to find.
+            whole_word: if True, only matches that start and end at word boundaries are returned, as with a
+                `\\bquery\\b` regular expression.
+            limit: the maximum number of matches to return.
+        Returns:
+            The [start, end] spans of the non-overlapping matches of `query`, in document order; where
+            matches overlap, the leftmost one wins.
+        """
+        if not query:
+            return []
+        folded = query if self.case_sensitive else fold_case(query)
+        codes = _code_points(folded)
+        length = len(codes)
+        if codes.max() >= 2**16 and self._codes.dtype == np.uint16:
+            return []
+        candidates, shift = self._candidates(codes)
+        # Only a query whose prefix is also its suffix can match twice within one stretch of text
+        overlapping = _has_border(folded)
+        batch = max(_VERIFY_BATCH, 4 * limit) if limit is not None else len(candidates)
+        found = []
+        count = 0
+        next_free = 0
+        for low in range(0, len(candidates), max(batch, 1)):
+            starts = candidates[low : low + batch].astype(np.int64) - shift
+            starts = starts[(starts >= 0) & (starts <= len(self._codes) - length)]
+            starts = self._verify(starts, codes, whole_word)
+            if overlapping and len(starts):
+                kept = []
+                for start in starts.tolist():
+                    if start >= next_free:
+                        kept.append(start)
+                        next_free = start + length
+                starts = np.asarray(kept, dtype=np.int64)
+            found.append(starts)
+            count += len(starts)
+            if limit is not None and count >= limit:
+                break
+        starts = np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+        if limit is not None:
+            starts = starts[:limit]
+        return np.stack([starts, starts + length], axis=1).tolist()
+
+    def _verify(self, starts: np.ndarray, codes: np.ndarray, whole_word: bool) -> np.ndarray:
+        for offset in range(len(codes)):
+            if not len(starts):
+                return starts
+            starts = starts[self._codes[starts + offset] == codes[offset]]
+        if whole_word and len(starts):
+            starts = starts[self._at_word_boundaries(starts, starts + len(codes))]
+        return starts
+
+    def _at_word_boundaries(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        # Mirrors `\b` at both ends of a match, like `TermMatcher`; folding keeps word characters intact
+        codes = self._codes
+        inside_start = _is_word(codes[starts])
+        inside_end = _is_word(codes[ends - 1])
+        before = (starts > 0) & _is_word(codes[np.maximum(starts - 1, 0)])
+        after = (ends < len(codes)) & _is_word(codes[np.minimum(ends, len(codes) - 1)])
+        return (before != inside_start) & (after != inside_end)
+
+
+def _is_word(codes: np.ndarray) -> np.ndarray:
+    # Word characters of a non-unicode JavaScript RegExp: [A-Za-z0-9_]
+    return (
+        (codes == 95)
+        | ((codes >= 48) & (codes <= 57))
+        | ((codes >= 65) & (codes <= 90))
+        | ((codes >= 97) & (codes <= 122))
+    )
+
+
+def _has_border(query: str) -> bool:
+    return any(query[:k] == query[-k:] for k in range(1, len(query)))
+
+
+def _fingerprint(text: str, case_sensitive: bool) -> tuple[int, str, bool]:
+    # A strided sample of the text; unlike a hash of the whole text, it costs the same for any length
+    step = max(1, len(text) // _FINGERPRINT_SAMPLES)
+    return len(text), text[::step], case_sensitive
+
+
+_indexes: OrderedDict[tuple[int, str, bool], DocumentIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def document_index(text: str, case_sensitive: bool = False) -> DocumentIndex:
+    """
+    Returns the DocumentIndex of `text`, building it on first use. The last few indexes are cached by a
+    sample of their text, confirmed by comparing the full text, so repeated queries against the same
+    document reuse its index without hashing it.
+    """
+    key = _fingerprint(text, case_sensitive)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None and (index.text is text or index.text == text):
+            _indexes.move_to_end(key)
+            return index
+    index = DocumentIndex(text, case_sensitive)
+    with _indexes_lock:
+        _indexes[key] = index
+        _indexes.move_to_end(key)
+        while len(_indexes) > _INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
+
+
+def search_highlights(
+    markdown_content: str | DocumentIndex,
+    query: str,
+    *,
+    case_sensitive: bool = False,
+    whole_word: bool = False,
+    limit: int | None = None,
+    title: str = "",
+    content: str = "",
+    category: str = SEARCH_CATEGORY,
+    color: str = SEARCH_COLOR,
+) -> list[dict]:
+    """
+    Finds `query` in a document through its cached index.
+    Parameters:
+        markdown_content: the document to search, or a `DocumentIndex` of it that the caller holds, which
+            skips the cache lookup.
+        query: the text to find.
+        case_sensitive: whether characters are compared case-sensitively.
+        whole_word: whether matches must start and end at word boundaries.
+        limit: the maximum number of matches.
+        title: the title of each match highlight.
+        content: the panel content of each match highlight.
+        category: the category of each match highlight.
+        color: the color of each match highlight.
+    Returns:
+        One position highlight per match, in document order.
+    """
+    index = (
+        markdown_content
+        if isinstance(markdown_content, DocumentIndex)
+        else document_index(markdown_content, case_sensitive)
+    )
+    spans = index.find(query, whole_word, limit)
+    return [
+        {"position": span, "title": title, "content": content, "category": category, "color": color}
+        for span in spans
+    ]
+
+
+def with_search_highlights(
+    value: dict, query: str, index: DocumentIndex | None = None, **options
+) -> dict:
+    """
+    Replaces the search matches in a MarkdownLabel value with the matches of a new query. Returned from an
+    event handler of a MarkdownLabel with `delta_updates=True`, the document is not sent again: the update
+    only carries the highlights that were removed and added.
+    Parameters:
+        value: a MarkdownLabel value, e.g. as received by the event handler.
+        query: the text to find; an empty query clears the matches.
+        index: a `DocumentIndex` of the value's document held by the caller, used instead of the cache.
+        options: the keyword arguments of `search_highlights`.
+    Returns:
+        A copy of `value` whose highlights of the search category are replaced by the new matches.
+    """
+    category = options.get("category", SEARCH_CATEGORY)
+    markdown_content = value.get("markdown_content", "")
+    highlights = [
+        highlight
+        for highlight in value.get("highlights", [])
+        if not (isinstance(highlight, dict) and highlight.get("category") == category)
+    ]
+    if query:
+        highlights += search_highlights(
+            markdown_content if index is None else index, query, **options
+        )
+    return {**value, "highlights": highlights}
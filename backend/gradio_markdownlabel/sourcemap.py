@@ -0,0 +1,162 @@
+"""
+Placement of position highlights on parsed markdown, through a map from rendered text back to source
+offsets. Mirrors `sourcemap.ts` in the frontend.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable
+
+from .spans import SpanIndex
+
+# Characters of rendered text are matched to the source at most this far ahead of the previous one;
+# anything further is markup the parser removed (or an entity it decoded).
+_LOOKAHEAD = 16
+
+# Leaf tokens whose text is highlighted, and the default rules that render them.
+_HIGHLIGHTED = ("text", "code_inline", "fence", "code_block")
+
+
+def _same_char(source: str, rendered: str) -> bool:
+    return source == rendered or (rendered == " " and source in "\n\t")
+
+
+def align_text(text: str, source: str, start: int) -> list[int]:
+    """
+    Matches each character of `text` to a character of `source` at or after `start`, in order. Parsers
+    only ever drop characters (markup, indentation, escapes), so `text` is almost always a subsequence of
+    the source; a character that cannot be found nearby takes the offset of the one before it.
+    """
+    offsets = []
+    cursor = start
+    for i, char in enumerate(text):
+        limit = min(len(source), cursor + (len(source) if i == 0 else _LOOKAHEAD))
+        j = cursor
+        while j < limit and not _same_char(source[j], char):
+            j += 1
+        if j < limit:
+            offsets.append(j)
+            cursor = j + 1
+        else:
+            offsets.append(offsets[-1] if offsets else start)
+    return offsets
+
+
+def highlight_text(
+    text: str,
+    offsets: list[int],
+    index: SpanIndex,
+    open_tag: Callable[[int], str],
+    close_tag: Callable[[int], str],
+    escape: Callable[[str], str],
+) -> str | None:
+    """
+    Renders `text`, whose characters sit at the given source offsets, with the spans of `index` that
+    cover it. Spans are clipped to the text, so a span that continues into the next text node or block is
+    closed here and reopened there.
+    Returns:
+        The escaped, highlighted text, or None if no span covers it.
+    """
+    if not text:
+        return None
+    low, high = offsets[0], offsets[-1] + 1
+    clipped = SpanIndex(
+        span
+        for span in (
+            (bisect_left(offsets, max(start, low)), bisect_left(offsets, min(end, high)), highlight)
+            for start, end, highlight in index.overlapping(low, high)
+        )
+        if span[0] < span[1]
+    )
+    if not len(clipped):
+        return None
+    pieces = []
+    cursor = 0
+    for at, is_open, highlight in clipped.markers(0, len(text)):
+        pieces.append(escape(text[cursor:at]))
+        pieces.append(open_tag(highlight) if is_open else close_tag(highlight))
+        cursor = at
+    pieces.append(escape(text[cursor:]))
+    return "".join(pieces)
+
+
+def install_render_rules(md) -> None:
+    """
+    Makes `md` render leaf tokens from the highlighted HTML that `render_with_source_map` stores in their
+    `meta`, falling back to its default rules for everything else.
+    """
+    for name in _HIGHLIGHTED:
+        default = md.renderer.rules[name]
+
+        def rule(renderer, tokens, idx, options, env, default=default, name=name):
+            token = tokens[idx]
+            highlighted = token.meta.get("highlighted") if token.meta else None
+            if highlighted is None:
+                return default(tokens, idx, options, env)
+            if name == "text":
+                return highlighted
+            if name == "code_inline":
+                return f"<code{renderer.renderAttrs(token)}>{highlighted}</code>"
+            # Blocks keep their wrapping elements and language class; only the code between the end of
+            # the opening <code> tag and the last </code> is replaced
+            html = default(tokens, idx, options, env)
+            opening = html.find("<code")
+            closing = html.rfind("</code>")
+            if opening < 0 or closing < 0:
+                return html
+            start = html.index(">", opening) + 1
+            return f"{html[:start]}{highlighted}{html[closing:]}"
+
+        md.add_render_rule(name, rule)
+
+
+def render_with_source_map(
+    md,
+    content: str,
+    index: SpanIndex,
+    open_tag: Callable[[int], str],
+    close_tag: Callable[[int], str],
+) -> str:
+    """
+    Renders markdown with position highlights applied through a source map rather than markers: the
+    tokens produced by `md` are matched back to their source offsets, and the text of every token a
+    highlight covers is wrapped directly. Highlights may span paragraphs, list items, table cells and
+    headings; they are split into one segment per text node. `md` must have `install_render_rules` applied.
+    """
+    from markdown_it.common.utils import escapeHtml
+
+    tokens = md.parse(content)
+    if index.overlapping(0, len(content)):
+        line_starts = [0]
+        for line in content.split("\n"):
+            line_starts.append(line_starts[-1] + len(line) + 1)
+        cursor = 0
+
+        def highlight_leaf(token) -> None:
+            nonlocal cursor
+            offsets = align_text(token.content, content, cursor)
+            if offsets:
+                cursor = offsets[-1] + 1
+            html = highlight_text(token.content, offsets, index, open_tag, close_tag, escapeHtml)
+            if html is not None:
+                token.meta = {**(token.meta or {}), "highlighted": html}
+
+        for token in tokens:
+            # Blocks carry their source lines; children are never matched against markup before them
+            if token.map is not None and token.map[0] < len(line_starts):
+                cursor = max(cursor, line_starts[token.map[0]])
+            if token.type == "fence":
+                # The code starts on the line after the opening fence and its info string
+                cursor = line_starts[min(token.map[0] + 1, len(line_starts) - 1)]
+                highlight_leaf(token)
+            elif token.type == "code_block":
+                highlight_leaf(token)
+            for child in token.children or ():
+                if child.type in ("text", "code_inline"):
+                    highlight_leaf(child)
+                elif child.type == "html_inline":
+                    found = content.find(child.content, cursor)
+                    if found >= 0:
+                        cursor = found + len(child.content)
+    return md.renderer.render(tokens, md.options, {})
@@ -0,0 +1,205 @@
+"""Interval index over highlight spans, used to place position highlights in a single pass."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .markdownlabel import HighlightDefinition
+
+# Subtrees this shallow are scanned linearly instead of descended into.
+_SCAN_LEVEL = 3
+
+
+def highlight_spans(
+    highlights: Sequence[HighlightDefinition], length: int
+) -> list[tuple[int, int, int]]:
+    """
+    Returns:
+        (start, end, index) for every position highlight and every server-resolved term span that lies
+        within a document of `length` characters.
+    """
+    spans = []
+    for index, highlight in enumerate(highlights):
+        if len(highlight.position) == 2:
+            spans.append((highlight.position[0], highlight.position[1], index))
+        if highlight.spans is not None and highlight.term.strip():
+            spans.extend((start, end, index) for start, end in highlight.spans)
+    return [span for span in spans if 0 <= span[0] < span[1] <= length]
+
+
+class SpanIndex:
+    """
+    A static interval tree over (start, end, index) spans. Spans are sorted by start and laid out as an
+    implicit balanced binary tree in which every node also stores the largest end in its subtree (as in
+    cgranges), so overlap and point queries take O(log n + k). Overlapping and nested spans are both kept.
+    """
+
+    __slots__ = ("starts", "ends", "indices", "_max_ends", "_max_level")
+
+    def __init__(self, spans: Iterable[tuple[int, int, int]]):
+        # Outer spans before the spans they contain, so that openings nest
+        ordered = sorted(spans, key=lambda span: (span[0], -span[1], span[2]))
+        self.starts = [span[0] for span in ordered]
+        self.ends = [span[1] for span in ordered]
+        self.indices = [span[2] for span in ordered]
+        self._max_ends = list(self.ends)
+        self._max_level = self._build()
+
+    @classmethod
+    def from_highlights(
+        cls, highlights: Sequence[HighlightDefinition], length: int
+    ) -> SpanIndex:
+        return cls(highlight_spans(highlights, length))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _build(self) -> int:
+        n = len(self.starts)
+        if n == 0:
+            return -1
+        max_ends = self._max_ends
+        last_i = (n - 1) & ~1
+        last = max_ends[last_i]
+        k = 1
+        while 1 << k <= n:
+            x = 1 << (k - 1)
+            for i in range((x << 1) - 1, n, x << 2):
+                right = max_ends[i + x] if i + x < n else last
+                max_ends[i] = max(self.ends[i], max_ends[i - x], right)
+            last_i = last_i - x if last_i >> k & 1 else last_i + x
+            if last_i < n and max_ends[last_i] > last:
+                last = max_ends[last_i]
+            k += 1
+        return k - 1
+
+    def overlapping(self, start: int, end: int) -> list[tuple[int, int, int]]:
+        """
+        Returns:
+            The (start, end, index) spans that overlap [start, end), in document order (outer spans first).
+        """
+        n = len(self.starts)
+        found = []
+        if n == 0:
+            return found
+        starts, ends, max_ends = self.starts, self.ends, self._max_ends
+        stack = [(self._max_level, (1 << self._max_level) - 1, False)]
+        while stack:
+            k, x, left_done = stack.pop()
+            if k <= _SCAN_LEVEL:
+                i = x >> k << k
+                stop = min(i + (1 << (k + 1)) - 1, n)
+                while i < stop and starts[i] < end:
+                    if start < ends[i]:
+                        found.append(i)
+                    i += 1
+            elif not left_done:
+                y = x - (1 << (k - 1))
+                stack.append((k, x, True))
+                if y >= n or max_ends[y] > start:
+                    stack.append((k - 1, y, False))
+            elif x < n and starts[x] < end:
+                if start < ends[x]:
+                    found.append(x)
+                stack.append((k - 1, x + (1 << (k - 1)), False))
+        found.sort()
+        return [(starts[i], ends[i], self.indices[i]) for i in found]
+
+    def at(self, offset: int) -> list[int]:
+        """
+        Returns:
+            The indices of the highlights that cover the character at `offset`, outermost first.
+        """
+        return [index for _, _, index in self.overlapping(offset, offset + 1)]
+
+    def markers(
+        self,
+        start: int = 0,
+        end: int | None = None,
+        accept: Callable[[int, int], bool] | None = None,
+    ) -> list[tuple[int, bool, int]]:
+        """
+        Computes properly nested open and close markers for the spans within [start, end). A span that
+        crosses another one is split where the other one closes, and both pieces keep their index.
+        Parameters:
+            start: the start of the range.
+            end: the end of the range, or None for the end of the last span.
+            accept: called with the bounds of each span in the range; spans it rejects are left out.
+        Returns:
+            (offset, is_open, index) in document order.
+        """
+        spans = (
+            list(zip(self.starts, self.ends, self.indices))
+            if start == 0 and end is None
+            else self.overlapping(start, end if end is not None else max(self.ends, default=0))
+        )
+        if end is not None:
+            spans = [span for span in spans if span[0] >= start and span[1] <= end]
+        if accept is not None:
+            spans = [span for span in spans if accept(span[0], span[1])]
+
+        markers: list[tuple[int, bool, int]] = []
+        # Open spans as (end, index), innermost last
+        open_spans: list[tuple[int, int]] = []
+        closing = sorted({span[1] for span in spans})
+        next_close = 0
+        position = 0
+
+        def close_until(offset: int) -> None:
+            nonlocal next_close
+            while next_close < len(closing) and closing[next_close] <= offset:
+                at = closing[next_close]
+                next_close += 1
+                depth = next(
+                    (d for d, (span_end, _) in enumerate(open_spans) if span_end == at),
+                    None,
+                )
+                if depth is None:
+                    continue
+                reopen = []
+                while len(open_spans) > depth:
+                    span_end, index = open_spans.pop()
+                    markers.append((at, False, index))
+                    if span_end > at:
+                        reopen.append((span_end, index))
+                for span_end, index in reversed(reopen):
+                    markers.append((at, True, index))
+                    open_spans.append((span_end, index))
+
+        for span_start, span_end, index in spans:
+            if span_start > position:
+                close_until(span_start)
+                position = span_start
+            markers.append((span_start, True, index))
+            open_spans.append((span_end, index))
+        close_until(float("inf"))
+        return markers
+
+    def emit(
+        self,
+        content: str,
+        open_marker: Callable[[int], str],
+        close_marker: Callable[[int], str],
+        offset: int = 0,
+        accept: Callable[[int, int], bool] | None = None,
+    ) -> str:
+        """
+        Inserts markers into `content` in one pass.
+        Parameters:
+            content: the document, or the slice of it that starts at `offset`.
+            open_marker: called with a highlight index, returns the text that opens it.
+            close_marker: called with a highlight index, returns the text that closes it.
+            offset: the offset of `content` in the document the spans refer to.
+            accept: see `markers`.
+        """
+        pieces = []
+        cursor = 0
+        for at, is_open, index in self.markers(offset, offset + len(content), accept):
+            at -= offset
+            pieces.append(content[cursor:at])
+            pieces.append(open_marker(index) if is_open else close_marker(index))
+            cursor = at
+        pieces.append(content[cursor:])
+        return "".join(pieces)
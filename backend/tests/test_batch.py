@@ -0,0 +1,40 @@
+from gradio_markdownlabel import highlight_documents
+from gradio_markdownlabel.markdownlabel import HighlightDefinition
+
+GLOSSARY = [
+    {"term": "machine learning", "title": "ML", "category": "tech"},
+    HighlightDefinition(term="learning", content="Overlaps the first term."),
+    {"term": " ", "title": "ignored"},
+]
+DOCUMENTS = ["", "Machine learning and learning.", "nothing here", "learning"]
+
+
+def test_single_process():
+    values = highlight_documents(DOCUMENTS, GLOSSARY, max_workers=1)
+    assert [value["markdown_content"] for value in values] == DOCUMENTS
+    assert values[0]["highlights"] == [] and values[2]["highlights"] == []
+    first, second = values[1]["highlights"]
+    assert first == {
+        "term": "machine learning",
+        "title": "ML",
+        "content": "",
+        "category": "tech",
+        "color": "",
+        "position": [],
+        "spans": [[0, 16]],
+    }
+    # The first term keeps the text they share
+    assert second["spans"] == [[21, 29]]
+    assert values[3]["highlights"][0]["spans"] == [[0, 8]]
+
+
+def test_process_pool_gives_the_same_result():
+    documents = DOCUMENTS * 5
+    assert highlight_documents(documents, GLOSSARY, max_workers=2, chunksize=3) == highlight_documents(
+        documents, GLOSSARY, max_workers=1
+    )
+
+
+def test_empty_input():
+    assert highlight_documents([], GLOSSARY) == []
+    assert highlight_documents(["text"], []) == [{"markdown_content": "text", "highlights": []}]
@@ -0,0 +1,52 @@
+from gradio_markdownlabel import MarkdownLabel
+from gradio_markdownlabel.columnar import decode_highlights, encode_highlights
+from gradio_markdownlabel.markdownlabel import HighlightColumns, HighlightDefinition, MarkdownLabelData
+
+HIGHLIGHTS = [
+    HighlightDefinition(position=[0, 3], title="A", category="x", color="#fff", overlaps=True),
+    HighlightDefinition(term="two", title="A", spans=[[4, 7], [12, 15]]),
+    HighlightDefinition(term="none", spans=[]),
+    HighlightDefinition(title="B", content_id="c1", glossary_id="g1", overlaps=False),
+]
+
+
+def test_round_trip():
+    columns = HighlightColumns(**encode_highlights(HIGHLIGHTS))
+    assert decode_highlights(columns) == [h.model_dump() for h in HIGHLIGHTS]
+
+
+def test_strings_are_shared():
+    encoded = encode_highlights(HIGHLIGHTS)
+    assert encoded["strings"].count("A") == 1
+    assert encoded["strings"].count("") == 1
+    assert encoded["span_counts"] == [-1, 2, 0, -1]
+    assert encoded["span_bounds"] == [4, 7, 12, 15]
+
+
+def test_empty_input():
+    encoded = encode_highlights([])
+    assert encoded["strings"] == [] and encoded["starts"] == []
+    assert decode_highlights(HighlightColumns(**encoded)) == []
+
+
+def test_columns_written_before_newer_fields_decode():
+    encoded = encode_highlights(HIGHLIGHTS[:1])
+    for field in ("span_counts", "content_ids", "glossary_ids", "overlaps"):
+        encoded[field] = []
+    (decoded,) = decode_highlights(HighlightColumns(**encoded))
+    assert decoded["spans"] is None and decoded["overlaps"] is None
+
+
+def test_component_round_trip():
+    component = MarkdownLabel(compact_highlights=True)
+    value = {
+        "markdown_content": "one two three",
+        "highlights": [h.model_dump() for h in HIGHLIGHTS[:3]],
+    }
+    payload = component.postprocess(value).model_dump()
+    assert payload["highlights"] == [] and payload["columns"] is not None
+    received = component.preprocess(MarkdownLabelData(**payload))
+    # The lazy-content id only describes the payload
+    assert received["highlights"] == [
+        h.model_dump(exclude={"content_id"}) for h in HIGHLIGHTS[:3]
+    ]
@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from gradio_markdownlabel.delta import (
+    ValueHistory,
+    apply_edits,
+    apply_highlight_diff,
+    changed_regions,
+    diff_highlights,
+    diff_text,
+    rebase_highlights,
+)
+from gradio_markdownlabel.markdownlabel import HighlightDefinition, MarkdownData
+
+
+@pytest.mark.parametrize(
+    "base, new",
+    [("", ""), ("", "abc"), ("abc", ""), ("abc", "abcd"), ("abcd", "abd"), ("aaa", "aaaa"), ("xyz", "abc")],
+)
+def test_diff_text_round_trip(base, new):
+    start, delete_count, insert = diff_text(base, new)
+    assert base[:start] + insert + base[start + delete_count :] == new
+    assert apply_edits(base, [{"start": start, "delete_count": delete_count, "insert": insert}]) == new
+
+
+def test_edits_and_changed_regions():
+    edits = [
+        {"start": 0, "delete_count": 1, "insert": "AA"},
+        {"start": 4, "delete_count": 2, "insert": ""},
+        {"start": 8, "delete_count": 0, "insert": "!"},
+    ]
+    assert apply_edits("abcdefghij", edits) == "AAbcdgh!ij"
+    assert changed_regions(edits) == [(0, 2), (5, 5), (7, 8)]
+    assert apply_edits("abc", []) == "abc"
+
+
+def test_rebase_moves_untouched_spans_and_drops_edited_ones():
+    edits = [{"start": 2, "delete_count": 1, "insert": "xyz"}]
+    highlights = [
+        {"position": [0, 2]},
+        {"position": [4, 6], "spans": None},
+        {"position": [1, 3]},
+        {"position": [1, 3], "term": "kept"},
+        {"term": "t", "spans": [[0, 1], [2, 3], [5, 6]]},
+    ]
+    assert rebase_highlights(highlights, edits) == [
+        {"position": [0, 2]},
+        {"position": [6, 8], "spans": None},
+        {"position": [], "term": "kept"},
+        {"term": "t", "spans": [[0, 1], [7, 8]]},
+    ]
+    assert rebase_highlights(highlights, []) is highlights
+
+
+def test_rebase_matches_edited_text():
+    rng = random.Random(0)
+    text = "".join(rng.choice("abcdefgh") for _ in range(300))
+    edits, cursor = [], 0
+    while cursor < 280:
+        start = cursor + rng.randint(1, 15)
+        delete_count = rng.randint(0, 4)
+        edits.append({"start": start, "delete_count": delete_count, "insert": "Z" * rng.randint(0, 4)})
+        cursor = start + delete_count
+    edited = apply_edits(text, edits)
+    for _ in range(300):
+        start = rng.randrange(290)
+        end = start + rng.randint(1, 10)
+        rebased = rebase_highlights([{"position": [start, end], "term": "t"}], edits)[0]["position"]
+        if rebased:
+            assert edited[rebased[0] : rebased[1]] == text[start:end]
+
+
+def test_highlight_diff_round_trip():
+    a, b, c = (HighlightDefinition(term=term) for term in "abc")
+    base = [a, b, a, c]
+    new = [a, c, c, b]
+    removed, added = diff_highlights(base, new)
+    assert removed == [2]
+    assert added == [c]
+    patched = apply_highlight_diff(base, removed, added)
+    assert sorted(h.term for h in patched) == sorted(h.term for h in new)
+
+
+def _data(content, version):
+    return MarkdownData(markdown_content=content, highlights=[], version=version)
+
+
+def test_history_evicts_least_recently_used():
+    history = ValueHistory(maxsize=2)
+    history.add(_data("a", "1"))
+    history.add(_data("ab", "2"))
+    history.get("1")
+    history.add(_data("abc", "3"))
+    assert history.get("2") is None
+    assert history.get("1").markdown_content == "a"
+
+
+def test_pinned_versions_survive_eviction():
+    history = ValueHistory(maxsize=1, max_pinned=2)
+    history.add(_data("a", "1"))
+    assert history.pin("1")
+    for version in "234":
+        history.add(_data(version, version))
+    assert history.get("1").markdown_content == "a"
+    assert not history.pin("2")
+    # Pinned versions are not patched against
+    assert history.find_base("abc") is None
+    history.unpin("1")
+    assert history.find_base("abc").version == "1"
+    assert history.get("4") is None
+
+
+def test_pinned_versions_are_capped():
+    history = ValueHistory(maxsize=4, max_pinned=2)
+    for version in "123":
+        history.add(_data(version, version))
+        history.pin(version)
+    assert history.get("1") is None
+    assert history.get("3") is not None
+
+
+def test_find_base_prefers_latest_prefix():
+    history = ValueHistory()
+    assert history.find_base("anything") is None
+    history.add(_data("ab", "1"))
+    history.add(_data("abc", "2"))
+    history.add(_data("x", "3"))
+    assert history.find_base("abcd").version == "2"
+    assert history.find_base("zzz") is None
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from gradio_markdownlabel import MarkdownLabel
+from gradio_markdownlabel.glossary import GlossaryStore, open_glossary, write_glossary
+from gradio_markdownlabel.markdownlabel import HighlightDefinition, MarkdownLabelData
+
+ENTRIES = {
+    "ml": {"term": "machine learning", "title": "ML", "content": "Learning from data.", "color": "#fff"},
+    "naïve": {"term": "naïve", "content": "ünïcödé 😀"},
+    "ai": HighlightDefinition(term="AI", title="Artificial intelligence", category="tech"),
+    "empty": {},
+}
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "glossary.bin"
+    write_glossary(path, ENTRIES)
+    return path
+
+
+def test_round_trip(path):
+    store = GlossaryStore(path)
+    assert len(store) == 4
+    assert store.get("ml") == {
+        "term": "machine learning",
+        "title": "ML",
+        "content": "Learning from data.",
+        "category": "",
+        "color": "#fff",
+    }
+    assert store.get("naïve", ["content"]) == {"content": "ünïcödé 😀"}
+    assert store.get("ai")["category"] == "tech"
+    assert store.get("empty") == dict.fromkeys(("term", "title", "content", "category", "color"), "")
+
+
+def test_missing_ids(path):
+    store = GlossaryStore(path)
+    assert store.get("missing") is None
+    assert "missing" not in store and 3 not in store and "ml" in store
+    assert store.get_many(["ml", "missing", "naïve"]) == {
+        "ml": "Learning from data.",
+        "naïve": "ünïcödé 😀",
+    }
+
+
+def test_empty_glossary(tmp_path):
+    write_glossary(tmp_path / "empty.bin", {})
+    store = GlossaryStore(tmp_path / "empty.bin")
+    assert len(store) == 0
+    assert store.get("anything") is None
+
+
+def test_rejects_other_files(tmp_path):
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a glossary file")
+    with pytest.raises(ValueError):
+        GlossaryStore(other)
+
+
+def test_rewritten_file_is_reopened(path):
+    store = open_glossary(path)
+    assert open_glossary(path) is store
+    write_glossary(path, {"ml": {"term": "ML", "content": "new"}})
+    # Make sure the modification time differs on filesystems with a coarse clock
+    os.utime(path, ns=(store.mtime_ns + 10**9, store.mtime_ns + 10**9))
+    fresh = open_glossary(path)
+    assert fresh is not store
+    assert fresh.get_many(["ml"]) == {"ml": "new"}
+    # A reader of the previous mapping is unaffected
+    assert store.get_many(["ml"]) == {"ml": "Learning from data."}
+
+
+def test_open_stores_are_bounded(tmp_path):
+    stores = []
+    for i in range(10):
+        write_glossary(tmp_path / f"{i}.bin", {"id": {"content": str(i)}})
+        stores.append(open_glossary(tmp_path / f"{i}.bin"))
+    assert open_glossary(tmp_path / "9.bin") is stores[9]
+    assert open_glossary(tmp_path / "0.bin") is not stores[0]
+    assert stores[0].get_many(["id"]) == {"id": "0"}
+
+
+def test_component_fills_highlights_from_glossary(path):
+    component = MarkdownLabel(glossary=path)
+    payload = component.postprocess(
+        {
+            "markdown_content": "Some machine learning.",
+            "highlights": [{"glossary_id": "ml", "title": "Own title"}, {"glossary_id": "missing"}],
+        }
+    ).model_dump()
+    first = payload["highlights"][0]
+    assert (first["term"], first["title"], first["content"]) == ("machine learning", "Own title", "")
+    assert component.fetch_panel_content([first["content_id"], "glossary:missing"]) == {
+        first["content_id"]: "Learning from data."
+    }
+    value = component.preprocess(MarkdownLabelData(**payload))
+    assert value["highlights"][0]["glossary_id"] == "ml"
+    assert value["highlights"][0]["content"] == ""
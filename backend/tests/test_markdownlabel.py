@@ -0,0 +1,73 @@
+import pytest
+from gradio.exceptions import Error
+
+from gradio_markdownlabel import MarkdownLabel
+from gradio_markdownlabel.markdownlabel import MarkdownLabelData
+
+VALUE = {
+    "markdown_content": "Machine learning is a subset of AI.",
+    "highlights": [
+        {"position": [0, 16], "title": "ML", "content": "Learning from data."},
+        {"position": [32, 34], "title": "AI"},
+        {"term": "subset"},
+    ],
+}
+EDITS = [{"start": 0, "delete_count": 7, "insert": "Deep"}]
+
+
+def _saved(base_version, version, edits=EDITS):
+    return MarkdownLabelData(
+        markdown_content="",
+        highlights=[],
+        base_version=base_version,
+        version=version,
+        edits=edits,
+    )
+
+
+def test_postprocess_preprocess_round_trip():
+    component = MarkdownLabel()
+    value = component.preprocess(component.postprocess(VALUE))
+    assert value["markdown_content"] == VALUE["markdown_content"]
+    assert [h["title"] for h in value["highlights"]] == ["ML", "AI", ""]
+    assert component.postprocess(None) is None and component.preprocess(None) is None
+
+
+def test_saved_edits_are_expanded():
+    component = MarkdownLabel(edit_payloads=True)
+    base = component.postprocess(VALUE).model_dump()["version"]
+    version = component.save_edits({"base_version": base, "edits": EDITS})
+    value = component.preprocess(_saved(base, version))
+    assert value["markdown_content"] == "Deep learning is a subset of AI."
+    # The edited highlight is dropped and the next one moves past the edit
+    assert [h["position"] for h in value["highlights"]] == [[29, 31], []]
+    assert value["edits"] == EDITS
+    assert "version" not in value and "base_version" not in value
+
+
+def test_saved_version_is_pinned_until_released():
+    component = MarkdownLabel(edit_payloads=True, edit_history_size=1)
+    base = component.postprocess(VALUE).model_dump()["version"]
+    version = component.save_edits({"base_version": base, "edits": EDITS})
+    for i in range(3):
+        component.postprocess({**VALUE, "markdown_content": str(i)})
+    assert component.preprocess(_saved(base, version))["markdown_content"].startswith("Deep")
+    component.release_version(version)
+    component.postprocess({**VALUE, "markdown_content": "evicts the released version"})
+    with pytest.raises(Error):
+        component.preprocess(_saved(base, version))
+
+
+def test_evicted_base_is_reported():
+    component = MarkdownLabel(edit_payloads=True, edit_history_size=1)
+    base = component.postprocess(VALUE).model_dump()["version"]
+    component.postprocess({**VALUE, "markdown_content": "newer"})
+    assert component.save_edits({"base_version": base, "edits": EDITS}) is None
+
+
+def test_edits_fall_back_to_the_base_version():
+    component = MarkdownLabel(edit_payloads=True)
+    base = component.postprocess(VALUE).model_dump()["version"]
+    # The browser could not reach `save_edits`, so the version it sends is unknown
+    value = component.preprocess(_saved(base, "unknown"))
+    assert value["markdown_content"] == "Deep learning is a subset of AI."
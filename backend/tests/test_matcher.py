@@ -0,0 +1,63 @@
+import random
+import re
+
+import pytest
+
+from gradio_markdownlabel.matcher import TermMatcher, fold_case, resolve_term_spans
+
+
+def _regex_spans(text, term):
+    # What the browser's `new RegExp(`\\b${term}\\b`, 'gi')` matches, for the terms used below
+    return [[m.start(), m.end()] for m in re.finditer(rf"\b{re.escape(term)}\b", text, re.I | re.A)]
+
+
+def test_fold_case_keeps_offsets():
+    for text in ["straße", "ǅ", "ﬁne", "İstanbul", "naïve"]:
+        assert len(fold_case(text)) == len(text)
+    # Non-ASCII letters never fold onto ASCII ones, as in JavaScript
+    assert fold_case("ſ") == "ſ"
+    assert fold_case("naïve") == fold_case("NAÏVE")
+
+
+def test_empty_input():
+    assert TermMatcher([]).find_all("text") == []
+    assert TermMatcher(["", "  ", "a"]).find_all("") == [[], [], []]
+
+
+def test_word_boundaries_and_overlapping_terms():
+    matcher = TermMatcher(["he", "she", "hers", "he"])
+    text = "she said hers, he-he and ushers"
+    assert matcher.find_all(text) == [
+        [[15, 17], [18, 20]],
+        [[0, 3]],
+        [[9, 13]],
+        [[15, 17], [18, 20]],
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_ascii_regex(seed):
+    rng = random.Random(seed)
+    alphabet = "abAB _-1"
+    text = "".join(rng.choice(alphabet) for _ in range(400))
+    terms = ["".join(rng.choice("abAB") for _ in range(rng.randint(1, 3))) for _ in range(12)]
+    matcher = TermMatcher(terms)
+    assert matcher.find_all(text) == [_regex_spans(text, term) for term in terms]
+
+
+def test_non_ascii_letters_are_not_word_characters():
+    # `\b` in a non-unicode JavaScript RegExp only knows [A-Za-z0-9_]
+    assert TermMatcher(["caf"]).find_all("café cafe") == [[[0, 3]]]
+    assert TermMatcher(["é"]).find_all("café") == [[]]
+    # ...so a term ending in one has no boundary after it
+    assert TermMatcher(["xé"]).find_all("xé") == [[]]
+
+
+def test_first_term_keeps_overlapping_text():
+    text = "new york city"
+    assert resolve_term_spans(text, ["york city", "new york"]) == [[[4, 13]], []]
+    assert resolve_term_spans(text, ["new york", "york city"]) == [[[0, 8]], []]
+
+
+def test_reserved_spans_are_skipped():
+    assert resolve_term_spans("a b a", ["a"], reserved=[[0, 1], [-5, 0], [9, 20]]) == [[[4, 5]]]
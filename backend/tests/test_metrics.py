@@ -0,0 +1,42 @@
+import math
+
+from gradio_markdownlabel import MarkdownLabel
+from gradio_markdownlabel.metrics import MetricsRegistry
+
+
+def _client_counts(registry):
+    return {
+        mode: series["count"]
+        for mode, series in registry.snapshot()["markdownlabel_client_render_seconds"].items()
+    }
+
+
+def test_unknown_modes_share_one_series():
+    registry = MetricsRegistry()
+    assert registry.observe_client_render("full", 0.01)
+    assert registry.observe_client_render("made-up", 0.01)
+    assert registry.observe_client_render(["unhashable"], 0.01)
+    assert _client_counts(registry) == {"full": 1, "other": 2}
+
+
+def test_invalid_durations_are_skipped():
+    registry = MetricsRegistry()
+    for seconds in ("1", None, True, math.nan, math.inf, -1):
+        assert not registry.observe_client_render("full", seconds)
+    assert _client_counts(registry) == {}
+
+
+def test_record_render_tolerates_junk_and_caps_batches():
+    registry = MetricsRegistry()
+    component = MarkdownLabel(metrics=registry)
+    component.record_render({"mode": "full", "duration": 1})
+    component.record_render(["junk", {"mode": "full"}, {"mode": "full", "duration": "1"}])
+    component.record_render([{"mode": "progressive", "duration": 5}] * 1000)
+    assert _client_counts(registry) == {"progressive": 50}
+
+
+def test_prometheus_export_lists_observed_series():
+    registry = MetricsRegistry()
+    registry.observe_call("postprocess", 0.002, highlights=3, content_length=10, payload_bytes=100)
+    text = registry.export_prometheus()
+    assert 'markdownlabel_process_seconds_count{method="postprocess"} 1' in text
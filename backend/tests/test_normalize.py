@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from gradio_markdownlabel import MarkdownLabel
+from gradio_markdownlabel.normalize import normalize_highlight_positions, normalize_spans
+
+
+def test_spans_are_clamped_sorted_and_deduplicated():
+    spans = normalize_spans([5, -2, 0, 3, 0, 8], [9, 4, 4, 3, 4, 20], 10)
+    assert spans.indices.tolist() == [1, 0, 5]
+    assert spans.starts.tolist() == [0, 5, 8]
+    assert spans.ends.tolist() == [4, 9, 10]
+    assert spans.overlaps.tolist() == [False, True, True]
+
+
+def test_empty_input():
+    assert len(normalize_spans([], [], 10).indices) == 0
+    assert normalize_highlight_positions([], 10).highlights == []
+
+
+def test_only_changed_highlights_are_copied():
+    kept = {"position": [2, 4], "title": "kept"}
+    clamped = {"position": [6, 50], "title": "clamped"}
+    term = {"term": "x"}
+    normalized, overlaps = normalize_highlight_positions([term, clamped, kept, "junk"], 10)
+    assert normalized[0] is kept
+    assert normalized[1] == {"position": [6, 10], "title": "clamped"}
+    assert clamped["position"] == [6, 50]
+    assert normalized[2:] == [term, "junk"]
+    assert overlaps.tolist() == [False, False]
+
+
+def test_exact_duplicates_and_dropped_terms():
+    highlights = [
+        {"position": [0, 4], "category": "a"},
+        {"position": [0, 4], "category": "b"},
+        {"position": [0, 4], "category": "a"},
+        {"position": [7, 3], "term": "dropped"},
+        {"position": [7, 3]},
+    ]
+    normalized, overlaps = normalize_highlight_positions(highlights, 10)
+    assert normalized == [
+        highlights[0],
+        highlights[1],
+        {"position": [], "term": "dropped"},
+    ]
+    assert overlaps.tolist() == [True, True]
+
+
+def test_malformed_positions_are_left_in_place():
+    highlights = [
+        {"position": [1.5, 3]},
+        {"position": [True, 3]},
+        {"position": [1, 2, 3]},
+        {"position": (1, 3)},
+    ]
+    normalized, overlaps = normalize_highlight_positions(highlights, 10)
+    assert normalized == [highlights[3], *highlights[:3]]
+    assert overlaps.tolist() == [False]
+
+
+def test_positions_array_matches_dictionaries():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(-5, 100, 500)
+    bounds = np.stack([starts, starts + rng.integers(-3, 10, 500)], axis=1)
+    highlights = [{"position": pair, "title": str(i % 7)} for i, pair in enumerate(bounds.tolist())]
+    expected = normalize_highlight_positions(highlights, 90)
+    normalized = normalize_highlight_positions(highlights, 90, positions=bounds)
+    assert normalized.highlights == expected.highlights
+    assert normalized.overlaps.tolist() == expected.overlaps.tolist()
+    with pytest.raises(ValueError):
+        normalize_highlight_positions(highlights, 90, positions=bounds[:10])
+
+
+@pytest.mark.parametrize("validation", ["full", "bulk", "none"])
+def test_postprocess_sets_overlaps(validation):
+    component = MarkdownLabel(normalize_positions=True, highlight_validation=validation)
+    highlights = [{"term": "b"}, {"position": [4, 9]}, {"position": [0, 5]}, {"position": [6, 8]}]
+    data = component.postprocess({"markdown_content": "a b c d e", "highlights": highlights})
+    payload = data if isinstance(data, dict) else data.model_dump()
+    assert [h["overlaps"] for h in payload["highlights"]] == [True, True, True, None]
+    assert "overlaps" not in highlights[1]
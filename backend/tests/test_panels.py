@@ -0,0 +1,61 @@
+import warnings
+
+from gradio_markdownlabel import MarkdownLabel
+from gradio_markdownlabel.markdownlabel import MarkdownLabelData
+from gradio_markdownlabel.panels import PanelStore, content_id
+
+
+def test_contents_of_a_value_are_evicted_together():
+    store = PanelStore(maxsize=3)
+    first = store.put_value(["a", "b"])
+    second = store.put_value(["b", "c"])
+    assert store.get_many(first + second) == {content_id(c): c for c in "abc"}
+    # Touching the first value makes the second the least recently used
+    store.get(first[0])
+    store.put_value(["d"])
+    assert store.get(content_id("c")) is None
+    assert store.get_many(first) == {first[0]: "a", first[1]: "b"}
+
+
+def test_shared_content_outlives_one_owner():
+    store = PanelStore(maxsize=2)
+    store.put_value(["a", "b"])
+    store.put_value(["a"])
+    store.put_value(["c"])
+    assert store.get(content_id("a")) == "a"
+    assert store.get(content_id("b")) is None
+
+
+def test_oversized_value_is_not_stored():
+    store = PanelStore(maxsize=2)
+    assert store.put_value(["a", "b", "c"]) is None
+    assert store.put_value(["a", "a", "b"]) == [content_id("a"), content_id("a"), content_id("b")]
+
+
+def _value(*contents):
+    return {
+        "markdown_content": "one two",
+        "highlights": [{"term": "one", "content": content} for content in contents],
+    }
+
+
+def test_preprocess_restores_stored_content():
+    component = MarkdownLabel(lazy_panel_content=True)
+    payload = component.postprocess(_value("first", ""))
+    sent = payload.model_dump()["highlights"]
+    assert sent[0]["content"] == "" and sent[0]["content_id"] == content_id("first")
+    value = component.preprocess(MarkdownLabelData(**payload.model_dump()))
+    assert [h["content"] for h in value["highlights"]] == ["first", ""]
+    assert all("content_id" not in h for h in value["highlights"])
+
+
+def test_preprocess_passes_evicted_content_on_empty():
+    component = MarkdownLabel(lazy_panel_content=True, panel_cache_size=1)
+    payload = component.postprocess(_value("first"))
+    component.postprocess(_value("second"))
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        value = component.preprocess(MarkdownLabelData(**payload.model_dump()))
+    assert value["highlights"][0]["content"] == ""
+    assert value["highlights"][0]["content_id"] == content_id("first")
+    assert any("panel_cache_size" in str(warning.message) for warning in caught)
@@ -0,0 +1,63 @@
+import re
+
+import pytest
+
+pytest.importorskip("markdown_it")
+
+from gradio_markdownlabel.markdownlabel import HighlightDefinition
+from gradio_markdownlabel.render import RenderCache, render_html
+
+
+def _highlighted(html):
+    return re.findall(r'data-index="(\d+)"[^>]*>([^<]*)</span>', html)
+
+
+def test_terms_fold_case_like_the_browser():
+    # `/\bnaïve\b/gi` matches "NAÏVE" in JavaScript, so the server must as well
+    html = render_html("A NAÏVE take on naïve sets.", [HighlightDefinition(term="naïve")])
+    assert _highlighted(html) == [("0", "NAÏVE"), ("0", "naïve")]
+
+
+def test_terms_respect_ascii_word_boundaries():
+    html = render_html("naive naives _naive café", [
+        HighlightDefinition(term="naive"),
+        HighlightDefinition(term="caf"),
+    ])
+    assert _highlighted(html) == [("0", "naive"), ("1", "caf")]
+
+
+def test_terms_are_not_matched_in_markup():
+    html = render_html(
+        'See <a title="span">span</a> and **span**.', [HighlightDefinition(term="span")]
+    )
+    assert 'title="span"' in html
+    assert _highlighted(html) == [("0", "span"), ("0", "span")]
+
+
+def test_terms_nest_in_position_highlights():
+    html = render_html(
+        "one two three",
+        [HighlightDefinition(position=[0, 7]), HighlightDefinition(term="two")],
+    )
+    assert html.startswith('<p><span class="highlight-position')
+    assert '<span class="highlight-term' in html
+    assert _highlighted(html) == [("1", "two")]
+
+
+def test_resolved_terms_are_not_matched_again():
+    html = render_html("two two", [HighlightDefinition(term="two", spans=[[4, 7]])])
+    assert html == (
+        '<p>two <span class="highlight-term hl-2cbu68" data-index="0" role="button" '
+        'tabindex="0">two</span></p>\n'
+    )
+
+
+def test_render_cache_evicts_least_recently_used():
+    cache = RenderCache(maxsize=2)
+    cache.get_or_render("a", lambda: "A")
+    cache.get_or_render("b", lambda: "B")
+    cache.get_or_render("a", lambda: "stale")
+    cache.get_or_render("c", lambda: "C")
+    assert cache.get_or_render("a", lambda: "stale") == "A"
+    assert cache.get_or_render("b", lambda: "B2") == "B2"
+    assert cache.info() == (2, 4, 2, 2)
@@ -0,0 +1,93 @@
+import random
+import re
+
+import pytest
+
+from gradio_markdownlabel import (
+    DocumentIndex,
+    MarkdownLabel,
+    document_index,
+    search_highlights,
+    with_search_highlights,
+)
+
+
+def _expected(text, query, whole_word=False, case_sensitive=False):
+    pattern = re.escape(query)
+    if whole_word:
+        pattern = rf"\b{pattern}\b"
+    flags = re.A if case_sensitive else re.A | re.I
+    return [[m.start(), m.end()] for m in re.finditer(pattern, text, flags)]
+
+
+def test_empty_input():
+    assert DocumentIndex("").find("a") == []
+    assert DocumentIndex("ab").find("ab") == [[0, 2]]
+    assert DocumentIndex("abc").find("") == []
+    assert DocumentIndex("abc").find("abcd") == []
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_find_matches_regex(seed):
+    rng = random.Random(seed)
+    text = "".join(rng.choice("aAbB _") for _ in range(2000))
+    index = DocumentIndex(text)
+    sensitive = DocumentIndex(text, case_sensitive=True)
+    for _ in range(50):
+        query = "".join(rng.choice("aAbB") for _ in range(rng.randint(1, 5)))
+        assert index.find(query) == _expected(text, query)
+        assert index.find(query, whole_word=True) == _expected(text, query, whole_word=True)
+        assert sensitive.find(query) == _expected(text, query, case_sensitive=True)
+
+
+def test_overlapping_matches_leftmost_wins():
+    assert DocumentIndex("aaaaa").find("aa") == [[0, 2], [2, 4]]
+
+
+def test_limit_keeps_the_first_matches():
+    text = "ab " * 10000
+    assert DocumentIndex(text).find("ab", limit=3) == [[0, 2], [3, 5], [6, 8]]
+    assert DocumentIndex(text).find("ab", limit=0) == []
+
+
+def test_non_ascii_text():
+    text = "Ünïcode ünïcode 😀 smile 😀"
+    index = DocumentIndex(text)
+    assert index.find("ÜNÏCODE") == [[0, 7], [8, 15]]
+    assert index.find("😀") == [[16, 17], [24, 25]]
+    assert DocumentIndex("plain text").find("😀") == []
+
+
+def test_index_cache_confirms_the_text():
+    text = "x" * 5000 + "needle"
+    index = document_index(text)
+    assert document_index(text) is index
+    other = "x" * 5000 + "noodle"
+    assert document_index(other) is not index
+    assert document_index(other).find("noodle") == [[5000, 5006]]
+
+
+def test_search_highlights_and_held_index():
+    text = "one two one"
+    highlights = search_highlights(text, "one", title="Match")
+    assert [h["position"] for h in highlights] == [[0, 3], [8, 11]]
+    assert highlights[0]["title"] == "Match"
+    assert search_highlights(DocumentIndex(text), "one", limit=1, title="Match") == highlights[:1]
+
+
+def test_with_search_highlights_replaces_previous_matches():
+    value = {"markdown_content": "one two one", "highlights": [{"term": "two"}]}
+    first = with_search_highlights(value, "one")
+    assert len(first["highlights"]) == 3
+    second = with_search_highlights(first, "two", index=DocumentIndex(value["markdown_content"]))
+    assert [h.get("position") for h in second["highlights"]] == [None, [4, 7]]
+    assert with_search_highlights(second, "")["highlights"] == value["highlights"]
+
+
+def test_search_updates_are_sent_as_patches():
+    component = MarkdownLabel(delta_updates=True)
+    value = {"markdown_content": "one two one", "highlights": []}
+    component.postprocess(value)
+    patch = component.postprocess(with_search_highlights(value, "one")).model_dump()["patch"]
+    assert patch["insert"] == "" and patch["delete_count"] == 0
+    assert [h["position"] for h in patch["added_highlights"]] == [[0, 3], [8, 11]]
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("markdown_it")
+
+from gradio_markdownlabel.markdownlabel import HighlightDefinition
+from gradio_markdownlabel.render import render_html
+from gradio_markdownlabel.sourcemap import align_text
+
+
+def _position(start, end):
+    return HighlightDefinition(position=[start, end])
+
+
+def test_align_text_skips_markup():
+    source = "a **bold** word"
+    assert align_text("a bold word", source, 0) == [0, 1, 4, 5, 6, 7, 10, 11, 12, 13, 14]
+
+
+@pytest.mark.parametrize("code", ["c", "o", "d", "e", "co", "code", "/code", "<"])
+def test_inline_code_keeps_its_tags(code):
+    source = f"`{code}`"
+    html = render_html(source, [_position(1, 1 + len(code))])
+    assert html.startswith("<p><code><span ")
+    assert html.endswith("</span></code></p>\n")
+    assert html.count("<code>") == 1 and html.count("</code>") == 1
+
+
+def test_fence_keeps_language_class():
+    source = "```code\ncode\n```\n"
+    html = render_html(source, [_position(8, 12)])
+    assert html.startswith('<pre><code class="language-code"><span ')
+    assert html.endswith("</span>\n</code></pre>\n")
+
+
+def test_indented_code_block():
+    html = render_html("    code\n", [_position(4, 8)])
+    assert html.startswith("<pre><code><span ")
+    assert html.endswith("</span>\n</code></pre>\n")
+
+
+def test_highlight_across_paragraphs_is_split():
+    source = "one two\n\nthree four"
+    html = render_html(source, [_position(4, 14)])
+    assert html.count('data-index="0"') == 2
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from gradio_markdownlabel.markdownlabel import HighlightDefinition
+from gradio_markdownlabel.spans import SpanIndex, highlight_spans
+
+
+def _random_spans(rng, count, length):
+    spans = []
+    for index in range(count):
+        start = rng.randrange(length)
+        spans.append((start, min(length, start + rng.randint(1, 30)), index))
+    return spans
+
+
+def test_empty_index():
+    index = SpanIndex([])
+    assert len(index) == 0
+    assert index.overlapping(0, 10) == []
+    assert index.markers() == []
+    assert index.emit("text", str, str) == "text"
+
+
+@pytest.mark.parametrize("count", [1, 2, 7, 16, 33, 300])
+def test_overlapping_matches_brute_force(count):
+    rng = random.Random(count)
+    spans = _random_spans(rng, count, 200)
+    index = SpanIndex(spans)
+    for _ in range(200):
+        start = rng.randrange(210)
+        end = start + rng.randint(1, 40)
+        expected = sorted(
+            (span for span in spans if span[0] < end and start < span[1]),
+            key=lambda span: (span[0], -span[1], span[2]),
+        )
+        assert index.overlapping(start, end) == expected
+
+
+def test_at_lists_outer_spans_first():
+    index = SpanIndex([(2, 4, 0), (0, 10, 1), (2, 8, 2)])
+    assert index.at(3) == [1, 2, 0]
+    assert index.at(9) == [1]
+    assert index.at(10) == []
+
+
+def test_crossing_spans_are_split_and_nested():
+    index = SpanIndex([(0, 4, 0), (2, 6, 1)])
+    html = index.emit("abcdefg", lambda i: f"<{i}>", lambda i: f"</{i}>")
+    assert html == "<0>ab<1>cd</1></0><1>ef</1>g"
+
+
+def test_emit_a_slice_with_an_offset():
+    index = SpanIndex([(3, 5, 0), (8, 12, 1)])
+    # Only spans that lie within the slice are placed
+    assert index.emit("3456789", lambda i: "[", lambda i: "]", offset=3) == "[34]56789"
+
+
+def test_highlight_spans_takes_positions_and_resolved_terms():
+    highlights = [
+        HighlightDefinition(position=[0, 3]),
+        HighlightDefinition(term="ab", spans=[[4, 6], [8, 12]]),
+        HighlightDefinition(term="unresolved"),
+        HighlightDefinition(position=[5, 2]),
+        HighlightDefinition(term=" ", spans=[[0, 1]]),
+    ]
+    assert highlight_spans(highlights, 10) == [(0, 3, 0), (4, 6, 1)]
@@ -0,0 +1,52 @@
+"""
+Measures the per-highlight cost of MarkdownLabel.postprocess for each `highlight_validation` mode.
+
+Run from the repository root with the package installed (`pip install -e .`):
+
+    python benchmarks/bench_postprocess.py --highlights 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from synthetic import make_value
+
+from gradio_markdownlabel import MarkdownLabel
+
+# About as many bytes of markdown per highlight as the documents this benchmark was first run on
+BYTES_PER_HIGHLIGHT = 24
+
+
+def time_postprocess(component: MarkdownLabel, value: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        component.postprocess(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--highlights", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    value = make_value(args.highlights * BYTES_PER_HIGHLIGHT, args.highlights, "position")
+    print(f"postprocess with {args.highlights} highlights (best of {args.repeat})")
+    baseline = None
+    for mode in ("full", "bulk", "none"):
+        component = MarkdownLabel(highlight_validation=mode)
+        seconds = time_postprocess(component, value, args.repeat)
+        baseline = baseline or seconds
+        per_highlight = seconds / args.highlights * 1e6
+        print(
+            f"  {mode:>5}: {seconds * 1e3:9.1f} ms total, "
+            f"{per_highlight:6.2f} us/highlight, {baseline / seconds:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
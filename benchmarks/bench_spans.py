@@ -0,0 +1,105 @@
+"""
+Compares placing position highlights with the span index against the previous approach, which rebuilt
+the whole string once per highlight and ran one regex over the HTML per highlight.
+
+Run from the repository root with the package installed (`pip install -e .`):
+
+    python benchmarks/bench_spans.py --spans 10000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+
+from gradio_markdownlabel.spans import SpanIndex
+
+
+def make_spans(n_spans: int, seed: int = 0) -> tuple[str, list[tuple[int, int, int]]]:
+    rng = random.Random(seed)
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing"]
+    content = " ".join(rng.choice(words) for _ in range(n_spans * 3))
+    spans = []
+    for index in range(n_spans):
+        start = rng.randrange(0, len(content) - 40)
+        spans.append((start, start + rng.randrange(3, 40), index))
+    return content, spans
+
+
+def naive_markers(content: str, spans: list[tuple[int, int, int]]) -> str:
+    result = content
+    for start, end, index in sorted(spans, key=lambda span: span[0], reverse=True):
+        result = (
+            f"{result[:start]}|||POSHL_START_{index}|||{result[start:end]}"
+            f"|||POSHL_END_{index}|||{result[end:]}"
+        )
+    return result
+
+
+def naive_replace(html: str, spans: list[tuple[int, int, int]]) -> str:
+    for _, _, index in spans:
+        marker = re.compile(rf"\|\|\|POSHL_START_{index}\|\|\|(.*?)\|\|\|POSHL_END_{index}\|\|\|")
+        html = marker.sub(lambda match: f"<span>{match.group(1)}</span>", html)
+    return html
+
+
+_MARKER = re.compile(r"\|\|\|POSHL_(START|END)_(\d+)\|\|\|")
+
+
+def indexed_markers(content: str, spans: list[tuple[int, int, int]]) -> str:
+    return SpanIndex(spans).emit(
+        content, lambda i: f"|||POSHL_START_{i}|||", lambda i: f"|||POSHL_END_{i}|||"
+    )
+
+
+def indexed_replace(html: str) -> str:
+    return _MARKER.sub(lambda match: "</span>" if match.group(1) == "END" else "<span>", html)
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--spans", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--skip-naive", action="store_true", help="only time the span index")
+    args = parser.parse_args()
+
+    for n_spans in args.spans:
+        content, spans = make_spans(n_spans)
+        print(f"{n_spans} spans over {len(content)} characters")
+
+        build = timed(SpanIndex, spans)
+        marked = indexed_markers(content, spans)
+        emit = timed(indexed_markers, content, spans)
+        replace = timed(indexed_replace, marked)
+        print(f"  index:  build {build * 1e3:8.1f} ms, emit {emit * 1e3:8.1f} ms, replace {replace * 1e3:8.1f} ms")
+
+        index = SpanIndex(spans)
+        rng = random.Random(1)
+        offsets = [rng.randrange(len(content)) for _ in range(args.queries)]
+        lookup = timed(lambda: [index.at(offset) for offset in offsets])
+        scan = timed(
+            lambda: [[i for s, e, i in spans if s <= offset < e] for offset in offsets[:100]]
+        ) * (len(offsets) / 100)
+        print(
+            f"  point lookup: {lookup / len(offsets) * 1e6:8.2f} us/query "
+            f"(linear scan {scan / len(offsets) * 1e6:8.2f} us/query)"
+        )
+
+        if not args.skip_naive:
+            # The previous approach only handled non-overlapping spans correctly; time it on the same input
+            naive_marked = naive_markers(content, spans)
+            naive_emit = timed(naive_markers, content, spans)
+            naive = timed(naive_replace, naive_marked, spans)
+            print(f"  naive:  emit {naive_emit * 1e3:8.1f} ms, replace {naive * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+A synthetic large document for comparing full and virtualized rendering in the browser.
+
+Run from the repository root with the package installed (`pip install -e .`):
+
+    python benchmarks/large_document.py --megabytes 5 --highlights 5000
+
+Both tabs display the same document. After a tab has rendered, read the timings and DOM node counts from
+the browser console:
+
+    performance.getEntriesByName("markdown-label:first-paint").map((e) => [e.detail.mode, e.duration, e.detail.domNodes])
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+
+import gradio as gr
+
+from gradio_markdownlabel import MarkdownLabel
+
+WORDS = ["clause", "party", "agreement", "term", "notice", "liability", "consent", "breach", "remedy"]
+COLORS = ["#e3f2fd", "#f3e5f5", "#fff3e0", "#e8f5e9", "#ffebee"]
+
+
+def make_document(megabytes: float, n_highlights: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    sections = []
+    size = 0
+    section = 1
+    while size < megabytes * 1_000_000:
+        paragraphs = [f"## Section {section}"]
+        for _ in range(rng.randrange(3, 8)):
+            paragraphs.append(" ".join(rng.choice(WORDS) for _ in range(rng.randrange(40, 120))) + ".")
+        if section % 5 == 0:
+            paragraphs.append("\n".join(f"- {rng.choice(WORDS)} {i}" for i in range(rng.randrange(3, 10))))
+        text = "\n\n".join(paragraphs)
+        sections.append(text)
+        size += len(text) + 2
+        section += 1
+    markdown_content = "\n\n".join(sections)
+
+    highlights = []
+    for i in range(n_highlights):
+        start = markdown_content.find(" ", rng.randrange(len(markdown_content) - 100)) + 1
+        end = markdown_content.find(" ", start)
+        highlights.append(
+            {
+                "position": [start, end],
+                "title": f"Annotation {i}",
+                "content": f"Notes for annotation {i}.",
+                "color": COLORS[i % len(COLORS)],
+            }
+        )
+    return {"markdown_content": markdown_content, "highlights": highlights}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--megabytes", type=float, default=5.0)
+    parser.add_argument("--highlights", type=int, default=5000)
+    args = parser.parse_args()
+
+    value = make_document(args.megabytes, args.highlights)
+    with gr.Blocks() as demo:
+        with gr.Tab("Full"):
+            MarkdownLabel(value=value, label="Full rendering")
+        with gr.Tab("Virtualized"):
+            MarkdownLabel(value=value, label="Virtualized rendering", virtualize=True)
+    demo.launch()
+
+
+if __name__ == "__main__":
+    main()
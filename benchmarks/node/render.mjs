@@ -0,0 +1,23 @@
+// Times the frontend `processMarkdown` path under Node for each case file given on the command line and
+// prints one JSON object per case. Run through benchmarks/suite.py, which writes the case files; it needs
+// Node 22.6 or later and the frontend dependencies (`npm install` in frontend/).
+import { readFile } from 'node:fs/promises';
+import { register } from 'node:module';
+import { performance } from 'node:perf_hooks';
+
+register('./resolve_ts.mjs', import.meta.url);
+const { processMarkdown } = await import('../../frontend/shared/highlight.ts');
+
+const repeat = Number(process.env.BENCH_REPEAT || 3);
+
+for (const path of process.argv.slice(2)) {
+	const { id, markdown_content, highlights } = JSON.parse(await readFile(path, 'utf8'));
+	let best = Infinity;
+	let html = '';
+	for (let i = 0; i < repeat; i++) {
+		const start = performance.now();
+		html = await processMarkdown(markdown_content, highlights);
+		best = Math.min(best, performance.now() - start);
+	}
+	console.log(JSON.stringify({ id, render_seconds: best / 1000, html_bytes: Buffer.byteLength(html) }));
+}
@@ -0,0 +1,12 @@
+// Module hook that lets Node load the frontend sources directly: relative imports in frontend/shared
+// leave out the `.ts` extension, which the bundler adds but Node does not.
+export async function resolve(specifier, context, nextResolve) {
+	try {
+		return await nextResolve(specifier, context);
+	} catch (error) {
+		if (error?.code === 'ERR_MODULE_NOT_FOUND' && specifier.startsWith('.') && !specifier.endsWith('.ts')) {
+			return nextResolve(`${specifier}.ts`, context);
+		}
+		throw error;
+	}
+}
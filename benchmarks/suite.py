@@ -0,0 +1,192 @@
+"""
+Benchmark suite for the backend serialization and the frontend render pipeline.
+
+For every combination of document size, highlight count and highlight kind, it times
+`MarkdownLabel.postprocess` and `MarkdownLabel.preprocess` in Python and reports the payload size, then
+times the frontend `processMarkdown` headlessly under Node. Results are written as JSON and can be
+compared against a saved baseline, in which case the run fails on a regression.
+
+Run from the repository root with the package installed (`pip install -e .`). The Node part needs
+Node 22.6 or later and the frontend dependencies (`npm install` in frontend/); it is skipped otherwise.
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import make_value
+
+from gradio_markdownlabel import MarkdownLabel
+from gradio_markdownlabel.markdownlabel import MarkdownLabelData
+
+SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+HIGHLIGHTS = [10, 1_000, 100_000]
+KINDS = ["term", "position"]
+
+# The browser matches each term highlight with its own pass over the HTML, so term cases beyond this many
+# highlight-bytes are left out of the Node run.
+NODE_TERM_BUDGET = 2_000_000_000
+
+NODE_SCRIPT = Path(__file__).parent / "node" / "render.mjs"
+
+# Timings below this many seconds are too noisy to compare.
+NOISE_FLOOR = 0.001
+
+
+def _size_label(n_bytes: int) -> str:
+    return f"{n_bytes // 1_000_000}MB" if n_bytes >= 1_000_000 else f"{n_bytes // 1_000}KB"
+
+
+def case_id(n_bytes: int, n_highlights: int, kind: str) -> str:
+    return f"{_size_label(n_bytes)}-{n_highlights}-{kind}"
+
+
+def _best_of(repeat: int, fn) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_python(value: dict, repeat: int) -> dict:
+    component = MarkdownLabel()
+    postprocess_seconds, data = _best_of(repeat, lambda: component.postprocess(value))
+    payload = data if isinstance(data, dict) else data.model_dump()
+    encoded = json.dumps(payload).encode("utf-8")
+    # What gradio does with a payload sent back by the browser: validate it, then preprocess
+    preprocess_seconds, _ = _best_of(
+        repeat, lambda: component.preprocess(MarkdownLabelData.model_validate(payload))
+    )
+    return {
+        "postprocess_seconds": postprocess_seconds,
+        "preprocess_seconds": preprocess_seconds,
+        "payload_bytes": len(encoded),
+    }
+
+
+def run_node(cases: dict[str, dict], repeat: int) -> dict[str, dict]:
+    node = shutil.which("node")
+    if node is None:
+        print("node not found, skipping the frontend benchmarks", file=sys.stderr)
+        return {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for id, value in cases.items():
+            path = Path(directory) / f"{id}.json"
+            path.write_text(json.dumps({"id": id, **value}), encoding="utf-8")
+            paths.append(str(path))
+        completed = subprocess.run(
+            [node, "--experimental-strip-types", "--no-warnings", str(NODE_SCRIPT), *paths],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "BENCH_REPEAT": str(repeat)},
+        )
+    if completed.returncode != 0:
+        print(f"frontend benchmarks failed, skipping them:\n{completed.stderr}", file=sys.stderr)
+        return {}
+    results = {}
+    for line in completed.stdout.splitlines():
+        result = json.loads(line)
+        results[result.pop("id")] = result
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Returns:
+        A description of every metric that got worse than the baseline by more than `tolerance`.
+    """
+    regressions = []
+    for id, metrics in results["cases"].items():
+        previous = baseline["cases"].get(id, {})
+        for name, value in metrics.items():
+            old = previous.get(name)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)):
+                continue
+            if name.endswith("_seconds") and value - old < NOISE_FLOOR:
+                continue
+            if value > old * (1 + tolerance):
+                regressions.append(f"{id} {name}: {old:.6g} -> {value:.6g} (+{(value / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="document sizes in bytes")
+    parser.add_argument("--highlights", type=int, nargs="+", default=HIGHLIGHTS)
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=KINDS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-node", action="store_true", help="only run the Python benchmarks")
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against results saved earlier")
+    parser.add_argument("--save-baseline", type=Path, help="write the results as a new baseline")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed slowdown before a regression, as a fraction"
+    )
+    args = parser.parse_args()
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "cases": {},
+    }
+    node_cases = {}
+    for n_bytes in args.sizes:
+        for n_highlights in args.highlights:
+            for kind in args.kinds:
+                id = case_id(n_bytes, n_highlights, kind)
+                value = make_value(n_bytes, n_highlights, kind)
+                metrics = run_python(value, args.repeat)
+                results["cases"][id] = metrics
+                print(
+                    f"{id:>24}: postprocess {metrics['postprocess_seconds'] * 1e3:9.1f} ms, "
+                    f"preprocess {metrics['preprocess_seconds'] * 1e3:9.1f} ms, "
+                    f"payload {metrics['payload_bytes'] / 1e6:8.2f} MB"
+                )
+                if kind != "term" or n_bytes * n_highlights <= NODE_TERM_BUDGET:
+                    node_cases[id] = value
+
+    if not args.skip_node and node_cases:
+        for id, metrics in run_node(node_cases, args.repeat).items():
+            results["cases"][id].update(metrics)
+            print(
+                f"{id:>24}: processMarkdown {metrics['render_seconds'] * 1e3:9.1f} ms, "
+                f"html {metrics['html_bytes'] / 1e6:8.2f} MB"
+            )
+
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nno regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Reproducible synthetic documents and highlights for the benchmark suite.
+"""
+
+from __future__ import annotations
+
+import random
+
+WORDS = [
+    "clause", "party", "agreement", "term", "notice", "liability", "consent", "breach", "remedy",
+    "schedule", "warranty", "licence", "payment", "service", "record", "period", "review", "audit",
+]
+CATEGORIES = ["person", "organization", "location", "date", "product"]
+COLORS = ["#e3f2fd", "#f3e5f5", "#fff3e0", "#e8f5e9", "#ffebee"]
+
+# Documents mention numbered references, which term highlights pick out one distinct term at a time.
+REFERENCES = 100_000
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 16))]
+    if rng.random() < 0.2:
+        words[rng.randrange(len(words))] = f"**{rng.choice(WORDS)}**"
+    if rng.random() < 0.1:
+        words[rng.randrange(len(words))] = f"`{rng.choice(WORDS)}`"
+    if rng.random() < 0.3:
+        words[rng.randrange(len(words))] = f"ref{rng.randrange(REFERENCES)}"
+    return " ".join(words).capitalize() + "."
+
+
+def _block(rng: random.Random, section: int) -> str:
+    kind = rng.random()
+    if kind < 0.05:
+        return f"## Section {section}"
+    if kind < 0.15:
+        return "\n".join(f"- {_sentence(rng)}" for _ in range(rng.randint(2, 5)))
+    if kind < 0.2:
+        lines = [f"{rng.choice(WORDS)} = {rng.randrange(1000)}" for _ in range(rng.randint(2, 6))]
+        return "```\n" + "\n".join(lines) + "\n```"
+    if kind < 0.23:
+        rows = [f"| {rng.choice(WORDS)} | {rng.randrange(1000)} |" for _ in range(rng.randint(2, 6))]
+        return "| name | value |\n|---|---|\n" + "\n".join(rows)
+    return " ".join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+
+
+def make_document(n_bytes: int, seed: int = 0) -> str:
+    """
+    Returns a markdown document of about `n_bytes` bytes with headings, paragraphs, lists, code blocks
+    and tables.
+    """
+    rng = random.Random(seed)
+    blocks = ["# Synthetic document"]
+    size = len(blocks[0])
+    while size < n_bytes:
+        block = _block(rng, len(blocks))
+        blocks.append(block)
+        size += len(block) + 2
+    return "\n\n".join(blocks)
+
+
+def make_highlights(document: str, n_highlights: int, kind: str, seed: int = 0) -> list[dict]:
+    """
+    Returns `n_highlights` highlights over `document`, either term highlights (`kind="term"`), each for a
+    different reference, or position highlights (`kind="position"`) of 3 to 40 characters.
+    """
+    rng = random.Random(seed)
+    highlights = []
+    for i in range(n_highlights):
+        category = rng.randrange(len(CATEGORIES))
+        highlight = {
+            "title": f"Entity {i}",
+            "content": f"Details about entity {i}.",
+            "category": CATEGORIES[category],
+            "color": COLORS[category],
+        }
+        if kind == "term":
+            highlight["term"] = f"ref{i % REFERENCES}"
+        else:
+            start = rng.randrange(0, max(1, len(document) - 40))
+            highlight["position"] = [start, start + rng.randrange(3, 40)]
+        highlights.append(highlight)
+    return highlights
+
+
+def make_value(n_bytes: int, n_highlights: int, kind: str, seed: int = 0) -> dict:
+    document = make_document(n_bytes, seed)
+    return {
+        "markdown_content": document,
+        "highlights": make_highlights(document, n_highlights, kind, seed),
+    }
@@ -3,7 +3,7 @@ import gradio as gr
 from app import demo as app
 import os
 
-_docs = {'MarkdownLabel': {'description': 'Displays markdown-formatted text with interactive term highlighting and detailed side panel.\n\nThis component allows for rich markdown content with clickable term highlights that display\ndetailed information in a side panel.', 'members': {'__init__': {'value': {'type': 'dict | Callable | None', 'default': 'None', 'description': 'Dictionary containing markdown_content and highlights array. If a function is provided, the function will be called each time the app loads to set the initial value of this component.'}, 'show_side_panel': {'type': 'bool', 'default': 'True', 'description': 'Whether to show the detailed information side panel.'}, 'panel_width': {'type': 'str', 'default': '"300px"', 'description': 'Width of the side panel (CSS value like "300px", "25%", etc.).'}, 'edit_mode': {'type': 'str', 'default': '"split"', 'description': 'Layout for editing mode - "split" (side-by-side), "tabs", or "overlay".'}, 'show_preview': {'type': 'bool', 'default': 'True', 'description': 'Whether to show live preview in edit mode.'}, 'markdown_editor': {'type': 'str', 'default': '"textarea"', 'description': 'Type of markdown editor - "textarea" or "codemirror" (future).'}, 'label': {'type': 'str | I18nData | None', 'default': 'None', 'description': 'the label for this component. Appears above the component and is also used as the header if there are a table of examples for this component. If None and used in a `gr.Interface`, the label will be the name of the parameter this component is assigned to.'}, 'every': {'type': 'Timer | float | None', 'default': 'None', 'description': 'Continously calls `value` to recalculate it if `value` is a function (has no effect otherwise). Can provide a Timer whose tick resets `value`, or a float that provides the regular interval for the reset Timer.'}, 'inputs': {'type': 'Component | Sequence[Component] | set[Component] | None', 'default': 'None', 'description': 'Components that are used as inputs to calculate `value` if `value` is a function (has no effect otherwise). `value` is recalculated any time the inputs change.'}, 'show_label': {'type': 'bool | None', 'default': 'None', 'description': 'if True, will display label.'}, 'container': {'type': 'bool', 'default': 'True', 'description': 'If True, will place the component in a container - providing some extra padding around the border.'}, 'scale': {'type': 'int | None', 'default': 'None', 'description': 'relative size compared to adjacent Components. For example if Components A and B are in a Row, and A has scale=2, and B has scale=1, A will be twice as wide as B. Should be an integer. scale applies in Rows, and to top-level Components in Blocks where fill_height=True.'}, 'min_width': {'type': 'int', 'default': '160', 'description': 'minimum pixel width, will wrap if not sufficient screen space to satisfy this value. If a certain scale value results in this Component being narrower than min_width, the min_width parameter will be respected first.'}, 'visible': {'type': 'bool', 'default': 'True', 'description': 'If False, component will be hidden.'}, 'elem_id': {'type': 'str | None', 'default': 'None', 'description': 'An optional string that is assigned as the id of this component in the HTML DOM. Can be used for targeting CSS styles.'}, 'elem_classes': {'type': 'list[str] | str | None', 'default': 'None', 'description': 'An optional list of strings that are assigned as the classes of this component in the HTML DOM. Can be used for targeting CSS styles.'}, 'render': {'type': 'bool', 'default': 'True', 'description': 'If False, component will not render be rendered in the Blocks context. Should be used if the intention is to assign event listeners now but render the component later.'}, 'key': {'type': 'int | str | tuple[int | str, ...] | None', 'default': 'None', 'description': "in a gr.render, Components with the same key across re-renders are treated as the same component, not a new component. Properties set in 'preserved_by_key' are not reset across a re-render."}, 'preserved_by_key': {'type': 'list[str] | str | None', 'default': '"value"', 'description': "A list of parameters from this component's constructor. Inside a gr.render() function, if a component is re-rendered with the same key, these (and only these) parameters will be preserved in the UI (if they have been changed by the user or an event listener) instead of re-rendered based on the values provided during constructor."}, 'interactive': {'type': 'bool | None', 'default': 'None', 'description': 'If True, the component will be editable allowing users to modify markdown content.'}, 'rtl': {'type': 'bool', 'default': 'False', 'description': 'If True, will display the text in right-to-left direction.'}}, 'postprocess': {'value': {'type': 'dict | None', 'description': "Expects a dictionary with 'markdown_content' and 'highlights' keys"}}, 'preprocess': {'return': {'type': 'dict | None', 'description': 'Passes the value as a dictionary with markdown_content and highlights.'}, 'value': None}}, 'events': {'change': {'type': None, 'default': None, 'description': 'Triggered when the value of the MarkdownLabel changes either because of user input (e.g. a user types in a textbox) OR because of a function update (e.g. an image receives a value from the output of an event trigger). See `.input()` for a listener that is only triggered by user input.'}, 'select': {'type': None, 'default': None, 'description': 'Event listener for when the user selects or deselects the MarkdownLabel. Uses event data gradio.SelectData to carry `value` referring to the label of the MarkdownLabel, and `selected` to refer to state of the MarkdownLabel. See EventData documentation on how to use this event data'}, 'edit': {'type': None, 'default': None, 'description': 'This listener is triggered when the user edits the MarkdownLabel (e.g. image) using the built-in editor.'}, 'submit': {'type': None, 'default': None, 'description': 'This listener is triggered when the user presses the Enter key while the MarkdownLabel is focused.'}, 'clear': {'type': None, 'default': None, 'description': 'This listener is triggered when the user clears the MarkdownLabel using the clear button for the component.'}}}, '__meta__': {'additional_interfaces': {}, 'user_fn_refs': {'MarkdownLabel': []}}}
+_docs = {'MarkdownLabel': {'description': 'Displays markdown-formatted text with interactive term highlighting and detailed side panel.\n\nThis component allows for rich markdown content with clickable term highlights that display\ndetailed information in a side panel.', 'members': {'__init__': {'value': {'type': 'dict | Callable | None', 'default': 'None', 'description': 'Dictionary containing markdown_content and highlights array. If a function is provided, the function will be called each time the app loads to set the initial value of this component.'}, 'show_side_panel': {'type': 'bool', 'default': 'True', 'description': 'Whether to show the detailed information side panel.'}, 'panel_width': {'type': 'str', 'default': '"300px"', 'description': 'Width of the side panel (CSS value like "300px", "25%", etc.).'}, 'edit_mode': {'type': 'str', 'default': '"split"', 'description': 'Layout for editing mode - "split" (side-by-side), "tabs", or "overlay".'}, 'show_preview': {'type': 'bool', 'default': 'True', 'description': 'Whether to show live preview in edit mode.'}, 'markdown_editor': {'type': 'str', 'default': '"textarea"', 'description': 'Type of markdown editor - "textarea" or "codemirror" (future).'}, 'resolve_terms': {'type': 'bool', 'default': 'False', 'description': 'If True, term highlights are matched against the markdown on the server in a single pass and sent as resolved character spans, so the browser does not have to search for every term.'}, 'server_render': {'type': 'bool', 'default': 'False', 'description': 'If True, the markdown and its highlights are rendered to HTML on the server and the browser displays the prerendered HTML without parsing it. Rendered documents are cached by a hash of their content and highlights. Requires `markdown-it-py`.'}, 'render_cache_size': {'type': 'int', 'default': '256', 'description': 'Maximum number of rendered documents kept in the server-side render cache when `server_render` is True.'}, 'delta_updates': {'type': 'bool', 'default': 'False', 'description': 'If True, repeated updates (e.g. from a generator or `every=`) are sent as a patch against the previously sent value: a splice of the markdown plus added and removed highlights. Has no effect when `server_render` is True.'}, 'value_history_size': {'type': 'int', 'default': '64', 'description': 'Maximum number of sent values kept in the server-side history that patches are computed against when `delta_updates` is True. The history is shared by every session of the component, so raise it with the number of concurrent users; an update is sent in full when none of the kept values is a prefix of it.'}, 'streaming': {'type': 'bool', 'default': 'False', 'description': 'If True, the value is expected to grow by appending (e.g. streamed LLM output). Completed markdown blocks are rendered once and kept, and each update only re-renders the trailing block that is still open.'}, 'virtualize': {'type': 'bool', 'default': 'False', 'description': 'If True, long documents are split into top-level markdown blocks and only the blocks near the viewport are rendered and mounted, with space reserved for the rest at their measured (or estimated) height. Applies when the component is not interactive.'}, 'compact_highlights': {'type': 'bool', 'default': 'False', 'description': 'If True, highlights are sent in a columnar encoding: parallel arrays of positions plus indices into a table of distinct strings. Values passed to and returned from event handlers keep the usual list of highlight dictionaries.'}, 'highlight_validation': {'type': "Literal['full', 'bulk', 'none']", 'default': '"full"', 'description': 'How highlights returned from event handlers are validated in `postprocess`. "full" validates each highlight as it is built. "bulk" validates the whole list in one call with the same guarantees (types are checked and coerced, missing keys get defaults, extra keys are ignored) and raises a single error listing every invalid highlight. "none" skips validation for trusted input: missing keys still get defaults, but values are passed through unchecked, so they must already have the right types. Unless another option needs to inspect the highlights (`resolve_terms`, `server_render`, `delta_updates`, `compact_highlights`, `lazy_panel_content`, `edit_payloads`, `glossary`), "none" also skips building highlight models and emits the payload directly, in which case extra keys are passed through as well.'}, 'normalize_positions': {'type': 'bool', 'default': 'False', 'description': 'If True, position highlights are normalized in `postprocess` in one vectorized pass before they are validated: positions are clamped to the length of the markdown, empty or inverted spans are dropped, exact duplicates of an earlier highlight are dropped (highlights of the same span with, e.g., a different category are kept), and the remaining position highlights are sorted by start (outer spans first) ahead of the other highlights. Each of them gets an `overlaps` flag telling whether its span overlaps another, which event handlers receive with the value. Term highlights whose position is dropped keep highlighting their term. Useful for highlights generated in bulk, e.g. from model output.'}, 'lazy_panel_content': {'type': 'bool', 'default': 'False', 'description': 'If True, the `content` of each highlight is kept in a server-side store and only an id is sent with the value. The side panel fetches the content when a highlight is opened, and prefetches the content of recently opened highlights when the value changes. Event handlers still receive the full content.'}, 'panel_cache_size': {'type': 'int', 'default': '4096', 'description': 'Maximum number of distinct panel contents kept in the server-side store when `lazy_panel_content` is True. The contents of a value are stored and evicted together, least recently used value first; a value with more distinct contents than this is sent with its content inline. If the content of a value has been evicted, its side panel shows the content as unavailable, and `preprocess` passes its highlights on with an empty `content` and the `content_id` of the missing content, and shows a warning.'}, 'edit_payloads': {'type': 'bool', 'default': 'False', 'description': 'If True, every value sent to the browser is given a version and kept in a server-side history, and a document saved in the editor is applied on the server from its list of edits against that version: the server rebuilds the document and moves the position highlights past the edits, and from then on the browser only sends the edits and the version of the result, which `preprocess` expands so that event handlers receive the full value as usual. A saved version is pinned in the history while the browser refers to it. If the version the browser edited is no longer in the history, the browser sends the full document instead.'}, 'edit_history_size': {'type': 'int', 'default': '256', 'description': 'Maximum number of versions kept in the server-side history when `edit_payloads` is True, not counting saved versions that are pinned while a browser refers to them.'}, 'metrics': {'type': 'bool | MetricsRegistry', 'default': 'False', 'description': 'If True, the wall time, highlight count, content length and serialized payload size of every `preprocess` and `postprocess` call are recorded in the in-process registry `gradio_markdownlabel.metrics.REGISTRY`, together with the render durations reported by the browser, which sends them in batches. Pass a `MetricsRegistry` to record into it instead. The registry can be exported in the Prometheus text format with `export_prometheus()`.'}, 'category_filter': {'type': 'bool', 'default': 'False', 'description': 'If True, a row of toggles above the document shows the number of highlights in each category and lets the user hide and show categories. Toggling a category only restyles the highlights already rendered in the browser; nothing is re-rendered or sent to the server.'}, 'glossary': {'type': 'str | os.PathLike | GlossaryStore | None', 'default': 'None', 'description': "A glossary file written with `gradio_markdownlabel.glossary.write_glossary` (or an open `GlossaryStore`). The file is memory-mapped, so every worker process shares the same pages, and a file rewritten with `write_glossary` is picked up by the next update. Highlights can then give a `glossary_id` instead of their own fields: `postprocess` fills in the empty `term`, `title`, `category` and `color` from the entry, and the entry's `content` is only read when the side panel is opened. Event handlers receive such highlights with their `glossary_id` and an empty `content`."}, 'select_events': {'type': "Literal['full', 'index', 'none']", 'default': '"full"', 'description': 'What a click on a highlight sends to the server. The side panel is opened in the browser either way. "full" triggers `select` with the clicked highlight as `value`. "index" triggers it with only the index of the highlight in the value as `value` (and `index`), which keeps the request small. "none" handles clicks entirely in the browser and never triggers `select`.'}, 'select_throttle': {'type': 'float', 'default': '0', 'description': 'Minimum number of seconds between two `select` events. Clicks in between are coalesced: the latest one is sent when the interval ends, so rapid clicking does not queue one event per click.'}, 'label': {'type': 'str | I18nData | None', 'default': 'None', 'description': 'the label for this component. Appears above the component and is also used as the header if there are a table of examples for this component. If None and used in a `gr.Interface`, the label will be the name of the parameter this component is assigned to.'}, 'every': {'type': 'Timer | float | None', 'default': 'None', 'description': 'Continously calls `value` to recalculate it if `value` is a function (has no effect otherwise). Can provide a Timer whose tick resets `value`, or a float that provides the regular interval for the reset Timer.'}, 'inputs': {'type': 'Component | Sequence[Component] | set[Component] | None', 'default': 'None', 'description': 'Components that are used as inputs to calculate `value` if `value` is a function (has no effect otherwise). `value` is recalculated any time the inputs change.'}, 'show_label': {'type': 'bool | None', 'default': 'None', 'description': 'if True, will display label.'}, 'container': {'type': 'bool', 'default': 'True', 'description': 'If True, will place the component in a container - providing some extra padding around the border.'}, 'scale': {'type': 'int | None', 'default': 'None', 'description': 'relative size compared to adjacent Components. For example if Components A and B are in a Row, and A has scale=2, and B has scale=1, A will be twice as wide as B. Should be an integer. scale applies in Rows, and to top-level Components in Blocks where fill_height=True.'}, 'min_width': {'type': 'int', 'default': '160', 'description': 'minimum pixel width, will wrap if not sufficient screen space to satisfy this value. If a certain scale value results in this Component being narrower than min_width, the min_width parameter will be respected first.'}, 'visible': {'type': 'bool', 'default': 'True', 'description': 'If False, component will be hidden.'}, 'elem_id': {'type': 'str | None', 'default': 'None', 'description': 'An optional string that is assigned as the id of this component in the HTML DOM. Can be used for targeting CSS styles.'}, 'elem_classes': {'type': 'list[str] | str | None', 'default': 'None', 'description': 'An optional list of strings that are assigned as the classes of this component in the HTML DOM. Can be used for targeting CSS styles.'}, 'render': {'type': 'bool', 'default': 'True', 'description': 'If False, component will not render be rendered in the Blocks context. Should be used if the intention is to assign event listeners now but render the component later.'}, 'key': {'type': 'int | str | tuple[int | str, ...] | None', 'default': 'None', 'description': "in a gr.render, Components with the same key across re-renders are treated as the same component, not a new component. Properties set in 'preserved_by_key' are not reset across a re-render."}, 'preserved_by_key': {'type': 'list[str] | str | None', 'default': '"value"', 'description': "A list of parameters from this component's constructor. Inside a gr.render() function, if a component is re-rendered with the same key, these (and only these) parameters will be preserved in the UI (if they have been changed by the user or an event listener) instead of re-rendered based on the values provided during constructor."}, 'interactive': {'type': 'bool | None', 'default': 'None', 'description': 'If True, the component will be editable allowing users to modify markdown content.'}, 'rtl': {'type': 'bool', 'default': 'False', 'description': 'If True, will display the text in right-to-left direction.'}}, 'postprocess': {'value': {'type': 'dict | None', 'description': "Expects a dictionary with 'markdown_content' and 'highlights' keys"}}, 'preprocess': {'return': {'type': 'dict | None', 'description': 'Passes the value as a dictionary with markdown_content and highlights.'}, 'value': None}}, 'events': {'change': {'type': None, 'default': None, 'description': 'Triggered when the value of the MarkdownLabel changes either because of user input (e.g. a user types in a textbox) OR because of a function update (e.g. an image receives a value from the output of an event trigger). See `.input()` for a listener that is only triggered by user input.'}, 'select': {'type': None, 'default': None, 'description': 'Event listener for when the user selects or deselects the MarkdownLabel. Uses event data gradio.SelectData to carry `value` referring to the label of the MarkdownLabel, and `selected` to refer to state of the MarkdownLabel. See EventData documentation on how to use this event data'}, 'edit': {'type': None, 'default': None, 'description': 'This listener is triggered when the user edits the MarkdownLabel (e.g. image) using the built-in editor.'}, 'submit': {'type': None, 'default': None, 'description': 'This listener is triggered when the user presses the Enter key while the MarkdownLabel is focused.'}, 'clear': {'type': None, 'default': None, 'description': 'This listener is triggered when the user clears the MarkdownLabel using the clear button for the component.'}, 'rendered': {'type': None, 'default': None, 'description': 'Triggered when the MarkdownLabel has rendered its markdown in the browser. The event data carries the render mode, the render duration in milliseconds, the content length, the number of highlights and the number of values skipped so far because a newer value arrived before they were rendered.'}}}, '__meta__': {'additional_interfaces': {}, 'user_fn_refs': {'MarkdownLabel': []}}}
 
 abs_path = os.path.join(os.path.dirname(__file__), "css.css")
 
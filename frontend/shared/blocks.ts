@@ -0,0 +1,176 @@
+import { marked, type Token } from 'marked';
+import type { Highlight } from './highlight';
+import { renderBlocks } from './pipeline';
+
+export interface BlockSource {
+	start: number;
+	raw: string;
+}
+
+export interface RenderedBlock {
+	key: string;
+	start: number;
+	html: string;
+}
+
+/**
+ * Splits a document into its top-level markdown blocks (paragraphs, headings, lists, code blocks, ...).
+ * `offset` is added to every start so that a tail of a larger document can be split on its own.
+ */
+export function splitBlocks(content: string, offset: number = 0): BlockSource[] {
+	return locateTokens(content, marked.lexer(content), offset);
+}
+
+export function locateTokens(content: string, tokens: Token[], offset: number): BlockSource[] {
+	const blocks: BlockSource[] = [];
+	let cursor = 0;
+	for (const token of tokens) {
+		if (token.type === 'space') {
+			continue;
+		}
+		// Link definitions are consumed by the lexer without a token, so search instead of summing lengths
+		const found = content.indexOf(token.raw, cursor);
+		const start = found < 0 ? cursor : found;
+		blocks.push({ start: start + offset, raw: token.raw });
+		cursor = start + token.raw.length;
+	}
+	return blocks;
+}
+
+export function blockKey(block: BlockSource): string {
+	return `${block.start}:${block.raw.length}`;
+}
+
+export async function renderBlock(block: BlockSource, highlights: Highlight[]): Promise<RenderedBlock> {
+	const [html] = await renderBlocks([block], highlights);
+	return { key: blockKey(block), start: block.start, html };
+}
+
+async function renderBlockList(
+	blocks: BlockSource[],
+	highlights: Highlight[],
+	signal?: AbortSignal
+): Promise<RenderedBlock[]> {
+	const html = await renderBlocks(blocks, highlights, signal);
+	return blocks.map((block, index) => ({ key: blockKey(block), start: block.start, html: html[index] }));
+}
+
+// Lists and blockquotes can absorb the following lines, so they stay open while they are second to last.
+const CONTINUABLE = new Set(['list', 'blockquote']);
+
+// Identifies the highlights (and their indices) that can affect the document before `end`.
+function highlightSignature(highlights: Highlight[], end: number): string {
+	const relevant: [number, Highlight][] = [];
+	highlights.forEach((highlight, index) => {
+		const positioned = !!highlight.position && highlight.position.length === 2 && highlight.position[0] < end;
+		const spanned = Array.isArray(highlight.spans) && highlight.spans.some(([from]) => from < end);
+		const unresolvedTerm = !!(highlight.term && highlight.term.trim()) && !Array.isArray(highlight.spans);
+		if (positioned || spanned || unresolvedTerm) {
+			relevant.push([index, highlight]);
+		}
+	});
+	return JSON.stringify(relevant);
+}
+
+/**
+ * Renders an append-only document incrementally. Blocks that can no longer change are rendered once and
+ * frozen; every update only re-lexes and re-renders the still-open tail of the document. Anything other
+ * than an append, or a highlight change that reaches into the frozen part, starts over from the beginning.
+ */
+export class StreamingRenderer {
+	private frozen: RenderedBlock[] = [];
+	private frozenSource: string = '';
+	private signature: string = '';
+	private pending: Promise<unknown> = Promise.resolve();
+
+	update(content: string, highlights: Highlight[]): Promise<RenderedBlock[]> {
+		const result = this.pending.then(() => this.render(content, highlights));
+		this.pending = result.catch(() => undefined);
+		return result;
+	}
+
+	private async render(content: string, highlights: Highlight[]): Promise<RenderedBlock[]> {
+		if (
+			!content.startsWith(this.frozenSource) ||
+			highlightSignature(highlights, this.frozenSource.length) !== this.signature
+		) {
+			this.frozen = [];
+			this.frozenSource = '';
+		}
+
+		const offset = this.frozenSource.length;
+		const tail = content.slice(offset);
+		const tokens = marked.lexer(tail).filter((token) => token.type !== 'space');
+		let openFrom = tokens.length - 1;
+		if (openFrom > 0 && CONTINUABLE.has(tokens[openFrom - 1].type)) {
+			openFrom -= 1;
+		}
+		const blocks = locateTokens(tail, tokens, offset);
+
+		this.frozen.push(...(await renderBlockList(blocks.slice(0, Math.max(openFrom, 0)), highlights)));
+		if (openFrom > 0) {
+			this.frozenSource = content.slice(0, blocks[openFrom].start);
+			this.signature = highlightSignature(highlights, this.frozenSource.length);
+		}
+
+		const open = await renderBlockList(blocks.slice(Math.max(openFrom, 0)), highlights);
+		return this.frozen.concat(open);
+	}
+}
+
+// Enough source to fill the first screen; later chunks are larger, as they are rendered while idle
+export const FIRST_CHUNK = 8_000;
+const IDLE_CHUNK = 64_000;
+// Reference-style link definitions apply to the whole document, so its blocks cannot be rendered apart.
+export const LINK_DEFINITION = /^ {0,3}\[[^\]]+\]:/m;
+
+const idle: () => Promise<void> =
+	typeof requestIdleCallback === 'function'
+		? () => new Promise((resolve) => requestIdleCallback(() => resolve(), { timeout: 50 }))
+		: () => new Promise((resolve) => setTimeout(resolve, 0));
+
+/**
+ * Whether `renderProgressively` applies to a document: it is long enough to be worth splitting, and its
+ * blocks can be rendered apart.
+ */
+export function rendersProgressively(content: string): boolean {
+	return content.length > 2 * FIRST_CHUNK && !LINK_DEFINITION.test(content);
+}
+
+/**
+ * Renders a document in chunks of blocks: the first chunk is about a screenful of source, and each later
+ * chunk is lexed and rendered in idle time after the previous one was handed out. Every chunk ends at a
+ * blank line; the last block of a chunk (two when the one before can continue, like a list) could still
+ * change with the text that follows, so it is carried over to the next chunk.
+ */
+export async function* renderProgressively(
+	content: string,
+	highlights: Highlight[],
+	signal?: AbortSignal
+): AsyncGenerator<RenderedBlock[]> {
+	let offset = 0;
+	let size = FIRST_CHUNK;
+	while (offset < content.length) {
+		const cut = content.indexOf('\n\n', offset + size);
+		const end = cut < 0 ? content.length : cut;
+		const part = content.slice(offset, end);
+		const tokens = marked.lexer(part).filter((token) => token.type !== 'space');
+		const blocks = locateTokens(part, tokens, offset);
+		let take = blocks.length;
+		if (end < content.length) {
+			take -= 1;
+			if (take > 0 && CONTINUABLE.has(tokens[take - 1].type)) {
+				take -= 1;
+			}
+		}
+		if (take <= 0) {
+			// A single block runs past the chunk
+			size *= 2;
+			continue;
+		}
+		yield await renderBlockList(blocks.slice(0, take), highlights, signal);
+		offset = take < blocks.length ? blocks[take].start : end;
+		size = IDLE_CHUNK;
+		await idle();
+	}
+}
@@ -0,0 +1,52 @@
+import type { Highlight } from './highlight';
+
+export interface HighlightColumns {
+	strings: string[];
+	starts: number[];
+	ends: number[];
+	terms: number[];
+	titles: number[];
+	contents: number[];
+	categories: number[];
+	colors: number[];
+	content_ids?: number[];
+	glossary_ids?: number[];
+	overlaps?: number[];
+	span_counts: number[];
+	span_bounds: number[];
+}
+
+/**
+ * Expands the columnar highlight encoding sent in compact mode back into highlight objects.
+ */
+export function decodeHighlights(columns: HighlightColumns): Highlight[] {
+	const { strings } = columns;
+	const highlights: Highlight[] = new Array(columns.starts.length);
+	let bound = 0;
+	for (let i = 0; i < columns.starts.length; i++) {
+		const spanCount = i < columns.span_counts.length ? columns.span_counts[i] : -1;
+		const contentId = columns.content_ids && i < columns.content_ids.length ? columns.content_ids[i] : -1;
+		const glossaryId = columns.glossary_ids && i < columns.glossary_ids.length ? columns.glossary_ids[i] : -1;
+		const overlaps = columns.overlaps && i < columns.overlaps.length ? columns.overlaps[i] : -1;
+		let spans: number[][] | null = null;
+		if (spanCount >= 0) {
+			spans = [];
+			for (let j = 0; j < spanCount; j++, bound += 2) {
+				spans.push([columns.span_bounds[bound], columns.span_bounds[bound + 1]]);
+			}
+		}
+		highlights[i] = {
+			term: strings[columns.terms[i]],
+			position: columns.starts[i] >= 0 ? [columns.starts[i], columns.ends[i]] : [],
+			title: strings[columns.titles[i]],
+			content: strings[columns.contents[i]],
+			category: strings[columns.categories[i]],
+			color: strings[columns.colors[i]],
+			spans,
+			content_id: contentId >= 0 ? strings[contentId] : null,
+			glossary_id: glossaryId >= 0 ? strings[glossaryId] : null,
+			overlaps: overlaps >= 0 ? overlaps === 1 : null
+		};
+	}
+	return highlights;
+}
@@ -0,0 +1,58 @@
+import type { Highlight } from './highlight';
+import { decodeHighlights, type HighlightColumns } from './columnar';
+import type { Edit } from './edits';
+
+export interface MarkdownPatch {
+	base_version: string;
+	start: number;
+	delete_count: number;
+	insert: string;
+	removed_highlights: number[];
+	added_highlights: Highlight[];
+}
+
+export interface MarkdownValue {
+	markdown_content: string;
+	highlights: Highlight[];
+	html?: string | null;
+	version?: string | null;
+	patch?: MarkdownPatch | null;
+	columns?: HighlightColumns | null;
+	edits?: Edit[] | null;
+	base_version?: string | null;
+}
+
+/**
+ * The value to hold as the component's `value`, which is sent back to the server as event input. The
+ * prerendered HTML is only needed for display, so it is left out.
+ */
+export function upstreamValue(value: MarkdownValue): MarkdownValue {
+	if (!value.html) {
+		return value;
+	}
+	const { html, ...rest } = value;
+	return rest;
+}
+
+export function valueHighlights(value: MarkdownValue): Highlight[] {
+	return value.columns ? decodeHighlights(value.columns) : value.highlights || [];
+}
+
+/**
+ * Applies a delta payload to the value it was computed against. Returns null when `base` is not the
+ * version the patch expects, in which case the full value has to be fetched from the server.
+ */
+export function applyPatch(base: MarkdownValue | null, value: MarkdownValue): MarkdownValue | null {
+	const patch = value.patch!;
+	if (!base || !base.version || base.version !== patch.base_version) {
+		return null;
+	}
+	const content = base.markdown_content;
+	const removed = new Set(patch.removed_highlights);
+	return {
+		markdown_content:
+			content.slice(0, patch.start) + patch.insert + content.slice(patch.start + patch.delete_count),
+		highlights: valueHighlights(base).filter((_, index) => !removed.has(index)).concat(patch.added_highlights),
+		version: value.version
+	};
+}
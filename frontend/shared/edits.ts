@@ -0,0 +1,204 @@
+import type { Highlight } from './highlight';
+
+/**
+ * A splice of the original document: `delete_count` characters at `start` are replaced by `insert`.
+ * Lists of edits are sorted, do not overlap and all refer to offsets in the original document.
+ */
+export interface Edit {
+	start: number;
+	delete_count: number;
+	insert: string;
+}
+
+// A run of the current text: either copied from the original at `origin`, or inserted (origin null)
+interface Piece {
+	origin: number | null;
+	length: number;
+}
+
+/**
+ * Describes `next` as a single splice of `previous`: [start, delete_count, insert].
+ */
+export function diffSplice(previous: string, next: string): [number, number, string] {
+	const limit = Math.min(previous.length, next.length);
+	let prefix = 0;
+	while (prefix < limit && previous.charCodeAt(prefix) === next.charCodeAt(prefix)) {
+		prefix++;
+	}
+	let suffix = 0;
+	while (
+		suffix < limit - prefix &&
+		previous.charCodeAt(previous.length - 1 - suffix) === next.charCodeAt(next.length - 1 - suffix)
+	) {
+		suffix++;
+	}
+	return [prefix, previous.length - prefix - suffix, next.slice(prefix, next.length - suffix)];
+}
+
+/**
+ * Records the edits made to a document as they happen, one splice per input event, and composes them
+ * into a compact list of edits against the original.
+ */
+export class EditLog {
+	private original: string;
+	private text: string;
+	private pieces: Piece[];
+
+	constructor(original: string) {
+		this.original = original;
+		this.text = original;
+		this.pieces = original.length ? [{ origin: 0, length: original.length }] : [];
+	}
+
+	/**
+	 * Records the change from the last recorded text to `next`.
+	 */
+	record(next: string): void {
+		if (next === this.text) {
+			return;
+		}
+		const [start, deleteCount, insert] = diffSplice(this.text, next);
+		this.text = next;
+		const end = start + deleteCount;
+		const pieces: Piece[] = [];
+		let offset = 0;
+		let inserted = false;
+		const place = () => {
+			if (!inserted && insert.length) {
+				pieces.push({ origin: null, length: insert.length });
+			}
+			inserted = true;
+		};
+		for (const piece of this.pieces) {
+			const pieceEnd = offset + piece.length;
+			// The part before the splice, and the part after it, are kept
+			if (offset < start) {
+				pieces.push({ origin: piece.origin, length: Math.min(pieceEnd, start) - offset });
+			}
+			if (pieceEnd >= start) {
+				place();
+			}
+			if (pieceEnd > end) {
+				const from = Math.max(offset, end);
+				pieces.push({
+					origin: piece.origin === null ? null : piece.origin + (from - offset),
+					length: pieceEnd - from
+				});
+			}
+			offset = pieceEnd;
+		}
+		place();
+		this.pieces = merge(pieces);
+	}
+
+	/**
+	 * Returns the recorded changes as sorted, non-overlapping edits against the original document.
+	 */
+	edits(): Edit[] {
+		const edits: Edit[] = [];
+		let originCursor = 0;
+		let textCursor = 0;
+		let insert = '';
+		const flush = (until: number) => {
+			if (until > originCursor || insert) {
+				edits.push({ start: originCursor, delete_count: until - originCursor, insert });
+			}
+			insert = '';
+		};
+		for (const piece of this.pieces) {
+			if (piece.origin === null) {
+				insert += this.text.slice(textCursor, textCursor + piece.length);
+			} else {
+				flush(piece.origin);
+				originCursor = piece.origin + piece.length;
+			}
+			textCursor += piece.length;
+		}
+		flush(this.original.length);
+		return edits;
+	}
+}
+
+function merge(pieces: Piece[]): Piece[] {
+	const merged: Piece[] = [];
+	for (const piece of pieces) {
+		const last = merged[merged.length - 1];
+		if (
+			last &&
+			(last.origin === null
+				? piece.origin === null
+				: piece.origin !== null && last.origin + last.length === piece.origin)
+		) {
+			last.length += piece.length;
+		} else if (piece.length > 0) {
+			merged.push({ ...piece });
+		}
+	}
+	return merged;
+}
+
+/**
+ * Maps the [start, end) span of the original document through `edits`. Returns null when an edit
+ * touches the inside of the span, i.e. the highlighted text changed.
+ */
+function rebaseSpan(start: number, end: number, edits: Edit[], ends: number[], shifts: number[]): number[] | null {
+	// First edit that ends after the span starts; every edit before it lies entirely before the span
+	let low = 0;
+	let high = ends.length;
+	while (low < high) {
+		const mid = (low + high) >> 1;
+		if (ends[mid] <= start) {
+			low = mid + 1;
+		} else {
+			high = mid;
+		}
+	}
+	if (low < edits.length && edits[low].start < end) {
+		return null;
+	}
+	return [start + shifts[low], end + shifts[low]];
+}
+
+/**
+ * Moves position highlights (and resolved term spans) past `edits` in one pass. Highlights whose text
+ * was changed are invalidated: they lose their position, and are dropped unless they also highlight a
+ * term. Returns the rebased highlights and the indices of the invalidated ones in `highlights`.
+ */
+export function rebaseHighlights(
+	highlights: Highlight[],
+	edits: Edit[]
+): { highlights: Highlight[]; invalidated: number[] } {
+	if (!edits.length) {
+		return { highlights, invalidated: [] };
+	}
+	const ends = edits.map((edit) => edit.start + edit.delete_count);
+	// shifts[i] is the change in length made by the edits before edits[i]
+	const shifts = [0];
+	for (const edit of edits) {
+		shifts.push(shifts[shifts.length - 1] + edit.insert.length - edit.delete_count);
+	}
+
+	const rebased: Highlight[] = [];
+	const invalidated: number[] = [];
+	highlights.forEach((highlight, index) => {
+		let result = highlight;
+		if (highlight.position && highlight.position.length === 2) {
+			const position = rebaseSpan(highlight.position[0], highlight.position[1], edits, ends, shifts);
+			if (!position) {
+				invalidated.push(index);
+				if (!(highlight.term && highlight.term.trim())) {
+					return;
+				}
+			}
+			result = { ...result, position: position ?? [] };
+		}
+		if (Array.isArray(highlight.spans)) {
+			const spans = highlight.spans
+				.map(([start, end]) => rebaseSpan(start, end, edits, ends, shifts))
+				.filter((span): span is number[] => span !== null);
+			result = { ...result, spans };
+		}
+		rebased.push(result);
+	});
+	return { highlights: rebased, invalidated };
+}
@@ -0,0 +1,196 @@
+import { marked } from 'marked';
+import { renderWithSourceMap } from './sourcemap';
+import { spanIndexFor } from './spans';
+
+export interface Highlight {
+	term?: string;
+	position?: number[];
+	spans?: number[][] | null;
+	content_id?: string | null;
+	glossary_id?: string | null;
+	overlaps?: boolean | null;
+	title: string;
+	content: string;
+	category: string;
+	color: string;
+}
+
+export function escapeRegex(string: string): string {
+	return string.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+export const DEFAULT_COLOR = '#e3f2fd';
+
+// 32-bit FNV-1a over UTF-16 code units, in base 36; `render.py` computes the same names
+function hashName(prefix: string, value: string): string {
+	let hash = 0x811c9dc5;
+	for (let i = 0; i < value.length; i++) {
+		hash = Math.imul(hash ^ value.charCodeAt(i), 0x01000193) >>> 0;
+	}
+	return `${prefix}-${hash.toString(36)}`;
+}
+
+/**
+ * Returns the class that gives highlights of `color` their background. The name is a hash of the
+ * colour, so it is the same in the worker, on the main thread and on the server (`render.py`).
+ */
+export function colorClass(color: string): string {
+	return hashName('hl', color);
+}
+
+/**
+ * Returns the class that marks highlights of `category`, used to hide categories with CSS.
+ */
+export function categoryClass(category: string): string {
+	return hashName('hl-c', category);
+}
+
+function highlightClasses(highlight: Highlight): string {
+	const color = colorClass(highlight.color || DEFAULT_COLOR);
+	return highlight.category ? `${color} ${categoryClass(highlight.category)}` : color;
+}
+
+/**
+ * Returns a `<style>` element with one rule per distinct highlight colour. Highlight spans only carry
+ * the class, so the colour is written once instead of into every span.
+ */
+export function highlightStylesheet(highlights: Highlight[]): string {
+	const rules = new Map<string, string>();
+	for (const highlight of highlights) {
+		const color = highlight.color || DEFAULT_COLOR;
+		const name = colorClass(color);
+		if (!rules.has(name)) {
+			rules.set(name, `.${name} { background-color: ${color.replace(/[;{}<>\\]/g, '')}; }`);
+		}
+	}
+	return `<style>${[...rules.values()].join('\n')}</style>`;
+}
+
+export interface CategoryCount {
+	category: string;
+	color: string;
+	count: number;
+}
+
+/**
+ * Counts the highlights of each category, in order of first appearance. Highlights without a category
+ * are not counted, as they cannot be filtered.
+ */
+export function categoryCounts(highlights: Highlight[]): CategoryCount[] {
+	const counts = new Map<string, CategoryCount>();
+	for (const highlight of highlights) {
+		if (!highlight.category) {
+			continue;
+		}
+		const entry = counts.get(highlight.category);
+		if (entry) {
+			entry.count++;
+		} else {
+			counts.set(highlight.category, {
+				category: highlight.category,
+				color: highlight.color || DEFAULT_COLOR,
+				count: 1
+			});
+		}
+	}
+	return [...counts.values()];
+}
+
+/**
+ * Returns a `<style>` element that shows the highlights of `hidden` categories as plain text inside the
+ * element with `data-filter-scope="<scope>"`. Only the stylesheet changes when categories are toggled;
+ * the rendered document is left as it is.
+ */
+export function categoryFilterStylesheet(scope: string, hidden: string[]): string {
+	const selectors = hidden.map((category) => `[data-filter-scope="${scope}"] .${categoryClass(category)}`);
+	if (!selectors.length) {
+		return '';
+	}
+	return `<style>${selectors.join(',\n')} { background-color: transparent !important; padding: 0 !important; cursor: inherit !important; pointer-events: none; outline: none !important; }</style>`;
+}
+
+let scopes = 0;
+
+/**
+ * Returns an id that scopes the category filter of one component instance.
+ */
+export function filterScope(): string {
+	return `filter-${++scopes}`;
+}
+
+// Term highlights resolved on the server carry their spans and are placed like position highlights.
+function isResolvedTerm(highlight: Highlight): boolean {
+	return !!(highlight.term && highlight.term.trim()) && Array.isArray(highlight.spans);
+}
+
+function positionOpen(highlight: Highlight, index: number): string {
+	return `<span class="highlight-position ${highlightClasses(highlight)}" data-index="${index}" role="button" tabindex="0">`;
+}
+
+// Position highlights may be split across text nodes, so no whitespace is added around their text
+const POSITION_CLOSE = '</span>';
+
+function termOpen(highlight: Highlight, index: number): string {
+	return `<span class="highlight-term ${highlightClasses(highlight)}" data-index="${index}" role="button" tabindex="0">`;
+}
+
+function termSpan(highlight: Highlight, index: number, inner: string): string {
+	return `${termOpen(highlight, index)}${inner}</span>`;
+}
+
+export function applyTermHighlights(html: string, highlights: Highlight[], skipResolved: boolean): string {
+	highlights.forEach((highlight, index) => {
+		if (highlight.term && highlight.term.trim()) {
+			if (skipResolved && isResolvedTerm(highlight)) {
+				return;
+			}
+			const regex = new RegExp(`\\b${escapeRegex(highlight.term)}\\b`, 'gi');
+			html = html.replace(regex, (match: string) => termSpan(highlight, index, match));
+		}
+	});
+	return html;
+}
+
+/**
+ * Renders markdown to HTML and applies highlighting. Position highlights and server-resolved term spans
+ * refer to offsets in the original document, so they are only placed when `applyPositions` is set;
+ * otherwise every term highlight falls back to matching in the rendered HTML.
+ */
+export async function processMarkdown(
+	content: string,
+	highlights: Highlight[],
+	applyPositions: boolean = true,
+	offset: number = 0
+): Promise<string> {
+	let html: string;
+	if (applyPositions) {
+		// Position highlights are placed on the tokens marked produces, through a map back to the source
+		const opening = new Map<number, string>();
+		const open = (index: number): string => {
+			if (!opening.has(index)) {
+				const highlight = highlights[index];
+				const isPosition = highlight.position && highlight.position.length === 2;
+				opening.set(index, isPosition ? positionOpen(highlight, index) : termOpen(highlight, index));
+			}
+			return opening.get(index)!;
+		};
+		html = await renderWithSourceMap(content, spanIndexFor(highlights), open, () => POSITION_CLOSE, offset);
+	} else {
+		html = await marked(content);
+	}
+
+	// Apply term-based highlights to the HTML
+	return applyTermHighlights(html, highlights, applyPositions);
+}
+
+/**
+ * Renders the [offset, offset + content.length) slice of a document, given the highlights of the whole
+ * document. Highlight indices in the output refer to the whole document.
+ */
+export async function processBlock(content: string, highlights: Highlight[], offset: number): Promise<string> {
+	return processMarkdown(content, highlights, true, offset);
+}
+
+export async function processPanelContent(highlight: Highlight): Promise<string> {
+	return await marked(highlight.content || 'No additional information available.');
+}
@@ -0,0 +1,43 @@
+import type { RenderReport } from './pipeline';
+
+/**
+ * Collects render reports and sends them to the server in batches, so that recording metrics does not
+ * cost one request per render. A batch is sent once `size` reports are waiting, or `interval`
+ * milliseconds after the first report of the batch, whichever comes first.
+ */
+export class RenderReportBuffer {
+	private send: (reports: RenderReport[]) => void;
+	private size: number;
+	private interval: number;
+	private reports: RenderReport[] = [];
+	private timer: ReturnType<typeof setTimeout> | null = null;
+
+	constructor(send: (reports: RenderReport[]) => void, size = 50, interval = 10000) {
+		this.send = send;
+		this.size = size;
+		this.interval = interval;
+	}
+
+	push(report: RenderReport): void {
+		this.reports.push(report);
+		if (this.reports.length >= this.size) {
+			this.flush();
+			return;
+		}
+		this.timer ??= setTimeout(() => this.flush(), this.interval);
+	}
+
+	/** Sends the waiting reports now, e.g. when the component is destroyed. */
+	flush(): void {
+		if (this.timer) {
+			clearTimeout(this.timer);
+			this.timer = null;
+		}
+		if (!this.reports.length) {
+			return;
+		}
+		const reports = this.reports;
+		this.reports = [];
+		this.send(reports);
+	}
+}
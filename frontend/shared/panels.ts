@@ -0,0 +1,87 @@
+import type { Highlight } from './highlight';
+
+export type FetchPanelContent = (contentIds: string[]) => Promise<Record<string, string>>;
+
+const CACHE_SIZE = 256;
+const RECENT_SIZE = 32;
+
+// Content ids change with the content, so opened highlights are remembered by what they annotate.
+function highlightKey(highlight: Highlight): string {
+	return `${highlight.term || ''}\u0000${highlight.title || ''}\u0000${(highlight.position || []).join(',')}`;
+}
+
+/**
+ * Loads side panel content that the server sends as ids instead of inline text. Contents are cached in a
+ * small LRU, concurrent requests for the same id share one fetch, and the highlights opened most recently
+ * are prefetched whenever a new value arrives.
+ */
+export class PanelContentLoader {
+	private cache = new Map<string, string>();
+	private inflight = new Map<string, Promise<void>>();
+	private recent: string[] = [];
+	private fetchContent: FetchPanelContent;
+
+	constructor(fetchContent: FetchPanelContent) {
+		this.fetchContent = fetchContent;
+	}
+
+	/**
+	 * Returns the panel content of a highlight, fetching it if it was sent as an id. Content the server no
+	 * longer holds comes back empty.
+	 */
+	async load(highlight: Highlight): Promise<string> {
+		const id = highlight.content_id;
+		if (!id) {
+			return highlight.content;
+		}
+		this.remember(highlight);
+		await this.request([id]);
+		return this.read(id) ?? '';
+	}
+
+	prefetch(highlights: Highlight[]): void {
+		if (!this.recent.length) {
+			return;
+		}
+		const ids = highlights
+			.filter((highlight) => highlight.content_id && this.recent.includes(highlightKey(highlight)))
+			.map((highlight) => highlight.content_id!);
+		if (ids.length) {
+			this.request(ids).catch(() => undefined);
+		}
+	}
+
+	private remember(highlight: Highlight): void {
+		const key = highlightKey(highlight);
+		this.recent = this.recent.filter((other) => other !== key).concat(key).slice(-RECENT_SIZE);
+	}
+
+	private read(id: string): string | undefined {
+		const content = this.cache.get(id);
+		if (content !== undefined) {
+			this.cache.delete(id);
+			this.cache.set(id, content);
+		}
+		return content;
+	}
+
+	private async request(ids: string[]): Promise<void> {
+		const missing = [...new Set(ids)].filter((id) => !this.cache.has(id) && !this.inflight.has(id));
+		if (missing.length) {
+			const batch = this.fetchContent(missing)
+				.then((found) => {
+					for (const id of missing) {
+						if (found && found[id] !== undefined) {
+							this.cache.set(id, found[id]);
+						}
+					}
+					while (this.cache.size > CACHE_SIZE) {
+						this.cache.delete(this.cache.keys().next().value!);
+					}
+				})
+				.finally(() => missing.forEach((id) => this.inflight.delete(id)));
+			missing.forEach((id) => this.inflight.set(id, batch));
+		}
+		await Promise.all(ids.map((id) => this.inflight.get(id)));
+	}
+}
@@ -0,0 +1,204 @@
+import { processBlock, processMarkdown, type Highlight } from './highlight';
+import type { BlockSource } from './blocks';
+
+export interface RenderUnit {
+	content: string;
+	offset: number | null; // offset of a block into its document, null for a whole document
+	applyPositions: boolean;
+}
+
+export type PipelineRequest =
+	| { type: 'highlights'; highlightsId: number; highlights: Highlight[] }
+	| { type: 'release'; highlightsId: number }
+	| { type: 'render'; id: number; highlightsId: number; units: RenderUnit[] }
+	| { type: 'cancel'; id: number };
+
+// Data of the `rendered` event: how long a render took, in milliseconds, from the value to its HTML
+export interface RenderReport {
+	mode: string;
+	duration: number;
+	content_length: number;
+	highlights: number;
+	skipped: number; // values the component skipped so far, as newer ones arrived before they were rendered
+}
+
+export type PipelineResponse = { id: number; html: string[] } | { id: number; error: string };
+
+interface PendingJob {
+	units: RenderUnit[];
+	highlights: Highlight[];
+	resolve: (html: string[]) => void;
+	reject: (error: unknown) => void;
+}
+
+// Highlight lists are sent to the worker once and referred to by id; this many are kept there at a time.
+const HIGHLIGHT_SETS = 16;
+
+async function renderLocally(units: RenderUnit[], highlights: Highlight[]): Promise<string[]> {
+	const html: string[] = [];
+	for (const unit of units) {
+		html.push(
+			unit.offset === null
+				? await processMarkdown(unit.content, highlights, unit.applyPositions)
+				: await processBlock(unit.content, highlights, unit.offset)
+		);
+	}
+	return html;
+}
+
+function abortError(): DOMException {
+	return new DOMException('The render was cancelled.', 'AbortError');
+}
+
+export function isAbortError(error: unknown): boolean {
+	return error instanceof DOMException && error.name === 'AbortError';
+}
+
+/**
+ * Runs the markdown and highlighting pipeline in a Web Worker shared by every MarkdownLabel on the page.
+ * Falls back to the main thread where workers are unavailable or the worker fails to start.
+ */
+class RenderPipeline {
+	private worker: Worker | null = null;
+	private jobs = new Map<number, PendingJob>();
+	private highlightIds = new Map<Highlight[], number>();
+	private nextId = 1;
+
+	constructor() {
+		if (typeof Worker === 'undefined') {
+			return;
+		}
+		try {
+			this.worker = new Worker(new URL('./pipeline.worker.ts', import.meta.url), { type: 'module' });
+			this.worker.onmessage = (event: MessageEvent<PipelineResponse>) => this.receive(event.data);
+			this.worker.onerror = () => this.fallBack();
+		} catch {
+			this.worker = null;
+		}
+	}
+
+	run(units: RenderUnit[], highlights: Highlight[], signal?: AbortSignal): Promise<string[]> {
+		if (signal?.aborted) {
+			return Promise.reject(abortError());
+		}
+		if (!units.length) {
+			return Promise.resolve([]);
+		}
+		if (!this.worker) {
+			return renderLocally(units, highlights);
+		}
+		const id = this.nextId++;
+		const highlightsId = this.register(highlights);
+		return new Promise((resolve, reject) => {
+			this.jobs.set(id, { units, highlights, resolve, reject });
+			signal?.addEventListener(
+				'abort',
+				() => {
+					if (this.jobs.delete(id)) {
+						this.worker?.postMessage({ type: 'cancel', id } satisfies PipelineRequest);
+						reject(abortError());
+					}
+				},
+				{ once: true }
+			);
+			this.worker!.postMessage({ type: 'render', id, highlightsId, units } satisfies PipelineRequest);
+		});
+	}
+
+	private register(highlights: Highlight[]): number {
+		const known = this.highlightIds.get(highlights);
+		if (known !== undefined) {
+			this.highlightIds.delete(highlights);
+			this.highlightIds.set(highlights, known);
+			return known;
+		}
+		const highlightsId = this.nextId++;
+		this.highlightIds.set(highlights, highlightsId);
+		this.worker!.postMessage({ type: 'highlights', highlightsId, highlights } satisfies PipelineRequest);
+		for (const [oldest, oldestId] of this.highlightIds) {
+			if (this.highlightIds.size <= HIGHLIGHT_SETS) {
+				break;
+			}
+			this.highlightIds.delete(oldest);
+			this.worker!.postMessage({ type: 'release', highlightsId: oldestId } satisfies PipelineRequest);
+		}
+		return highlightsId;
+	}
+
+	private receive(response: PipelineResponse): void {
+		const job = this.jobs.get(response.id);
+		if (!job) {
+			return;
+		}
+		this.jobs.delete(response.id);
+		if ('error' in response) {
+			job.reject(new Error(response.error));
+		} else {
+			job.resolve(response.html);
+		}
+	}
+
+	private fallBack(): void {
+		this.worker?.terminate();
+		this.worker = null;
+		this.highlightIds.clear();
+		for (const job of this.jobs.values()) {
+			renderLocally(job.units, job.highlights).then(job.resolve, job.reject);
+		}
+		this.jobs.clear();
+	}
+}
+
+let pipeline: RenderPipeline | null = null;
+
+function getPipeline(): RenderPipeline {
+	if (!pipeline) {
+		pipeline = new RenderPipeline();
+	}
+	return pipeline;
+}
+
+/**
+ * Renders a whole document off the main thread. See `processMarkdown` for `applyPositions`. Rejects with
+ * an AbortError when `signal` is aborted first.
+ */
+export async function renderMarkdown(
+	content: string,
+	highlights: Highlight[],
+	applyPositions: boolean = true,
+	signal?: AbortSignal
+): Promise<string> {
+	const [html] = await getPipeline().run([{ content, offset: null, applyPositions }], highlights, signal);
+	return html;
+}
+
+/**
+ * Renders several independent documents off the main thread in one request.
+ */
+export function renderMarkdownBatch(
+	contents: string[],
+	highlights: Highlight[],
+	applyPositions: boolean = true,
+	signal?: AbortSignal
+): Promise<string[]> {
+	return getPipeline().run(
+		contents.map((content) => ({ content, offset: null, applyPositions })),
+		highlights,
+		signal
+	);
+}
+
+/**
+ * Renders blocks of a document off the main thread, given the highlights of the whole document.
+ */
+export function renderBlocks(
+	blocks: BlockSource[],
+	highlights: Highlight[],
+	signal?: AbortSignal
+): Promise<string[]> {
+	return getPipeline().run(
+		blocks.map((block) => ({ content: block.raw, offset: block.start, applyPositions: true })),
+		highlights,
+		signal
+	);
+}
@@ -0,0 +1,86 @@
+import { processBlock, processMarkdown, type Highlight } from './highlight';
+import type { PipelineRequest, PipelineResponse, RenderUnit } from './pipeline';
+
+interface Job {
+	id: number;
+	// Looked up when the job arrives, so that releasing the set afterwards does not affect it
+	highlights: Highlight[];
+	units: RenderUnit[];
+	results: string[];
+}
+
+const highlightSets = new Map<number, Highlight[]>();
+const queue: Job[] = [];
+const cancelled = new Set<number>();
+
+// Work is done one document or block per task, so that cancel messages are received between units
+const channel = new MessageChannel();
+let scheduled = false;
+channel.port1.onmessage = drain;
+
+function schedule(): void {
+	if (!scheduled && queue.length) {
+		scheduled = true;
+		channel.port2.postMessage(null);
+	}
+}
+
+function reply(response: PipelineResponse): void {
+	(self as unknown as Worker).postMessage(response);
+}
+
+async function drain(): Promise<void> {
+	scheduled = false;
+	const job = queue[0];
+	if (!job) {
+		return;
+	}
+	if (cancelled.delete(job.id)) {
+		queue.shift();
+		schedule();
+		return;
+	}
+	try {
+		const unit = job.units[job.results.length];
+		job.results.push(
+			unit.offset === null
+				? await processMarkdown(unit.content, job.highlights, unit.applyPositions)
+				: await processBlock(unit.content, job.highlights, unit.offset)
+		);
+		if (job.results.length === job.units.length) {
+			queue.shift();
+			cancelled.delete(job.id);
+			reply({ id: job.id, html: job.results });
+		}
+	} catch (error) {
+		queue.shift();
+		reply({ id: job.id, error: String(error) });
+	}
+	schedule();
+}
+
+self.onmessage = (event: MessageEvent<PipelineRequest>) => {
+	const request = event.data;
+	switch (request.type) {
+		case 'highlights':
+			highlightSets.set(request.highlightsId, request.highlights);
+			break;
+		case 'release':
+			highlightSets.delete(request.highlightsId);
+			break;
+		case 'cancel':
+			if (queue.some((job) => job.id === request.id)) {
+				cancelled.add(request.id);
+			}
+			break;
+		case 'render':
+			queue.push({
+				id: request.id,
+				highlights: highlightSets.get(request.highlightsId) || [],
+				units: request.units,
+				results: []
+			});
+			schedule();
+			break;
+	}
+};
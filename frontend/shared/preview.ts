@@ -0,0 +1,130 @@
+import { marked } from 'marked';
+import type { Highlight } from './highlight';
+import { LINK_DEFINITION, locateTokens, type RenderedBlock } from './blocks';
+import { renderMarkdownBatch } from './pipeline';
+
+interface PreviewBlock extends RenderedBlock {
+	raw: string;
+}
+
+function commonPrefixLength(a: string, b: string): number {
+	const limit = Math.min(a.length, b.length);
+	let i = 0;
+	while (i < limit && a.charCodeAt(i) === b.charCodeAt(i)) {
+		i++;
+	}
+	return i;
+}
+
+function commonSuffixLength(a: string, b: string, limit: number): number {
+	let i = 0;
+	while (i < limit && a.charCodeAt(a.length - 1 - i) === b.charCodeAt(b.length - 1 - i)) {
+		i++;
+	}
+	return i;
+}
+
+/**
+ * Renders the live preview of a document that is being edited block by block. Each update re-lexes only
+ * the region between the blocks that lie wholly before and wholly after the edit (plus one block of
+ * margin on either side, as an edit can merge into its neighbours) and renders only the blocks in it;
+ * every other block keeps its HTML and its key.
+ *
+ * Highlights are applied as term matches only, since positions refer to the saved document.
+ */
+export class IncrementalPreview {
+	private source: string = '';
+	private blocks: PreviewBlock[] = [];
+	private highlights: Highlight[] | null = null;
+	private nextKey: number = 0;
+	private pending: Promise<unknown> = Promise.resolve();
+
+	/**
+	 * Returns the blocks of `content`, or null when the document has to be rendered as a whole.
+	 */
+	update(content: string, highlights: Highlight[]): Promise<RenderedBlock[] | null> {
+		const result = this.pending.then(() => this.render(content, highlights));
+		this.pending = result.catch(() => undefined);
+		return result;
+	}
+
+	reset(): void {
+		this.source = '';
+		this.blocks = [];
+	}
+
+	private async render(content: string, highlights: Highlight[]): Promise<RenderedBlock[] | null> {
+		if (LINK_DEFINITION.test(content)) {
+			this.reset();
+			return null;
+		}
+		if (highlights !== this.highlights) {
+			this.reset();
+			this.highlights = highlights;
+		}
+
+		const old = this.source;
+		const prefix = commonPrefixLength(old, content);
+		const suffix = commonSuffixLength(old, content, Math.min(old.length, content.length) - prefix);
+		const delta = content.length - old.length;
+
+		let head = 0;
+		while (head < this.blocks.length && this.blocks[head].start + this.blocks[head].raw.length <= prefix) {
+			head++;
+		}
+		head = Math.max(head - 1, 0);
+		let tail = head;
+		while (tail < this.blocks.length && this.blocks[tail].start < old.length - suffix) {
+			tail++;
+		}
+		tail = Math.min(tail + 1, this.blocks.length);
+
+		const from = head > 0 ? this.blocks[head - 1].start + this.blocks[head - 1].raw.length : 0;
+		let middle = this.lex(content, from, tail);
+		if (!middle) {
+			tail = this.blocks.length;
+			middle = this.lex(content, from, tail)!;
+		}
+
+		const previous = new Map(this.blocks.slice(head, tail).map((block) => [block.raw, block]));
+		const rendered: PreviewBlock[] = middle.map(({ start, raw }) => {
+			const reused = previous.get(raw);
+			previous.delete(raw);
+			return reused ? { ...reused, start } : { key: `preview-${this.nextKey++}`, start, raw, html: '' };
+		});
+		const fresh = rendered.filter((block) => !block.html);
+		const html = await renderMarkdownBatch(
+			fresh.map((block) => block.raw),
+			highlights,
+			false
+		);
+		fresh.forEach((block, index) => (block.html = html[index]));
+
+		this.blocks = this.blocks
+			.slice(0, head)
+			.concat(rendered, this.blocks.slice(tail).map((block) => ({ ...block, start: block.start + delta })));
+		this.source = content;
+		return this.blocks;
+	}
+
+	/**
+	 * Lexes the new content from `from` up to the first block kept after the edit, `tail`. The kept block is
+	 * lexed along with the region so that an edit that swallows it (an unclosed code fence, say) is
+	 * detected, in which case null is returned.
+	 */
+	private lex(content: string, from: number, tail: number): { start: number; raw: string }[] | null {
+		if (tail >= this.blocks.length) {
+			const region = content.slice(from);
+			return locateTokens(region, marked.lexer(region), from);
+		}
+		const kept = this.blocks[tail];
+		const end = kept.start + content.length - this.source.length + kept.raw.length;
+		const region = content.slice(from, end);
+		const blocks = locateTokens(region, marked.lexer(region), from);
+		const last = blocks.pop();
+		if (!last || last.raw.trimEnd() !== kept.raw.trimEnd() || last.start !== end - kept.raw.length) {
+			return null;
+		}
+		return blocks;
+	}
+}
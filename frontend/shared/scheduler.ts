@@ -0,0 +1,96 @@
+/**
+ * Passed to each render: `signal` is aborted, and `current()` turns false, once the render is superseded
+ * by `cancel()`. A render only applies its result while `current()` is true. `superseded()` tells a long
+ * render that a newer value is waiting for it to finish.
+ */
+export interface RenderToken {
+	signal: AbortSignal;
+	current(): boolean;
+	superseded(): boolean;
+}
+
+export type RenderFn<T> = (value: T, token: RenderToken) => Promise<void>;
+
+const nextFrame: (callback: () => void) => void =
+	typeof requestAnimationFrame === 'function'
+		? (callback) => requestAnimationFrame(() => callback())
+		: (callback) => setTimeout(callback, 16);
+
+/**
+ * Schedules the renders of a component whose value can change faster than it renders (an `every=` timer,
+ * a streaming generator). Only the latest scheduled value is kept; values replaced before their render
+ * started are skipped. Renders start on an animation frame, at most one per frame, and never overlap, so
+ * results land in the order their values were scheduled.
+ */
+export class RenderScheduler<T> {
+	/** Number of scheduled values that were never rendered, or whose result was dropped. */
+	skipped = 0;
+	private render: RenderFn<T>;
+	private pending: { value: T } | null = null;
+	private frameRequested = false;
+	private running = false;
+	private generation = 0;
+	private controller = new AbortController();
+
+	constructor(render: RenderFn<T>) {
+		this.render = render;
+	}
+
+	schedule(value: T): void {
+		if (this.pending) {
+			this.skipped++;
+		}
+		this.pending = { value };
+		this.requestFrame();
+	}
+
+	/**
+	 * Drops the pending value and the result of the render in progress, e.g. when the component is destroyed.
+	 */
+	cancel(): void {
+		if (this.pending) {
+			this.skipped++;
+			this.pending = null;
+		}
+		this.generation++;
+		this.controller.abort();
+		this.controller = new AbortController();
+	}
+
+	private requestFrame(): void {
+		if (this.frameRequested || this.running) {
+			return;
+		}
+		this.frameRequested = true;
+		nextFrame(() => {
+			this.frameRequested = false;
+			this.flush();
+		});
+	}
+
+	private async flush(): Promise<void> {
+		const pending = this.pending;
+		if (!pending || this.running) {
+			return;
+		}
+		this.pending = null;
+		this.running = true;
+		const generation = this.generation;
+		const token: RenderToken = {
+			signal: this.controller.signal,
+			current: () => generation === this.generation,
+			superseded: () => this.pending !== null
+		};
+		try {
+			await this.render(pending.value, token);
+		} finally {
+			if (!token.current()) {
+				this.skipped++;
+			}
+			this.running = false;
+			if (this.pending) {
+				this.requestFrame();
+			}
+		}
+	}
+}
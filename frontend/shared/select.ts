@@ -0,0 +1,55 @@
+import type { SelectData } from '@gradio/utils';
+
+export type SelectEvents = 'full' | 'index' | 'none';
+
+/**
+ * Decides which highlight clicks reach the server as `select` events, and in what form. Clicks are
+ * always handled in the browser first; this only limits the queue traffic they cause.
+ */
+export class SelectForwarder {
+	private send: (data: SelectData) => void;
+	private mode: SelectEvents = 'full';
+	private interval = 0;
+	private last = -Infinity;
+	private pending: SelectData | null = null;
+	private timer: ReturnType<typeof setTimeout> | null = null;
+
+	constructor(send: (data: SelectData) => void) {
+		this.send = send;
+	}
+
+	/**
+	 * `mode` "full" sends the clicked highlight, "index" only its index and "none" nothing. `throttle` is
+	 * the minimum number of seconds between two events; clicks in between are coalesced and the latest
+	 * one is sent when the interval ends.
+	 */
+	configure(mode: SelectEvents, throttle: number): void {
+		this.mode = mode;
+		this.interval = Math.max(0, throttle) * 1000;
+	}
+
+	push(data: SelectData): void {
+		if (this.mode === 'none') {
+			return;
+		}
+		const event = this.mode === 'index' ? { ...data, value: data.index } : data;
+		const wait = this.last + this.interval - performance.now();
+		if (wait <= 0 && !this.timer) {
+			this.emit(event);
+			return;
+		}
+		this.pending = event;
+		this.timer ??= setTimeout(() => {
+			this.timer = null;
+			if (this.pending) {
+				this.emit(this.pending);
+			}
+		}, Math.max(wait, 0));
+	}
+
+	private emit(data: SelectData): void {
+		this.pending = null;
+		this.last = performance.now();
+		this.send(data);
+	}
+}
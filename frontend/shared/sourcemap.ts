@@ -0,0 +1,197 @@
+import { marked, type Token } from 'marked';
+import { SpanIndex } from './spans';
+
+// Characters of rendered text are matched to the source at most this far ahead of the previous one;
+// anything further is markup the renderer removed (or an entity it decoded).
+const LOOKAHEAD = 16;
+
+const ENTITIES: Record<string, string> = { '&amp;': '&', '&lt;': '<', '&gt;': '>', '&quot;': '"', '&#39;': "'" };
+
+function unescapeHtml(html: string): string {
+	return html.replace(/&(?:amp|lt|gt|quot|#39);/g, (entity) => ENTITIES[entity]);
+}
+
+function escapeHtml(text: string): string {
+	return text.replace(/[&<>"']/g, (char) => `&${{ '&': 'amp', '<': 'lt', '>': 'gt', '"': 'quot', "'": '#39' }[char]};`);
+}
+
+function sameChar(source: string, rendered: string): boolean {
+	return source === rendered || (rendered === ' ' && (source === '\n' || source === '\t'));
+}
+
+/**
+ * Matches each character of `text` to a character of `source` at or after `from`, in order. Renderers
+ * only ever drop characters (markup, indentation, escapes), so `text` is almost always a subsequence of
+ * the source; a character that cannot be found nearby takes the offset of the one before it.
+ */
+export function alignText(text: string, source: string, from: number): number[] {
+	const offsets = new Array<number>(text.length);
+	let cursor = from;
+	for (let i = 0; i < text.length; i++) {
+		const limit = Math.min(source.length, cursor + (i === 0 ? source.length : LOOKAHEAD));
+		let j = cursor;
+		while (j < limit && !sameChar(source[j], text[i])) {
+			j++;
+		}
+		if (j < limit) {
+			offsets[i] = j;
+			cursor = j + 1;
+		} else {
+			offsets[i] = i > 0 ? offsets[i - 1] : from;
+		}
+	}
+	return offsets;
+}
+
+// First position in the ascending `offsets` whose offset is at least `offset`
+function lowerBound(offsets: number[], offset: number): number {
+	let low = 0;
+	let high = offsets.length;
+	while (low < high) {
+		const mid = (low + high) >> 1;
+		if (offsets[mid] < offset) {
+			low = mid + 1;
+		} else {
+			high = mid;
+		}
+	}
+	return low;
+}
+
+/**
+ * Renders `text`, whose characters sit at the given source offsets, with the spans of `index` that cover
+ * it. Spans are clipped to the text, so a span that continues into the next text node or block is
+ * closed here and reopened there.
+ */
+export function highlightText(
+	text: string,
+	offsets: number[],
+	index: SpanIndex,
+	openTag: (highlight: number) => string,
+	closeTag: (highlight: number) => string
+): string | null {
+	if (!text.length) {
+		return null;
+	}
+	const low = offsets[0];
+	const high = offsets[offsets.length - 1] + 1;
+	const clipped = new SpanIndex(
+		index
+			.overlapping(low, high)
+			.map(([start, end, highlight]): [number, number, number] => [
+				lowerBound(offsets, Math.max(start, low)),
+				lowerBound(offsets, Math.min(end, high)),
+				highlight
+			])
+			.filter(([start, end]) => start < end)
+	);
+	if (!clipped.length) {
+		return null;
+	}
+	const pieces: string[] = [];
+	let cursor = 0;
+	for (const [at, isOpen, highlight] of clipped.markers(0, text.length)) {
+		pieces.push(escapeHtml(text.slice(cursor, at)), isOpen ? openTag(highlight) : closeTag(highlight));
+		cursor = at;
+	}
+	pieces.push(escapeHtml(text.slice(cursor)));
+	return pieces.join('');
+}
+
+interface Walk {
+	source: string;
+	offset: number;
+	cursor: number;
+	index: SpanIndex;
+	openTag: (highlight: number) => string;
+	closeTag: (highlight: number) => string;
+}
+
+function highlightLeaf(token: Token, walk: Walk): void {
+	let text: string;
+	switch (token.type) {
+		case 'text':
+		case 'escape':
+		case 'codespan':
+			text = unescapeHtml(token.text);
+			break;
+		case 'code':
+			text = token.text;
+			if (token.codeBlockStyle !== 'indented') {
+				// The code starts on the line after the opening fence and its info string
+				walk.cursor = walk.source.indexOf('\n', walk.cursor) + 1 || walk.source.length;
+			}
+			break;
+		default:
+			return;
+	}
+	const offsets = alignText(text, walk.source, walk.cursor);
+	if (offsets.length) {
+		walk.cursor = offsets[offsets.length - 1] + 1;
+	}
+	const html = highlightText(
+		text,
+		offsets.map((offset) => offset + walk.offset),
+		walk.index,
+		walk.openTag,
+		walk.closeTag
+	);
+	if (html !== null) {
+		token.text = html;
+		if (token.type === 'code') {
+			token.escaped = true;
+		}
+	}
+}
+
+function walkTokens(tokens: Token[], walk: Walk): void {
+	for (const token of tokens) {
+		// Containers are located first, so that their children are not matched against markup before them
+		const start = token.raw ? walk.source.indexOf(token.raw, walk.cursor) : -1;
+		if (start >= 0) {
+			walk.cursor = start;
+		}
+		const children = (token as { tokens?: Token[] }).tokens;
+		if (token.type === 'list') {
+			for (const item of token.items) {
+				const itemStart = walk.source.indexOf(item.raw, walk.cursor);
+				if (itemStart >= 0) {
+					walk.cursor = itemStart;
+				}
+				walkTokens(item.tokens, walk);
+			}
+		} else if (token.type === 'table') {
+			for (const cell of [...token.header, ...token.rows.flat()]) {
+				walkTokens(cell.tokens, walk);
+			}
+		} else if (children && children.length) {
+			walkTokens(children, walk);
+		} else {
+			highlightLeaf(token, walk);
+		}
+		if (start >= 0) {
+			walk.cursor = Math.max(walk.cursor, start + token.raw.length);
+		}
+	}
+}
+
+/**
+ * Renders markdown with position highlights applied through a source map rather than markers: the
+ * tokens produced by `marked` are matched back to their source offsets, and the text of every token a
+ * highlight covers is wrapped directly. Highlights may span paragraphs, list items and headings; they are
+ * split into one segment per text node. `offset` is the offset of `content` in the document the highlight
+ * positions refer to.
+ */
+export async function renderWithSourceMap(
+	content: string,
+	index: SpanIndex,
+	openTag: (highlight: number) => string,
+	closeTag: (highlight: number) => string,
+	offset: number = 0
+): Promise<string> {
+	const tokens = marked.lexer(content);
+	if (index.overlapping(offset, offset + content.length).length) {
+		walkTokens(tokens, { source: content, offset, cursor: 0, index, openTag, closeTag });
+	}
+	return await marked.parser(tokens);
+}
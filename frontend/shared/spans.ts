@@ -0,0 +1,209 @@
+import type { Highlight } from './highlight';
+
+export type Span = [start: number, end: number, index: number];
+export type Marker = [offset: number, open: boolean, index: number];
+
+// Subtrees this shallow are scanned linearly instead of descended into.
+const SCAN_LEVEL = 3;
+
+/**
+ * Returns [start, end, index] for every position highlight and every server-resolved term span.
+ */
+export function highlightSpans(highlights: Highlight[]): Span[] {
+	const spans: Span[] = [];
+	highlights.forEach((highlight, index) => {
+		if (highlight.position && highlight.position.length === 2) {
+			spans.push([highlight.position[0], highlight.position[1], index]);
+		}
+		if (highlight.term && highlight.term.trim() && Array.isArray(highlight.spans)) {
+			highlight.spans.forEach(([start, end]) => spans.push([start, end, index]));
+		}
+	});
+	return spans.filter(([start, end]) => start >= 0 && start < end);
+}
+
+/**
+ * A static interval tree over [start, end, index] spans, mirroring `spans.py` on the server. Spans are
+ * sorted by start and laid out as an implicit balanced binary tree in which every node also stores the
+ * largest end in its subtree (as in cgranges), so overlap and point queries take O(log n + k).
+ * Overlapping and nested spans are both kept.
+ */
+export class SpanIndex {
+	readonly starts: Int32Array;
+	readonly ends: Int32Array;
+	readonly indices: Int32Array;
+	private maxEnds: Int32Array;
+	private maxLevel: number;
+
+	constructor(spans: Span[]) {
+		// Outer spans before the spans they contain, so that openings nest
+		const ordered = spans.slice().sort((a, b) => a[0] - b[0] || b[1] - a[1] || a[2] - b[2]);
+		this.starts = Int32Array.from(ordered, (span) => span[0]);
+		this.ends = Int32Array.from(ordered, (span) => span[1]);
+		this.indices = Int32Array.from(ordered, (span) => span[2]);
+		this.maxEnds = this.ends.slice();
+		this.maxLevel = this.build();
+	}
+
+	static fromHighlights(highlights: Highlight[]): SpanIndex {
+		return new SpanIndex(highlightSpans(highlights));
+	}
+
+	get length(): number {
+		return this.starts.length;
+	}
+
+	private build(): number {
+		const n = this.starts.length;
+		if (n === 0) {
+			return -1;
+		}
+		const maxEnds = this.maxEnds;
+		let lastI = (n - 1) & ~1;
+		let last = maxEnds[lastI];
+		let k = 1;
+		for (; 1 << k <= n; k++) {
+			const x = 1 << (k - 1);
+			for (let i = (x << 1) - 1; i < n; i += x << 2) {
+				const right = i + x < n ? maxEnds[i + x] : last;
+				maxEnds[i] = Math.max(this.ends[i], maxEnds[i - x], right);
+			}
+			lastI = (lastI >> k) & 1 ? lastI - x : lastI + x;
+			if (lastI < n && maxEnds[lastI] > last) {
+				last = maxEnds[lastI];
+			}
+		}
+		return k - 1;
+	}
+
+	/**
+	 * Returns the spans that overlap [start, end), in document order (outer spans first).
+	 */
+	overlapping(start: number, end: number): Span[] {
+		const n = this.starts.length;
+		const found: number[] = [];
+		if (n === 0) {
+			return [];
+		}
+		const { starts, ends, maxEnds } = this;
+		const stack: [number, number, boolean][] = [[this.maxLevel, (1 << this.maxLevel) - 1, false]];
+		while (stack.length) {
+			const [k, x, leftDone] = stack.pop()!;
+			if (k <= SCAN_LEVEL) {
+				let i = (x >> k) << k;
+				const stop = Math.min(i + (1 << (k + 1)) - 1, n);
+				for (; i < stop && starts[i] < end; i++) {
+					if (start < ends[i]) {
+						found.push(i);
+					}
+				}
+			} else if (!leftDone) {
+				const y = x - (1 << (k - 1));
+				stack.push([k, x, true]);
+				if (y >= n || maxEnds[y] > start) {
+					stack.push([k - 1, y, false]);
+				}
+			} else if (x < n && starts[x] < end) {
+				if (start < ends[x]) {
+					found.push(x);
+				}
+				stack.push([k - 1, x + (1 << (k - 1)), false]);
+			}
+		}
+		found.sort((a, b) => a - b);
+		return found.map((i) => [starts[i], ends[i], this.indices[i]]);
+	}
+
+	/**
+	 * Returns the indices of the highlights that cover the character at `offset`, outermost first.
+	 */
+	at(offset: number): number[] {
+		return this.overlapping(offset, offset + 1).map((span) => span[2]);
+	}
+
+	/**
+	 * Computes properly nested open and close markers for the spans within [start, end) that `accept`
+	 * allows. A span that crosses another one is split where the other one closes, and both pieces keep
+	 * their index.
+	 */
+	markers(start: number, end: number, accept?: (start: number, end: number) => boolean): Marker[] {
+		let spans = this.overlapping(start, end).filter((span) => span[0] >= start && span[1] <= end);
+		if (accept) {
+			spans = spans.filter((span) => accept(span[0], span[1]));
+		}
+
+		const markers: Marker[] = [];
+		// Open spans as [end, index], innermost last
+		const open: [number, number][] = [];
+		const closing = [...new Set(spans.map((span) => span[1]))].sort((a, b) => a - b);
+		let nextClose = 0;
+		let position = 0;
+
+		const closeUntil = (offset: number) => {
+			while (nextClose < closing.length && closing[nextClose] <= offset) {
+				const at = closing[nextClose++];
+				const depth = open.findIndex(([spanEnd]) => spanEnd === at);
+				if (depth < 0) {
+					continue;
+				}
+				const reopen: [number, number][] = [];
+				while (open.length > depth) {
+					const [spanEnd, index] = open.pop()!;
+					markers.push([at, false, index]);
+					if (spanEnd > at) {
+						reopen.push([spanEnd, index]);
+					}
+				}
+				for (const [spanEnd, index] of reopen.reverse()) {
+					markers.push([at, true, index]);
+					open.push([spanEnd, index]);
+				}
+			}
+		};
+
+		for (const [spanStart, spanEnd, index] of spans) {
+			if (spanStart > position) {
+				closeUntil(spanStart);
+				position = spanStart;
+			}
+			markers.push([spanStart, true, index]);
+			open.push([spanEnd, index]);
+		}
+		closeUntil(Infinity);
+		return markers;
+	}
+
+	/**
+	 * Inserts markers into `content`, the slice of the document that starts at `offset`, in one pass.
+	 */
+	emit(
+		content: string,
+		openMarker: (index: number) => string,
+		closeMarker: (index: number) => string,
+		offset: number = 0,
+		accept?: (start: number, end: number) => boolean
+	): string {
+		const pieces: string[] = [];
+		let cursor = 0;
+		for (const [at, isOpen, index] of this.markers(offset, offset + content.length, accept)) {
+			pieces.push(content.slice(cursor, at - offset), isOpen ? openMarker(index) : closeMarker(index));
+			cursor = at - offset;
+		}
+		pieces.push(content.slice(cursor));
+		return pieces.join('');
+	}
+}
+
+const indexes = new WeakMap<Highlight[], SpanIndex>();
+
+/**
+ * Returns the span index of a highlight list, building it on first use.
+ */
+export function spanIndexFor(highlights: Highlight[]): SpanIndex {
+	let index = indexes.get(highlights);
+	if (!index) {
+		index = SpanIndex.fromHighlights(highlights);
+		indexes.set(highlights, index);
+	}
+	return index;
+}
@@ -0,0 +1,103 @@
+export interface VirtualItem {
+	key: string;
+	size: number; // estimated height in pixels, used until the block has been measured
+}
+
+const LINE_HEIGHT = 24;
+const LINE_LENGTH = 80;
+const BLOCK_MARGIN = 16;
+
+/**
+ * A rough height for a markdown block that has not been mounted yet: one line per newline or per
+ * LINE_LENGTH characters, plus the block margin.
+ */
+export function estimateBlockHeight(raw: string): number {
+	let lines = 0;
+	for (const line of raw.split('\n')) {
+		lines += Math.max(1, Math.ceil(line.length / LINE_LENGTH));
+	}
+	return lines * LINE_HEIGHT + BLOCK_MARGIN;
+}
+
+/**
+ * The vertical layout of a list of blocks: estimated heights that are replaced by measured ones as blocks
+ * get mounted, and the offsets derived from them.
+ */
+export class BlockLayout {
+	private heights: number[];
+	private offsets: number[] | null = null;
+
+	constructor(heights: number[]) {
+		this.heights = heights.slice();
+	}
+
+	get length(): number {
+		return this.heights.length;
+	}
+
+	get totalHeight(): number {
+		return this.offsetOf(this.heights.length);
+	}
+
+	setHeight(index: number, height: number): boolean {
+		if (index < 0 || index >= this.heights.length || this.heights[index] === height) {
+			return false;
+		}
+		this.heights[index] = height;
+		this.offsets = null;
+		return true;
+	}
+
+	offsetOf(index: number): number {
+		if (!this.offsets) {
+			this.offsets = new Array(this.heights.length + 1);
+			this.offsets[0] = 0;
+			for (let i = 0; i < this.heights.length; i++) {
+				this.offsets[i + 1] = this.offsets[i] + this.heights[i];
+			}
+		}
+		return this.offsets[Math.max(0, Math.min(index, this.heights.length))];
+	}
+
+	/**
+	 * Returns the [first, last) range of blocks that overlap the [top, bottom) band of the layout.
+	 */
+	range(top: number, bottom: number): [number, number] {
+		const first = Math.min(this.search(top), this.heights.length);
+		let last = first;
+		while (last < this.heights.length && this.offsetOf(last) < bottom) {
+			last++;
+		}
+		return [first, last];
+	}
+
+	// Index of the block that contains `position`
+	private search(position: number): number {
+		let low = 0;
+		let high = this.heights.length;
+		while (low < high) {
+			const mid = (low + high) >> 1;
+			if (this.offsetOf(mid + 1) <= position) {
+				low = mid + 1;
+			} else {
+				high = mid;
+			}
+		}
+		return low;
+	}
+}
+
+/**
+ * Records the time from `start` to the next frame as a `markdown-label:first-paint` performance measure,
+ * with the number of DOM nodes under `root` in its detail. Read them with
+ * `performance.getEntriesByName('markdown-label:first-paint')`.
+ */
+export function recordFirstPaint(start: number, root: HTMLElement, mode: string): void {
+	requestAnimationFrame(() => {
+		performance.measure('markdown-label:first-paint', {
+			start,
+			end: performance.now(),
+			detail: { mode, domNodes: root.getElementsByTagName('*').length }
+		});
+	});
+}